@@ -5,12 +5,14 @@
 生成带图形的数学几何题目并添加到题库
 """
 
+import argparse
 import json
-import requests
 import random
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from geometry_generator import generate_geometry_question_with_figure, GeometryGenerator
 from enhanced_example import EnhancedQuestionManager
+from config import DRY_RUN_CONFIG
+from shard_partition import Shard, in_shard
 
 class GeometryQuestionGenerator:
     """几何题目生成器"""
@@ -346,9 +348,34 @@ class GeometryQuestionGenerator:
             'grade': '高一'
         }
     
-    def add_geometry_questions_to_database(self, triangle_count: int = 15, quad_count: int = 10, circle_count: int = 8):
-        """将几何题目添加到数据库"""
-        print("开始生成几何题目...")
+    def add_geometry_questions_to_database(self, triangle_count: int = 15, quad_count: int = 10, circle_count: int = 8,
+                                           seed: Optional[int] = None, dry_run: bool = False,
+                                           shard: Optional[Shard] = None) -> Tuple[int, int]:
+        """
+        将几何题目添加到数据库
+        
+        通过 EnhancedQuestionManager 的上传路径保存（连接池、认证、重试、压缩、去重、失败队列）。
+        已成功保存的题目记录在导入日志中；中断后使用相同的随机种子重新运行，
+        会生成相同的题目并跳过已保存的部分。
+        dry_run 为True时不联网，只统计请求体大小（各字段字节数、SVG体积）和预计上传耗时；
+        指定 shard 时仍生成全部题目，但只上传按内容哈希属于该分片的题目，
+        多个进程使用相同的随机种子和不同的分片即可分担上传
+        
+        Returns:
+            (成功数量, 题目总数)
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        random.seed(seed)
+        print(f"开始生成几何题目...（随机种子: {seed}，中断后使用相同种子重新运行可续传）")
+        
+        manager = self.question_manager
+        if dry_run:
+            manager.enable_dry_run()
+        else:
+            manager.enable_import_journal()
+        retries_before = manager.retry_policy.retries
+        serialized_before = manager.transport.snapshot()
         
         # 生成各类题目
         triangle_questions = self.generate_triangle_questions(triangle_count)
@@ -361,6 +388,9 @@ class GeometryQuestionGenerator:
         print(f"- 三角形题目: {len(triangle_questions)} 道")
         print(f"- 四边形题目: {len(quad_questions)} 道")
         print(f"- 圆形题目: {len(circle_questions)} 道")
+        if shard is not None:
+            all_questions = [q for q in all_questions if in_shard(q, shard)]
+            print(f"🧩 第 {shard[0] + 1}/{shard[1]} 个分片: {len(all_questions)} 道")
         
         # 添加到数据库
         success_count = 0
@@ -370,10 +400,7 @@ class GeometryQuestionGenerator:
                 print(f"题目类型: {question.get('knowledgePoints', ['未知'])[0]}")
                 print(f"题目内容: {question['content'][:50]}...")
                 
-                # 直接调用API保存题目（包含SVG数据）
-                import requests
-                url = "http://localhost:5001/api/ai/save-question"
-                
+                # 保存题目（包含SVG数据）
                 question_data = {
                     "question": {
                         "content": question["content"],
@@ -390,37 +417,38 @@ class GeometryQuestionGenerator:
                 }
                 
                 # 调试输出
-                print(f"SVG数据存在: {bool(question.get('svgData'))}")
                 print(f"SVG数据长度: {len(question.get('svgData', ''))}")
                 print(f"图形属性存在: {bool(question.get('figureProperties'))}")
-                if question.get('svgData'):
-                    print(f"SVG数据预览: {question['svgData'][:100]}...")
                 
-                try:
-                    response = requests.post(url, json=question_data, timeout=10)
-                    if response.status_code == 200:
-                        result = True
-                        success_count += 1
-                        print(f"✓ 题目添加成功")
-                    else:
-                        result = False
-                        print(f"✗ 题目添加失败 - 状态码: {response.status_code}")
-                        print(f"响应内容: {response.text}")
-                except Exception as e:
-                    print(f"✗ API调用失败: {e}")
-                    result = False
+                if manager.save_question(question_data):
+                    success_count += 1
                     
             except Exception as e:
                 print(f"✗ 添加题目时出错: {str(e)}")
         
+        if dry_run:
+            print(f"\n📊 {manager.profiler.report_with_config(DRY_RUN_CONFIG)}")
+            return success_count, len(all_questions)
+        if not all_questions:
+            return 0, 0
+        
         print(f"\n几何题目添加完成！")
         print(f"成功添加: {success_count} 道")
         print(f"失败: {len(all_questions) - success_count} 道")
         print(f"成功率: {success_count/len(all_questions)*100:.1f}%")
+        print(f"重试次数: {manager.retry_policy.retries - retries_before}")
+        manager.transport.report(serialized_before)
+        if success_count < len(all_questions):
+            print(f"失败的题目已写入 {manager.dead_letters.path}，可运行 replay_dead_letters.py 重新提交")
+        return success_count, len(all_questions)
 
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="几何题目生成器")
+    parser.add_argument('--dry-run', action='store_true', help="只生成和序列化题目并统计请求体，不连接服务器")
+    args = parser.parse_args()
+    
     print("=== 几何题目生成器 ===")
     print("正在初始化...")
     
@@ -428,17 +456,24 @@ def main():
         generator = GeometryQuestionGenerator()
         
         # 检查服务器连接
-        if not generator.question_manager.check_server_connection():
-            print("❌ 无法连接到服务器，请确保后端服务正在运行")
-            return
-        
-        print("✓ 服务器连接正常")
+        if not args.dry_run:
+            checks = generator.question_manager.preflight(['数学'])
+            if not checks['server']:
+                print("❌ 无法连接到服务器，请确保后端服务正在运行")
+                return
+            if not checks['token']:
+                print("❌ Token验证失败，请检查配置")
+                return
+        
+        if not args.dry_run:
+            print("✓ 服务器连接正常")
         
         # 生成并添加几何题目
         generator.add_geometry_questions_to_database(
             triangle_count=15,  # 三角形题目数量
             quad_count=10,      # 四边形题目数量
-            circle_count=8      # 圆形题目数量
+            circle_count=8,     # 圆形题目数量
+            dry_run=args.dry_run
         )
         
     except Exception as e:
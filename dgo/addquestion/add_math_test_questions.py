@@ -7,90 +7,63 @@
 """
 
 import json
-import requests
-from config import SERVER_CONFIG, AUTH_CONFIG
+import os
 from enhanced_example import EnhancedQuestionManager
 from katex_formatter import format_math_content, validate_math_content
+from json_stream import iter_import_file
 
-def load_test_questions():
-    """加载测试题目数据"""
-    try:
-        with open('math_test_questions.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data
-    except FileNotFoundError:
-        print("❌ 找不到 math_test_questions.json 文件")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON文件格式错误: {e}")
+def load_test_questions(file_path: str = 'math_test_questions.json'):
+    """
+    逐条读取测试题目数据（流式读取，不一次性加载整个文件）
+    
+    Returns:
+        (类型, 内容) 记录的迭代器，文件不存在时返回None
+    """
+    if not os.path.exists(file_path):
+        print(f"❌ 找不到 {file_path} 文件")
         return None
+    return iter_import_file(file_path)
 
 def add_math_test_questions():
     """批量添加数学测试题目"""
     print("=== 数学测试题目批量添加 ===")
     
     # 加载题目数据
-    data = load_test_questions()
-    if not data:
+    records = load_test_questions()
+    if records is None:
         return False
     
     # 初始化管理器
     manager = EnhancedQuestionManager()
     
-    # 检查服务器连接
-    if not manager.check_server_connection():
+    # 同时检查服务器连接、验证Token并预取数学科目的知识点
+    checks = manager.preflight(['数学'])
+    if not checks['server']:
         print("❌ 服务器连接失败，请检查服务器是否启动")
         return False
     
-    # 验证Token
-    if not manager.validate_token():
+    if not checks['token']:
         print("❌ Token验证失败，请检查配置")
         return False
     
     print("✅ 服务器连接和Token验证成功")
+    serialized_before = manager.transport.snapshot()
     
-    # 创建知识点 - 直接调用API
-    print("\n--- 创建知识点 ---")
+    # 知识点 - 读到题目前先缓存，上传题目前一次性解析（预取列表 + 并发获取缺失项）
     knowledge_points_map = {}
+    pending_points = []
     
-    def create_knowledge_point_direct(name, subject, description):
-        """直接调用API创建知识点"""
-        url = f"{SERVER_CONFIG['base_url']}/api/knowledge-points/{name}"
-        params = {'subject': subject}
-        
-        try:
-            # 先尝试获取知识点，如果不存在会自动创建
-            response = requests.get(url, params=params, headers={
-                'Authorization': f'Bearer {AUTH_CONFIG["token"]}',
-                'Content-Type': 'application/json'
-            }, proxies={'http': None, 'https': None})
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success'):
-                    return True
-            return False
-        except Exception as e:
-            print(f"创建知识点API调用失败: {e}")
-            return False
-    
-    for kp in data['knowledge_points']:
-        success = create_knowledge_point_direct(
-            name=kp['name'],
-            subject=data['subject'],
-            description=kp['description']
-        )
-        if success:
-            knowledge_points_map[kp['name']] = kp['name']  # 使用名称作为ID
-            print(f"✅ 创建/获取知识点: {kp['name']}")
-        else:
-            print(f"❌ 创建知识点失败: {kp['name']}")
-    
-    # 添加题目
-    print("\n--- 添加题目 ---")
-    success_count = 0
+    def resolve_knowledge_points(subject, names):
+        resolved = manager.kp_resolver.resolve(subject, names)
+        for name in names:
+            if name in resolved:
+                print(f"✅ 创建/获取知识点: {name}")
+            else:
+                print(f"❌ 创建知识点失败: {name}")
+        knowledge_points_map.update(resolved)
     
-    for question in data['questions']:
+    def add_question(question):
+        """处理并添加单道题目，返回是否成功"""
         print(f"\n正在处理题目: {question['id']}")
         
         # 格式化题目内容中的数学公式
@@ -127,11 +100,9 @@ def add_math_test_questions():
         # 获取知识点名称列表
         kp_names = [kp_name for kp_name in question['knowledge_points'] if kp_name in knowledge_points_map]
         
-        # 直接调用API添加题目
+        # 通过管理器的上传路径添加题目（连接池、重试、压缩、去重、失败队列）
         def add_question_direct(question_data):
-            """直接调用API添加题目"""
-            url = f"{SERVER_CONFIG['base_url']}/api/ai/save-question"
-            
+            """调用保存题目接口添加题目"""
             payload = {
                 "question": {
                      "content": formatted_content,
@@ -144,28 +115,7 @@ def add_math_test_questions():
                      "knowledgePoints": question_data['knowledge_points']
                  }
             }
-            
-            try:
-                response = requests.post(url, json=payload, headers={
-                    'Authorization': f'Bearer {AUTH_CONFIG["token"]}',
-                    'Content-Type': 'application/json'
-                }, proxies={'http': None, 'https': None})
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get('success'):
-                        return True
-                    else:
-                        print(f"API返回错误: {result.get('message', '未知错误')}")
-                        return False
-                else:
-                    print(f"HTTP错误: {response.status_code}")
-                    if response.text:
-                        print(f"响应内容: {response.text}")
-                    return False
-            except Exception as e:
-                print(f"请求异常: {e}")
-                return False
+            return manager.save_question(payload, verbose=False)
         
         success = add_question_direct({
              'content': formatted_content,
@@ -178,15 +128,49 @@ def add_math_test_questions():
          })
         
         if success:
-            success_count += 1
             print(f"✅ 添加题目 {question['id']}: {question['content'][:30]}...")
         else:
             print(f"❌ 添加题目失败 {question['id']}: {question['content'][:30]}...")
+        return success
+    
+    # 边读取边处理：知识点在第一道题目前统一解析，题目读到即添加
+    subject = None
+    success_count = 0
+    question_count = 0
+    started_questions = False
+    
+    try:
+        for kind, item in records:
+            if kind == 'field' and item[0] == 'subject':
+                subject = item[1]
+            elif kind == 'knowledge_point':
+                pending_points.append(item['name'])
+            elif kind == 'question':
+                if not started_questions:
+                    print("\n--- 创建知识点 ---")
+                    resolve_knowledge_points(subject, pending_points)
+                    print("\n--- 添加题目 ---")
+                    started_questions = True
+                # 题目引用了未声明的知识点时补充解析
+                missing = [name for name in item['knowledge_points'] if name not in knowledge_points_map]
+                if missing:
+                    resolve_knowledge_points(subject, missing)
+                question_count += 1
+                success_count += add_question(item)
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON文件格式错误: {e}")
+        return False
+    
+    if not started_questions and pending_points:
+        print("\n--- 创建知识点 ---")
+        resolve_knowledge_points(subject, pending_points)
     
     print(f"\n=== 批量添加完成 ===")
-    print(f"成功添加 {success_count}/{len(data['questions'])} 道题目")
+    print(f"成功添加 {success_count}/{question_count} 道题目")
+    manager.transport.report(serialized_before)
+    manager.close()
     
-    return success_count == len(data['questions'])
+    return success_count == question_count
 
 def main():
     """主函数"""
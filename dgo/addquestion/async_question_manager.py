@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步题目管理器
+
+EnhancedQuestionManager 的 asyncio 版本：在单个事件循环中通过信号量限制
+并发请求数，共享一个连接池，适合单进程驱动数万道题目的上传。
+
+请求体与同步版本使用同一套构造函数（KaTeX格式化、config.py配置），
+两条路径发送的数据完全一致。
+
+使用前需安装可选依赖：pip install aiohttp
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+try:
+    import aiohttp
+except ImportError:  # 可选依赖
+    aiohttp = None
+
+from config import SERVER_CONFIG, AUTH_CONFIG, DEFAULT_QUESTION_CONFIG, UPLOAD_CONFIG, KP_CACHE_CONFIG
+from kp_cache import KnowledgePointCache
+from json_codec import get_codec
+from enhanced_example import build_auth_headers, build_text_question_payload, resolve_knowledge_point_ids
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncQuestionManager:
+    """
+    异步题目管理器
+
+    用法:
+        async with AsyncQuestionManager() as manager:
+            points_map = await manager.create_knowledge_point_batch(subject, points)
+            await manager.add_question_batch(subject, questions, points_map)
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        """
+        初始化异步题目管理器
+
+        Args:
+            max_concurrency: 同时进行的最大请求数，默认读取 UPLOAD_CONFIG['async_concurrency']
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncQuestionManager 需要 aiohttp，请运行: pip install aiohttp")
+
+        self.base_url = SERVER_CONFIG['base_url'].rstrip('/')
+        self.token = AUTH_CONFIG['token']
+        self.headers = {k: v for k, v in build_auth_headers(self.token).items() if v is not None}
+        self.max_concurrency = max_concurrency or UPLOAD_CONFIG['async_concurrency']
+
+        # 请求体预先编码为紧凑的UTF-8 JSON
+        self.codec = get_codec(UPLOAD_CONFIG['json_backend'])
+
+        # 存储创建的知识点ID（持久化到本地文件），避免重复创建
+        self.knowledge_point_cache = KnowledgePointCache(
+            KP_CACHE_CONFIG['file'], self.base_url, KP_CACHE_CONFIG['ttl']
+        )
+
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """
+        创建连接池和并发信号量（需在事件循环中调用）
+        """
+        if self._session is not None:
+            return
+
+        read_timeout = SERVER_CONFIG.get('read_timeout', SERVER_CONFIG['timeout'])
+        timeout = aiohttp.ClientTimeout(
+            sock_connect=SERVER_CONFIG.get('connect_timeout', read_timeout),
+            sock_read=read_timeout
+        )
+        connector = aiohttp.TCPConnector(
+            limit=self.max_concurrency,
+            force_close=not SERVER_CONFIG.get('keep_alive', True)
+        )
+        self._session = aiohttp.ClientSession(headers=self.headers, timeout=timeout, connector=connector)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        logger.info(f"异步题目管理器初始化完成，最大并发数：{self.max_concurrency}")
+
+    async def close(self):
+        """
+        关闭连接池
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _post(self, path: str, payload: Dict):
+        """
+        在并发限制内发送POST请求，返回 (状态码, 响应JSON)
+        """
+        await self.start()
+        async with self._semaphore:
+            async with self._session.post(f"{self.base_url}{path}", data=self.codec.dumps(payload),
+                                          headers={'Content-Type': 'application/json'}) as response:
+                try:
+                    result = await response.json(content_type=None)
+                except ValueError:
+                    result = {}
+                return response.status, result or {}
+
+    async def create_knowledge_point(self, name: str, subject: str, description: str = "") -> Optional[str]:
+        """
+        创建知识点（带缓存）
+        """
+        cache_key = f"{subject}:{name}"
+        if cache_key in self.knowledge_point_cache:
+            logger.info(f"使用缓存的知识点: {name}")
+            return self.knowledge_point_cache[cache_key]
+
+        data = {
+            "name": name,
+            "subject": subject,
+            "description": description
+        }
+
+        try:
+            status, result = await self._post("/api/knowledge-points", data)
+            if status == 201:
+                point_id = result['knowledgePoint']['_id']
+                self.knowledge_point_cache[cache_key] = point_id
+                logger.info(f"知识点创建成功: {name} (ID: {point_id})")
+                print(f"✅ 知识点创建成功: {name}")
+                return point_id
+            else:
+                error_msg = result.get('error', '未知错误')
+                logger.error(f"知识点创建失败: {name}, 错误: {error_msg}")
+                print(f"❌ 知识点创建失败: {name} - {error_msg}")
+                return None
+        except Exception as e:
+            logger.error(f"创建知识点时发生异常: {name}, 异常: {str(e)}")
+            print(f"❌ 创建知识点时发生错误: {str(e)}")
+            return None
+
+    async def create_knowledge_point_batch(self, subject: str, points: List[Dict]) -> Dict[str, str]:
+        """
+        并发创建知识点，返回知识点名称到ID的映射
+        """
+        point_ids = await asyncio.gather(*[
+            self.create_knowledge_point(point['name'], subject, point.get('description', ''))
+            for point in points
+        ])
+        created_points = {
+            point['name']: point_id for point, point_id in zip(points, point_ids) if point_id
+        }
+        logger.info(f"批量创建知识点完成，科目：{subject}，成功：{len(created_points)}个")
+        return created_points
+
+    async def add_text_question(self,
+                                subject: str,
+                                content: str,
+                                options: List[str],
+                                correct_answer: str,
+                                explanation: str,
+                                knowledge_points: List[str],
+                                difficulty: str = "medium",
+                                verbose: bool = True) -> bool:
+        """
+        添加普通文本试题（自动格式化数学公式为KaTeX标准）
+        """
+        question_data = build_text_question_payload(
+            subject, content, options, correct_answer, explanation, knowledge_points, difficulty
+        )
+
+        try:
+            status, result = await self._post("/api/ai/save-question", question_data)
+            if status == 200:
+                logger.info(f"题目添加成功: {content[:30]}...")
+                if verbose:
+                    print(f"✅ 题目添加成功: {content[:30]}...")
+                return True
+            else:
+                error_msg = result.get('error', '未知错误')
+                logger.error(f"题目添加失败: {content[:30]}..., 错误: {error_msg}")
+                if verbose:
+                    print(f"❌ 题目添加失败: {error_msg}")
+                return False
+        except Exception as e:
+            logger.error(f"添加题目时发生异常: {content[:30]}..., 异常: {str(e)}")
+            if verbose:
+                print(f"❌ 添加题目时发生错误: {str(e)}")
+            return False
+
+    async def upload_question_batch(self, subject: str, questions: List[Dict],
+                                    knowledge_points_map: Dict[str, str]) -> List[bool]:
+        """
+        并发上传题目，返回与输入顺序一致的结果列表
+        """
+        total = len(questions)
+
+        async def upload(index: int, question: Dict) -> bool:
+            success = await self.add_text_question(
+                subject=subject,
+                content=question['content'],
+                options=question['options'],
+                correct_answer=question['correct_answer'],
+                explanation=question['explanation'],
+                knowledge_points=resolve_knowledge_point_ids(question, knowledge_points_map),
+                difficulty=question.get('difficulty', DEFAULT_QUESTION_CONFIG['difficulty']),
+                verbose=False
+            )
+            status = "✅ 题目添加成功" if success else "❌ 题目添加失败"
+            print(f"[{index + 1}/{total}] {status}: {question['content'][:30]}...")
+            return success
+
+        return list(await asyncio.gather(*[upload(i, q) for i, q in enumerate(questions)]))
+
+    async def add_question_batch(self, subject: str, questions: List[Dict],
+                                 knowledge_points_map: Dict[str, str]) -> int:
+        """
+        批量添加题目
+
+        Returns:
+            成功添加的题目数量
+        """
+        results = await self.upload_question_batch(subject, questions, knowledge_points_map)
+        success_count = sum(results)
+
+        logger.info(f"批量添加题目完成，科目：{subject}，成功：{success_count}/{len(questions)}")
+        return success_count
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+认证token本地校验
+
+服务器签发的是JWT，载荷中的 exp 字段即过期时间。启动时先在本地解码token检查是否过期，
+不需要访问服务器；只有无法在本地判断时（token不是JWT或没有exp）才请求一次轻量的认证接口，
+结果缓存在本地文件中。
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+from local_store import file_lock, read_json, atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+def decode_jwt_payload(token: str) -> Optional[Dict]:
+    """
+    解码JWT载荷（不校验签名），格式不正确时返回None
+    """
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
+    try:
+        padded = parts[1] + '=' * (-len(parts[1]) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, json.JSONDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def check_token_locally(token: str, leeway: float = 0) -> Optional[bool]:
+    """
+    根据JWT的exp字段判断token是否有效
+
+    Args:
+        token: 认证token
+        leeway: 距离过期不足 leeway 秒时视为已过期
+
+    Returns:
+        True未过期，False已过期，None无法在本地判断
+    """
+    payload = decode_jwt_payload(token)
+    if payload is None or not isinstance(payload.get('exp'), (int, float)):
+        return None
+    return payload['exp'] - leeway > time.time()
+
+
+class TokenValidator:
+    """
+    带缓存的token校验器
+
+    本地解码能得出结论时直接返回；否则调用 probe 访问服务器，
+    结论按 "服务器地址 + token哈希" 缓存 verdict_ttl 秒。
+    """
+
+    def __init__(self, token: str, server_url: str, config: Dict):
+        """
+        Args:
+            token: 认证token
+            server_url: 服务器地址
+            config: TOKEN_VALIDATION_CONFIG 配置字典
+        """
+        self.token = token
+        self.cache_path = config.get('cache_file')
+        self.verdict_ttl = config.get('verdict_ttl', 3600)
+        self.leeway = config.get('expiry_leeway', 60)
+        self._key = hashlib.sha256(f"{server_url.rstrip('/')}\n{token}".encode('utf-8')).hexdigest()
+        self._verdict: Optional[bool] = None
+
+    def _cached_verdict(self) -> Optional[bool]:
+        if not self.cache_path:
+            return None
+        with file_lock(self.cache_path, shared=True):
+            entry = read_json(self.cache_path, {}).get(self._key)
+        if entry and time.time() - entry.get('ts', 0) < self.verdict_ttl:
+            return entry['valid']
+        return None
+
+    def _store_verdict(self, valid: bool) -> None:
+        if not self.cache_path:
+            return
+        with file_lock(self.cache_path):
+            data = read_json(self.cache_path, {})
+            now = time.time()
+            data = {key: entry for key, entry in data.items() if now - entry.get('ts', 0) < self.verdict_ttl}
+            data[self._key] = {'valid': valid, 'ts': now}
+            atomic_write_json(self.cache_path, data)
+
+    def is_valid(self, probe: Callable[[], Optional[bool]]) -> bool:
+        """
+        判断token是否有效
+
+        Args:
+            probe: 访问服务器认证接口的函数，返回True/False，请求失败时返回None
+
+        Returns:
+            token是否有效
+        """
+        local = check_token_locally(self.token, self.leeway)
+        if local is not None:
+            if not local:
+                expired_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(decode_jwt_payload(self.token)['exp']))
+                logger.warning(f"认证token已于 {expired_at} 过期")
+                print(f"⚠️ 认证token已于 {expired_at} 过期，请重新登录获取")
+            return local
+
+        if self._verdict is None:
+            self._verdict = self._cached_verdict()
+        if self._verdict is not None:
+            return self._verdict
+
+        verdict = probe()
+        if verdict is None:
+            # 请求失败时不缓存，下次重新检查
+            return False
+        self._verdict = verdict
+        self._store_verdict(verdict)
+        logger.info(f"token校验结果（服务器）: {'有效' if verdict else '无效'}")
+        return verdict
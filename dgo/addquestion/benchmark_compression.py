@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+请求体压缩基准测试
+
+用几何题（含SVG）和图片题（含base64图片）的真实请求体，比较压缩前后的大小，
+并在本地启动一个模拟服务器，通过 EnhancedQuestionManager 的上传路径测量端到端耗时。
+模拟服务器和后端一样解压gzip、解析JSON，并可按指定带宽模拟网络传输时间。
+
+用法：
+    python benchmark_compression.py [--rounds 3] [--bandwidth 10] [--min-size 1024] [--image 图片路径]
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+
+from config import COMPRESSION_CONFIG
+from enhanced_example import EnhancedQuestionManager
+from generate_advanced_geometry import CATEGORY_GENERATORS, generate_question_task
+from transport import encode_json_body, compress_body
+
+DEFAULT_IMAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'server', 'test-simple.png')
+
+
+def geometry_payloads(count: int) -> List[Dict]:
+    """按固定种子生成几何题请求体"""
+    categories = list(CATEGORY_GENERATORS)
+    payloads = []
+    for i in range(count):
+        question = generate_question_task((categories[i % len(categories)], i))
+        payloads.append({"question": {
+            "content": question["content"],
+            "subject": question["subject"],
+            "type": question["type"],
+            "difficulty": question["difficulty"],
+            "correctAnswer": question["correctAnswer"],
+            "explanation": question["explanation"],
+            "knowledgePoints": question["knowledgePoints"],
+            "svgData": question["svgData"],
+            "figureProperties": question["figureProperties"],
+            "hasGeometryFigure": True
+        }})
+    return payloads
+
+
+def image_payloads(image_path: str, count: int) -> List[Dict]:
+    """用同一张图片构造图片题请求体"""
+    with open(image_path, 'rb') as f:
+        image_data = f"data:image/png;base64,{base64.b64encode(f.read()).decode('utf-8')}"
+    return [{"question": {
+        "content": f"观察图片回答问题（{i + 1}）",
+        "subject": "数学",
+        "type": "图片题",
+        "difficulty": "medium",
+        "correctAnswer": "A",
+        "explanation": "见图",
+        "knowledgePoints": [],
+        "imageData": image_data,
+        "mimeType": "image/png"
+    }} for i in range(count)]
+
+
+def start_mock_server(bandwidth_mbps: float) -> ThreadingHTTPServer:
+    """
+    启动模拟保存接口：按带宽等待传输时间，解压并解析请求体
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if bandwidth_mbps > 0:
+                time.sleep(len(body) * 8 / (bandwidth_mbps * 1_000_000))
+            if self.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            json.loads(body)
+            response = b'{"success": true, "questionId": "benchmark"}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure_sizes(payloads: List[Dict]) -> Dict:
+    """压缩前后的字节数和压缩耗时"""
+    config = {**COMPRESSION_CONFIG, 'enabled': True}
+    raw = compressed = 0
+    started = time.perf_counter()
+    for payload in payloads:
+        body = encode_json_body(payload)
+        raw += len(body)
+        compressed += len(compress_body(body, config)[0])
+    return {
+        'raw': raw,
+        'compressed': compressed,
+        'compress_ms': (time.perf_counter() - started) * 1000 / len(payloads)
+    }
+
+
+def measure_upload(manager: EnhancedQuestionManager, payloads: List[Dict], compress: bool, rounds: int) -> float:
+    """通过上传路径发送全部请求体，返回平均每道题目的耗时（毫秒）"""
+    enabled = COMPRESSION_CONFIG['enabled']
+    COMPRESSION_CONFIG['enabled'] = compress
+    try:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for payload in payloads:
+                if not manager._post_question(payload, verbose=False):
+                    raise RuntimeError("模拟服务器返回失败")
+        return (time.perf_counter() - started) * 1000 / (rounds * len(payloads))
+    finally:
+        COMPRESSION_CONFIG['enabled'] = enabled
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="请求体压缩基准测试")
+    parser.add_argument('--count', type=int, default=20, help="每类题目数量")
+    parser.add_argument('--rounds', type=int, default=3, help="上传轮数")
+    parser.add_argument('--bandwidth', type=float, default=10, help="模拟带宽（Mbps），0表示不限速")
+    parser.add_argument('--image', default=DEFAULT_IMAGE, help="图片题使用的图片")
+    parser.add_argument('--min-size', type=int, default=COMPRESSION_CONFIG['min_size'], help="压缩阈值（字节）")
+    args = parser.parse_args(argv)
+    COMPRESSION_CONFIG['min_size'] = args.min_size
+
+    payload_sets = {'几何题（SVG）': geometry_payloads(args.count)}
+    if os.path.exists(args.image):
+        payload_sets['图片题（base64）'] = image_payloads(args.image, args.count)
+    else:
+        print(f"⚠️ 找不到图片 {args.image}，跳过图片题")
+
+    server = start_mock_server(args.bandwidth)
+    manager = EnhancedQuestionManager(f"http://127.0.0.1:{server.server_address[1]}")
+    # 每轮重复上传相同的请求体，不能按内容去重
+    manager.deduplicator = None
+    bandwidth = f"{args.bandwidth:g} Mbps" if args.bandwidth > 0 else "不限速"
+
+    print(f"=== 请求体压缩基准测试（压缩阈值 {COMPRESSION_CONFIG['min_size']} 字节，"
+          f"级别 {COMPRESSION_CONFIG['level']}，模拟带宽 {bandwidth}）===")
+    try:
+        for name, payloads in payload_sets.items():
+            sizes = measure_sizes(payloads)
+            plain_ms = measure_upload(manager, payloads, False, args.rounds)
+            gzip_ms = measure_upload(manager, payloads, True, args.rounds)
+            saved = sizes['raw'] - sizes['compressed']
+
+            print(f"\n📦 {name}：{len(payloads)} 道")
+            print(f"   原始大小: {sizes['raw'] / len(payloads) / 1024:.1f} KB/道")
+            print(f"   压缩后:   {sizes['compressed'] / len(payloads) / 1024:.1f} KB/道"
+                  f"（节省 {saved / sizes['raw'] * 100:.1f}%，共 {saved / 1024:.1f} KB）")
+            print(f"   压缩耗时: {sizes['compress_ms']:.2f} ms/道")
+            print(f"   上传耗时: 不压缩 {plain_ms:.2f} ms/道，压缩 {gzip_ms:.2f} ms/道"
+                  f"（{(gzip_ms - plain_ms) / plain_ms * 100:+.1f}%）")
+    finally:
+        manager.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KaTeX格式化基准测试
+
+比较基于记号遍历的 KaTeXFormatter 与原先逐条规则依次替换的实现（LegacyKaTeXFormatter）：
+分别测量格式化全部字段、以及把全部解析拼接成一段长文本后的耗时，
+并列出两者输出不同的字段数（题目数据中的 \\\\sin 被原实现改成 \\\\\\sin，记号遍历还原为 \\sin，输出有意不同）。
+LegacyKaTeXFormatter 保留原先的规则表，输出与原实现逐字相同。
+
+用法：
+    python benchmark_katex.py [--file math_test_questions.json] [--rounds 200] [--show-diff]
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Callable, List
+
+from katex_formatter import KaTeXFormatter
+
+
+class LegacyKaTeXFormatter(KaTeXFormatter):
+    """
+    原先的实现：每个公式对每条规则分别调用一次 re.sub（约45遍扫描），作为对照基准
+    """
+
+    def __init__(self):
+        # 原先的规则表（正则表达式形式），与新实现的按命令名查表不通用
+        self.unsupported_commands = {
+            # 分数相关
+            r'\\dfrac': r'\\frac',
+            r'\\tfrac': r'\\frac',
+            
+            # 根号相关
+            r'\\surd': r'\\sqrt',
+            
+            # 字体相关
+            r'\\mathbb': r'\\mathbf',  # KaTeX支持有限的mathbb
+            r'\\mathfrak': r'\\mathbf',
+            r'\\mathscr': r'\\mathcal',
+            
+            # 空格相关
+            r'\\,': r'\\:',  # 细空格
+            r'\\;': r'\\quad',  # 中等空格
+            r'\\!': '',  # 负空格，KaTeX中移除
+            
+            # 其他不支持的命令
+            r'\\displaystyle': '',
+            r'\\textstyle': '',
+            r'\\scriptstyle': '',
+            r'\\scriptscriptstyle': '',
+        }
+        
+        # 需要特殊处理的环境
+        self.environment_replacements = {
+            r'\\begin\{align\}': r'\\begin{aligned}',
+            r'\\end\{align\}': r'\\end{aligned}',
+            r'\\begin\{eqnarray\}': r'\\begin{aligned}',
+            r'\\end\{eqnarray\}': r'\\end{aligned}',
+        }
+        
+        # 函数名标准化
+        self.function_names = {
+            r'\\operatorname\{([^}]+)\}': r'\\text{\\1}',
+            r'\\mathrm\{([^}]+)\}': r'\\text{\\1}',
+        }
+
+    def format_latex_formula(self, text: str) -> str:
+        """
+        格式化LaTeX公式为KaTeX兼容格式
+        
+        Args:
+            text: 包含LaTeX公式的文本
+            
+        Returns:
+            格式化后的文本
+        """
+        if not text:
+            return text
+            
+        # 处理行内公式 $...$
+        text = re.sub(r'\$([^$]+)\$', lambda m: f'${self._format_single_formula(m.group(1))}$', text)
+        
+        # 处理行间公式 $$...$$
+        text = re.sub(r'\$\$([^$]+)\$\$', lambda m: f'$${self._format_single_formula(m.group(1))}$$', text)
+        
+        # 处理\(...\)格式
+        text = re.sub(r'\\\(([^)]+)\\\)', lambda m: f'\\({self._format_single_formula(m.group(1))}\\)', text)
+        
+        # 处理\[...\]格式
+        text = re.sub(r'\\\[([^\]]+)\\\]', lambda m: f'\\[{self._format_single_formula(m.group(1))}\\]', text)
+        
+        return text
+    
+    def _format_single_formula(self, formula: str) -> str:
+        """
+        格式化单个公式
+        
+        Args:
+            formula: LaTeX公式字符串
+            
+        Returns:
+            KaTeX兼容的公式字符串
+        """
+        # 移除多余的空格
+        formula = re.sub(r'\s+', ' ', formula.strip())
+        
+        # 替换不支持的命令
+        for old_cmd, new_cmd in self.unsupported_commands.items():
+            formula = re.sub(old_cmd, new_cmd, formula)
+        
+        # 替换环境
+        for old_env, new_env in self.environment_replacements.items():
+            formula = re.sub(old_env, new_env, formula)
+        
+        # 处理函数名
+        for pattern, replacement in self.function_names.items():
+            formula = re.sub(pattern, replacement, formula)
+        
+        # 标准化分数格式
+        formula = self._standardize_fractions(formula)
+        
+        # 标准化上下标
+        formula = self._standardize_scripts(formula)
+        
+        # 标准化括号
+        formula = self._standardize_brackets(formula)
+        
+        # 标准化三角函数
+        formula = self._standardize_trig_functions(formula)
+        
+        # 标准化对数函数
+        formula = self._standardize_log_functions(formula)
+        
+        return formula
+    
+    def _standardize_fractions(self, formula: str) -> str:
+        """
+        标准化分数格式
+        """
+        # 确保\frac后面有正确的大括号
+        formula = re.sub(r'\\frac\s*([^{])([^{])', r'\\frac{\1}{\2}', formula)
+        
+        # 处理简单的a/b格式转换为\frac{a}{b}
+        # 但要小心不要转换已经在\frac中的内容
+        def replace_simple_fraction(match):
+            numerator = match.group(1)
+            denominator = match.group(2)
+            # 检查是否已经在数学环境中
+            if '\\' in numerator or '\\' in denominator:
+                return match.group(0)
+            return f'\\frac{{{numerator}}}{{{denominator}}}'
+        
+        # 匹配简单的数字/数字或变量/变量格式
+        formula = re.sub(r'([a-zA-Z0-9]+)/([a-zA-Z0-9]+)', replace_simple_fraction, formula)
+        
+        return formula
+    
+    def _standardize_scripts(self, formula: str) -> str:
+        """
+        标准化上下标格式
+        """
+        # 确保上下标有正确的大括号（当内容超过一个字符时）
+        # 上标
+        formula = re.sub(r'\^([a-zA-Z0-9]{2,})', r'^{\1}', formula)
+        # 下标
+        formula = re.sub(r'_([a-zA-Z0-9]{2,})', r'_{\1}', formula)
+        
+        return formula
+    
+    def _standardize_brackets(self, formula: str) -> str:
+        """
+        标准化括号格式
+        """
+        # 替换不支持的括号命令
+        replacements = {
+            r'\\langle': r'\\langle',  # KaTeX支持
+            r'\\rangle': r'\\rangle',  # KaTeX支持
+            r'\\lbrace': r'\\{',
+            r'\\rbrace': r'\\}',
+            r'\\lbrack': r'[',
+            r'\\rbrack': r']',
+        }
+        
+        for old, new in replacements.items():
+            formula = re.sub(old, new, formula)
+        
+        return formula
+    
+    def _standardize_trig_functions(self, formula: str) -> str:
+        """
+        标准化三角函数
+        """
+        # 确保三角函数使用正确的格式
+        trig_functions = ['sin', 'cos', 'tan', 'cot', 'sec', 'csc', 
+                         'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh']
+        
+        for func in trig_functions:
+            # 将普通文本的三角函数转换为LaTeX格式
+            formula = re.sub(f'\\b{func}\\b', f'\\\\{func}', formula)
+        
+        return formula
+    
+    def _standardize_log_functions(self, formula: str) -> str:
+        """
+        标准化对数函数
+        """
+        # 标准化对数函数格式
+        # log_a(x) -> \log_a(x)
+        formula = re.sub(r'\\blog_([a-zA-Z0-9]+)\\b', r'\\log_{\1}', formula)
+        formula = re.sub(r'\\blog\\b', r'\\log', formula)
+        formula = re.sub(r'\\bln\\b', r'\\ln', formula)
+        
+        return formula
+
+
+def load_fields(file_path: str) -> List[str]:
+    """
+    读取题目文件中需要格式化的全部字段（题干、选项、解析）
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    fields = []
+    for question in data.get('questions', []):
+        fields.append(question.get('content', ''))
+        fields.extend(question.get('options', []))
+        fields.append(question.get('explanation', ''))
+    return fields
+
+
+def load_explanations(file_path: str) -> List[str]:
+    """
+    读取题目文件中的全部解析
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [question.get('explanation', '') for question in data.get('questions', [])]
+
+
+def measure(format_text: Callable[[str], str], fields: List[str], rounds: int) -> float:
+    """
+    格式化全部字段 rounds 次，返回最短一轮的耗时（秒）
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for text in fields:
+            format_text(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KaTeX格式化基准测试")
+    parser.add_argument('--file', default='math_test_questions.json', help="题目文件")
+    parser.add_argument('--rounds', type=int, default=200, help="测量轮数，取最快一轮")
+    parser.add_argument('--show-diff', action='store_true', help="列出输出与原实现不同的字段")
+    args = parser.parse_args()
+
+    fields = load_fields(args.file)
+    long_text = ['\n'.join(load_explanations(args.file))]
+    formatter = KaTeXFormatter()
+    legacy = LegacyKaTeXFormatter()
+
+    formulas = sum(len(re.findall(r'\$([^$]+)\$', text)) for text in fields)
+    print(f"=== KaTeX格式化基准测试：{args.file}，{len(fields)} 个字段，{formulas} 个行内公式 ===")
+
+    changed = [(text, legacy.format_latex_formula(text), formatter.format_latex_formula(text)) for text in fields]
+    changed = [item for item in changed if item[1] != item[2]]
+    print(f"ℹ️  {len(changed)} 个字段的输出与原实现不同")
+    if args.show_diff:
+        for _, old, new in changed:
+            print(f"   原实现: {old}")
+            print(f"   记号遍历: {new}")
+
+    for label, texts in (("全部字段", fields), (f"全部解析拼接（{len(long_text[0])} 字符）", long_text)):
+        legacy_seconds = measure(legacy.format_latex_formula, texts, args.rounds)
+        seconds = measure(formatter.format_latex_formula, texts, args.rounds)
+        print(f"\n📊 {label}")
+        print(f"   原实现（逐条规则）: {legacy_seconds * 1000:8.2f} ms/轮")
+        print(f"   记号遍历:           {seconds * 1000:8.2f} ms/轮")
+        print(f"   加速比: {legacy_seconds / seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
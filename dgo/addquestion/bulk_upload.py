@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量上传分块工具
+
+配合 POST /api/question-bank/:subject/batch（action=create）使用，
+根据观测到的请求耗时和请求体大小自动调整每块的题目数量，
+并按字节预算打包：纯文本题、SVG几何题和base64图片题的大小相差几个数量级，
+按固定题目数分块要么装得太少，要么超出请求体上限。
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+# 批量请求体中题目数组以外的固定部分
+_BATCH_PREFIX = b'{"action":"create","questions":['
+_BATCH_SUFFIX = b']}'
+
+
+class AdaptiveChunkSizer:
+    """
+    自适应分块大小
+
+    每完成一块后根据平均单题耗时和单题字节数估算下一块的大小：
+    既不超过目标耗时，也不超过请求体大小上限。估算值做指数平滑，
+    请求失败时分块大小减半。
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Args:
+            config: BULK_UPLOAD_CONFIG 配置字典
+        """
+        self.min_size = max(1, config.get('min_chunk_size', 1))
+        self.max_size = max(self.min_size, config.get('max_chunk_size', 500))
+        self.target_latency = config.get('target_latency', 2.0)
+        self.max_request_bytes = config.get('max_request_bytes', 8 * 1024 * 1024)
+        self.smoothing = config.get('smoothing', 0.5)
+        self.size = self._clamp(config.get('initial_chunk_size', 50))
+
+        # 单题平均耗时（秒）和平均字节数的平滑估计
+        self.seconds_per_item = None
+        self.bytes_per_item = None
+
+    def _clamp(self, size: float) -> int:
+        return int(max(self.min_size, min(self.max_size, size)))
+
+    def _smooth(self, previous, value: float) -> float:
+        if previous is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * previous
+
+    def next_size(self) -> int:
+        """
+        下一块应包含的题目数量
+        """
+        return self.size
+
+    def record(self, item_count: int, body_bytes: int, elapsed: float, success: bool = True) -> int:
+        """
+        记录一次分块请求的结果并更新分块大小
+
+        Args:
+            item_count: 本块题目数量
+            body_bytes: 请求体字节数
+            elapsed: 请求耗时（秒）
+            success: 请求是否成功
+
+        Returns:
+            更新后的分块大小
+        """
+        if item_count <= 0:
+            return self.size
+
+        if not success:
+            self.size = self._clamp(item_count // 2)
+            return self.size
+
+        self.seconds_per_item = self._smooth(self.seconds_per_item, elapsed / item_count)
+        self.bytes_per_item = self._smooth(self.bytes_per_item, body_bytes / item_count)
+
+        by_latency = self.target_latency / self.seconds_per_item if self.seconds_per_item > 0 else self.max_size
+        by_bytes = self.max_request_bytes / self.bytes_per_item if self.bytes_per_item > 0 else self.max_size
+        # 每次最多翻倍，避免一次估算偏差造成请求体暴涨
+        self.size = self._clamp(min(by_latency, by_bytes, item_count * 2))
+        return self.size
+
+
+def build_batch_body(encoded_questions: Sequence[bytes]) -> bytes:
+    """
+    用预先编码好的题目拼接批量创建请求体，不需要重新序列化整块
+    """
+    return _BATCH_PREFIX + b','.join(encoded_questions) + _BATCH_SUFFIX
+
+
+class ByteBudgetPacker:
+    """
+    按字节预算和题目数上限打包分块
+
+    超过单题上限的题目（通常是大图片）不进入批量请求，交给单题接口上传，
+    其余题目按顺序贪心装入分块，保证每个请求体都不超过预算。
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Args:
+            config: BULK_UPLOAD_CONFIG 配置字典
+        """
+        max_request_bytes = config.get('max_request_bytes', 8 * 1024 * 1024)
+        self.max_bytes = min(config.get('max_chunk_bytes', max_request_bytes), max_request_bytes)
+        self.oversize_bytes = min(config.get('oversize_item_bytes', self.max_bytes // 2),
+                                  self.max_bytes - len(_BATCH_PREFIX) - len(_BATCH_SUFFIX))
+
+    def split_oversized(self, sizes: Sequence[int]) -> Tuple[List[int], List[int]]:
+        """
+        按单题大小划分题目
+
+        Returns:
+            (可批量上传的下标列表, 需要单独上传的下标列表)
+        """
+        regular, oversized = [], []
+        for index, size in enumerate(sizes):
+            (oversized if size > self.oversize_bytes else regular).append(index)
+        return regular, oversized
+
+    def take(self, sizes: Sequence[int], start: int, max_items: int) -> int:
+        """
+        从 start 开始装入一块，返回本块的题目数量（至少1道）
+
+        Args:
+            sizes: 每道题目编码后的字节数
+            start: 本块第一道题目的位置
+            max_items: 本块最多题目数（自适应分块大小）
+        """
+        used = len(_BATCH_PREFIX) + len(_BATCH_SUFFIX)
+        count = 0
+        for size in sizes[start:start + max(1, max_items)]:
+            # 题目之间有一个逗号分隔
+            needed = size + (1 if count else 0)
+            if count and used + needed > self.max_bytes:
+                break
+            used += needed
+            count += 1
+        return count
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应并发控制（AIMD）
+
+根据请求延迟和服务器过载信号自动调整同时进行的请求数：
+p95延迟低于目标时加性增加，遇到429/503或超时时乘性减少。
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict
+
+import requests
+
+
+class AIMDLimiter:
+    """
+    AIMD并发限制器
+
+    每次请求前通过 call() 占用一个名额，名额数即当前并发上限 limit。
+    限制器只能限制调用方已经发出的请求，实际并发数不会超过调用方的线程数，
+    报告时使用 effective_limit(线程数)。
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Args:
+            config: ADAPTIVE_CONCURRENCY_CONFIG 配置字典
+        """
+        self.min_limit = max(1, config.get('min_limit', 1))
+        self.max_limit = max(self.min_limit, config.get('max_limit', 32))
+        self.target_p95_latency = config.get('target_p95_latency', 1.0)
+        self.decrease_factor = config.get('decrease_factor', 0.5)
+        self.overload_status = set(config.get('overload_status', [429, 503]))
+
+        self._condition = threading.Condition()
+        self._limit = float(min(self.max_limit, max(self.min_limit, config.get('initial_limit', 4))))
+        self._latencies = deque(maxlen=config.get('latency_window', 50))
+        self._last_decrease = 0.0
+        self.in_flight = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """当前并发上限"""
+        with self._condition:
+            return int(self._limit)
+
+    def effective_limit(self, workers: int) -> int:
+        """
+        实际生效的并发数：并发上限和调用方线程数中的较小值
+        """
+        return max(1, min(self.limit, workers))
+
+    @property
+    def p95_latency(self) -> float:
+        """最近请求延迟的p95估计（秒），尚无数据时为0"""
+        with self._condition:
+            return self._p95()
+
+    def _p95(self) -> float:
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def _acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self._limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def _release(self, latency: float, overloaded: bool) -> None:
+        with self._condition:
+            # 只有并发上限被占满时才值得增加
+            saturated = self.in_flight >= int(self._limit)
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            if overloaded:
+                # 同一批并发请求同时失败只减少一次，间隔至少一个p95延迟
+                if now - self._last_decrease >= max(self._p95(), 0.1):
+                    self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                self._latencies.append(latency)
+                if saturated and self._p95() <= self.target_p95_latency:
+                    # 每完成约一个并发窗口的请求，上限加1
+                    self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+            self._condition.notify_all()
+
+    def call(self, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        在并发限制内执行一次请求，并根据结果调整并发上限
+        """
+        self._acquire()
+        started = time.perf_counter()
+        overloaded = False
+        try:
+            response = send()
+            overloaded = response.status_code in self.overload_status
+            return response
+        except requests.Timeout:
+            overloaded = True
+            raise
+        finally:
+            self._release(time.perf_counter() - started, overloaded)
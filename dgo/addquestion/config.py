@@ -6,10 +6,138 @@
 在这里配置你的系统参数
 """
 
+import os
+
+# 本地缓存目录（知识点缓存、导入日志、失败队列、去重哈希、预检结果），
+# 固定在本模块所在目录下，从任何工作目录运行脚本都使用同一份缓存
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
 # 服务器配置
 SERVER_CONFIG = {
     "base_url": "http://localhost:5001",  # API服务器地址
     "timeout": 30,  # 请求超时时间（秒）
+    "connect_timeout": 5,  # 建立连接超时时间（秒）
+    "read_timeout": 30,  # 读取响应超时时间（秒）
+    "pool_connections": 4,  # 连接池数量（按主机缓存）
+    "pool_maxsize": 16,  # 每个连接池保持的最大连接数
+    "keep_alive": True,  # 是否复用长连接
+}
+
+# 上传配置
+UPLOAD_CONFIG = {
+    "max_workers": 1,  # 同时进行的上传请求数，1表示顺序上传（建议不超过 pool_maxsize）
+    "async_concurrency": 32,  # AsyncQuestionManager 的最大并发请求数
+    "stream_batch_size": 200,  # 流式导入时每读取多少道题目上传一组
+    "json_backend": "auto",  # 请求体JSON编码后端：auto（安装了orjson时使用）、orjson、json
+}
+
+# 流水线配置：格式化 → 序列化 → 上传 分阶段并行处理，阶段之间用有界队列连接
+PIPELINE_CONFIG = {
+    "enabled": False,  # 批量导入时是否使用流水线上传
+    "queue_size": 64,  # 每个阶段输入队列的容量
+    "use_processes": True,  # CPU密集阶段（格式化、SVG生成）是否在进程池中执行
+    "cpu_workers": 0,  # CPU密集阶段的工作进程（线程模式下为线程）数，0表示CPU核数-1
+    "serialize_workers": 1,  # 序列化阶段的工作线程数
+    "upload_workers": 8,  # 上传阶段的工作线程数（建议不超过 pool_maxsize）
+}
+
+# 请求体压缩配置：超过阈值的请求体用gzip压缩（适合含SVG、base64图片的题目）
+COMPRESSION_CONFIG = {
+    "enabled": False,  # 是否压缩请求体（服务器需支持 Content-Encoding: gzip）
+    "min_size": 1024,  # 超过多少字节才压缩（几何题请求体约2KB，压缩后可减少一半）
+    "level": 6,  # gzip压缩级别（1-9，越大越慢、压缩率越高）
+}
+
+# 自适应并发配置（AIMD）：并发上传时在 [min_limit, max_workers] 之间自动调整同时进行的请求数
+ADAPTIVE_CONCURRENCY_CONFIG = {
+    "enabled": True,  # 是否启用自适应并发
+    "initial_limit": 4,  # 初始并发上限
+    "min_limit": 1,  # 并发上限的最小值
+    "max_limit": 64,  # 并发上限的最大值（实际还受 max_workers 线程数限制）
+    "target_p95_latency": 1.0,  # p95延迟低于该值（秒）时逐步增加并发
+    "decrease_factor": 0.5,  # 遇到429/503或超时时并发上限乘以该系数
+    "latency_window": 50,  # 统计延迟的最近请求数
+    "overload_status": [429, 503],  # 视为服务器过载的状态码
+}
+
+# 批量接口分块上传配置（POST /api/question-bank/:subject/batch）
+BULK_UPLOAD_CONFIG = {
+    "enabled": False,  # 批量导入时是否使用分块上传
+    "initial_chunk_size": 50,  # 初始每块题目数
+    "min_chunk_size": 1,  # 每块最少题目数
+    "max_chunk_size": 500,  # 每块最多题目数
+    "target_latency": 2.0,  # 每块请求的目标耗时（秒）
+    "max_request_bytes": 8 * 1024 * 1024,  # 请求体大小上限（服务器限制为10MB）
+    "max_chunk_bytes": 2 * 1024 * 1024,  # 每块请求体的字节预算
+    "oversize_item_bytes": 512 * 1024,  # 单题超过该大小时不进入分块，逐道以单题请求上传
+    "smoothing": 0.5,  # 耗时和大小估计的平滑系数
+}
+
+# 知识点ID持久化缓存配置
+KP_CACHE_CONFIG = {
+    "file": os.path.join(CACHE_DIR, "knowledge_points.json"),  # 缓存文件路径，None表示只缓存在内存中
+    "ttl": 7 * 24 * 3600,  # 缓存有效期（秒）
+    "resolve_workers": 8,  # 同时获取/创建缺失知识点的请求数
+}
+
+# 导入日志配置（断点续传）
+IMPORT_JOURNAL_CONFIG = {
+    "file": os.path.join(CACHE_DIR, "import_journal.ndjson"),  # 记录每道题目内容哈希和服务器结果的日志文件
+}
+
+# 重试与熔断配置
+RETRY_CONFIG = {
+    "max_retries": 3,  # 单个请求最多重试次数
+    "base_delay": 0.5,  # 指数退避的基础等待时间（秒）
+    "max_delay": 30,  # 单次等待的最长时间（秒）
+    "retryable_status": [408, 429, 500, 502, 503, 504],  # 幂等请求可重试的状态码；上传题目只在429和带Retry-After的503时重试
+    "breaker_window": 20,  # 熔断器统计最近多少次请求
+    "breaker_error_rate": 0.5,  # 错误率达到该值时暂停上传
+    "breaker_min_requests": 10,  # 至少统计多少次请求后才判断错误率
+    "breaker_cooldown": 30,  # 暂停时间（秒）
+}
+
+# 失败队列配置：重试耗尽后仍失败的题目写入该文件，可用 replay_dead_letters.py 重新提交
+DEAD_LETTER_CONFIG = {
+    "file": os.path.join(CACHE_DIR, "dead_letters.ndjson"),
+}
+
+# 多服务器分片上传配置：endpoints 为空时只使用 SERVER_CONFIG['base_url']
+SHARDING_CONFIG = {
+    "endpoints": [],  # API副本地址列表，如 ["http://api-1:5001", "http://api-2:5001"]
+    "route_by": "content",  # 路由键：content（按题目内容哈希）或 subject（按科目）
+    "failure_threshold": 3,  # 副本连续失败多少次后暂停使用
+    "cooldown": 30,  # 副本暂停使用的时间（秒），之后重新尝试
+    "failover_status": [502, 503],  # 视为副本不可用、重试时转移到其他副本的状态码（504时副本可能已写入，不转移）
+}
+
+# 上传演练配置：不联网，只格式化和序列化题目并估算上传耗时
+DRY_RUN_CONFIG = {
+    "rtt": 0.05,  # 估算用的单个请求往返延迟（秒，含服务器处理时间）
+    "concurrency": 8,  # 估算用的并发请求数
+    "bandwidth_mbps": 0,  # 估算用的上行带宽（Mbps），0表示不计传输时间
+    "top_n": 5,  # 报告中列出的最大请求体数量
+}
+
+# 题目去重配置：上传前按规范化后的题干哈希跳过题库中已有的题目
+DEDUP_CONFIG = {
+    "enabled": True,  # 是否在上传前去重
+    "dir": os.path.join(CACHE_DIR, "content_hashes"),  # 按科目保存内容哈希的目录（每道题目8字节）
+    "sync": True,  # 首次使用某科目时是否从服务器同步已有题目的哈希
+    "page_size": 500,  # 同步时每页读取的题目数
+}
+
+# 启动预检配置：服务器连接、token、知识点预取并发执行，成功结果短时间缓存
+PREFLIGHT_CONFIG = {
+    "cache_file": os.path.join(CACHE_DIR, "preflight.json"),  # 成功结果缓存文件，None表示不缓存
+    "ttl": 300,  # 成功结果的缓存时间（秒），期间重复运行不再检查
+    "max_workers": 4,  # 同时进行的检查数
+}
+
+# KaTeX公式格式化缓存配置（format_math_content / validate_math_content）
+KATEX_CACHE_CONFIG = {
+    "max_entries": 4096,  # 每个函数最多缓存的文本数，0表示不缓存
+    "max_text_length": 2000,  # 超过该长度的文本不缓存（很少重复）
 }
 
 # 认证配置
@@ -22,6 +150,14 @@ AUTH_CONFIG = {
     # 4. 找到 'auth_token' 或类似的键值
 }
 
+# token校验配置：优先在本地检查JWT是否过期，无法判断时才访问服务器
+TOKEN_VALIDATION_CONFIG = {
+    "probe_path": "/api/auth/me",  # 本地无法判断时访问的轻量认证接口
+    "cache_file": os.path.join(CACHE_DIR, "token_status.json"),  # 服务器校验结果缓存文件，None表示不缓存
+    "verdict_ttl": 3600,  # 服务器校验结果的缓存时间（秒）
+    "expiry_leeway": 60,  # 距离过期不足多少秒时视为已过期
+}
+
 # 默认题目配置
 DEFAULT_QUESTION_CONFIG = {
     "difficulty": "medium",  # 默认难度：easy, medium, hard
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+上传失败队列（死信队列）
+
+重试耗尽后仍然失败的题目请求体连同错误信息、尝试次数追加写入NDJSON文件（每行一条）。
+服务器故障恢复后用 replay_dead_letters.py 只重新提交这些题目，
+不需要重新生成题目或重新读取源文件。
+多个分片进程可以共用同一个队列文件，读写都持有跨进程文件锁。
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from local_store import file_lock
+
+logger = logging.getLogger(__name__)
+
+
+class DeadLetterQueue:
+    """
+    追加写入的失败队列
+
+    重放时先把文件改名为 .replaying 再逐条提交，重放中再次失败的条目会重新写入队列；
+    重放中断时遗留的 .replaying 文件会在下一次重放时一并取出。
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 队列文件路径，不存在时自动创建
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    @property
+    def replaying_path(self) -> str:
+        return f"{self.path}.replaying"
+
+    def record(self, path: str, payload: Dict, error: str, attempts: int,
+               status: Optional[int] = None, source: str = "", outcome: str = "failed") -> None:
+        """
+        追加一条失败记录
+
+        Args:
+            path: 请求的接口路径（如 /api/ai/save-question）
+            payload: 请求体
+            error: 错误信息
+            attempts: 累计尝试次数
+            status: HTTP状态码，连接错误时为None
+            source: 产生失败的脚本或方法
+            outcome: failed（服务器确定没有写入）或 unknown（请求可能已被处理，如5xx、读取超时）
+        """
+        line = json.dumps({
+            'ts': time.time(),
+            'path': path,
+            'payload': payload,
+            'error': error,
+            'status': status,
+            'attempts': attempts,
+            'source': source,
+            'outcome': outcome
+        }, ensure_ascii=False)
+
+        with self._lock, file_lock(self.path):
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        logger.warning(f"上传失败已写入失败队列: {path}，尝试 {attempts} 次，错误: {error}")
+
+    @staticmethod
+    def _read(path: str) -> List[Dict]:
+        entries = []
+        if not os.path.exists(path):
+            return entries
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 进程中断时最后一行可能只写了一半
+                    logger.warning(f"失败队列第 {line_number} 行损坏，已忽略")
+        return entries
+
+    def entries(self) -> List[Dict]:
+        """
+        读取队列中的全部条目（包括中断的重放遗留的条目）
+        """
+        with self._lock, file_lock(self.path, shared=True):
+            return self._read(self.replaying_path) + self._read(self.path)
+
+    def __len__(self) -> int:
+        return len(self.entries())
+
+    def take_all(self) -> List[Dict]:
+        """
+        取出全部条目准备重放，之后新写入的失败记录进入新的队列文件
+        """
+        with self._lock, file_lock(self.path):
+            entries = self._read(self.replaying_path)
+            if os.path.exists(self.path):
+                entries += self._read(self.path)
+                # 把待重放的条目合并写入 .replaying 后再删除原文件
+                with open(self.replaying_path, 'w', encoding='utf-8') as f:
+                    for entry in entries:
+                        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                os.remove(self.path)
+            return entries
+
+    def finish_replay(self) -> None:
+        """
+        重放结束，删除 .replaying 文件（再次失败的条目已重新写入队列）
+        """
+        with self._lock, file_lock(self.path):
+            if os.path.exists(self.replaying_path):
+                os.remove(self.replaying_path)
@@ -10,18 +10,37 @@
 4. 交互式操作界面
 """
 
-import requests
 import json
 import base64
 import os
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from config import (
     SERVER_CONFIG, AUTH_CONFIG, DEFAULT_QUESTION_CONFIG,
     SUPPORTED_SUBJECTS, SAMPLE_KNOWLEDGE_POINTS, SAMPLE_QUESTIONS,
-    LOGGING_CONFIG, MAX_IMAGE_SIZE
+    LOGGING_CONFIG, MAX_IMAGE_SIZE, UPLOAD_CONFIG, BULK_UPLOAD_CONFIG,
+    KP_CACHE_CONFIG, IMPORT_JOURNAL_CONFIG, PIPELINE_CONFIG, TOKEN_VALIDATION_CONFIG,
+    DEAD_LETTER_CONFIG, DRY_RUN_CONFIG, DEDUP_CONFIG, PREFLIGHT_CONFIG
 )
-from katex_formatter import format_math_content, validate_math_content
+from katex_formatter import format_math_content, katex_cache_report, validate_math_content
+from bulk_upload import AdaptiveChunkSizer, ByteBudgetPacker, build_batch_body
+from kp_cache import KnowledgePointCache
+from kp_resolver import KnowledgePointResolver
+from import_journal import ImportJournal
+from dead_letter import DeadLetterQueue
+from json_stream import iter_import_file
+from pipeline import Pipeline, Stage, default_process_workers
+from auth_token import TokenValidator
+from json_codec import get_codec
+from payload_profiler import PayloadProfiler
+from preflight import Preflight, PreflightCache
+from question_dedup import QuestionDeduplicator
+from retry_policy import RetryPolicy, request_not_sent
+from shard_partition import Shard, in_shard
+from upload_transport import UploadTransport
 
 # 配置日志
 logging.basicConfig(
@@ -31,25 +50,217 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 保存题目接口
+SAVE_QUESTION_PATH = "/api/ai/save-question"
+
+def batch_create_path(subject: str) -> str:
+    """
+    科目题库的批量创建接口（action=create），保存题目的全部字段，包括 imageData/mimeType
+    """
+    return f"/api/question-bank/{subject}/batch"
+
+def is_batch_create_path(path: Optional[str]) -> bool:
+    return bool(path) and path.startswith("/api/question-bank/") and path.endswith("/batch")
+
+def build_auth_headers(token: str) -> Dict[str, Optional[str]]:
+    """
+    构造带认证信息的请求头，未配置token时Authorization为None
+    """
+    return {
+        'Content-Type': 'application/json',
+        'Authorization': f'Bearer {token}' if token != 'your_auth_token_here' else None
+    }
+
+def build_text_question_payload(subject: str,
+                                content: str,
+                                options: List[str],
+                                correct_answer: str,
+                                explanation: str,
+                                knowledge_points: List[str],
+                                difficulty: str = "medium") -> Dict:
+    """
+    构造 /api/ai/save-question 的请求体（格式化数学公式为KaTeX标准并检查兼容性）
+    
+    同步和异步上传共用此函数，保证两条路径发送的数据完全一致
+    """
+    # 格式化数学公式为KaTeX标准
+    formatted_content = format_math_content(content)
+    formatted_options = [format_math_content(option) for option in options]
+    formatted_explanation = format_math_content(explanation)
+    
+    # 验证KaTeX兼容性
+    content_valid, content_issues = validate_math_content(formatted_content)
+    if not content_valid:
+        logger.warning(f"题目内容KaTeX兼容性问题: {content_issues}")
+    
+    explanation_valid, explanation_issues = validate_math_content(formatted_explanation)
+    if not explanation_valid:
+        logger.warning(f"题目解释KaTeX兼容性问题: {explanation_issues}")
+    
+    return {
+        "question": {
+            "content": formatted_content,
+            "subject": subject,
+            "options": formatted_options,
+            "correctAnswer": correct_answer,
+            "explanation": formatted_explanation,
+            "knowledgePoints": knowledge_points,
+            "difficulty": difficulty,
+            "type": DEFAULT_QUESTION_CONFIG['type']
+        }
+    }
+
+def resolve_knowledge_point_ids(question: Dict, knowledge_points_map: Dict[str, str]) -> List[str]:
+    """
+    将题目中的知识点名称转换为ID，找不到的知识点记录警告后跳过
+    """
+    knowledge_point_ids = []
+    for point_name in question.get('knowledge_points', []):
+        if point_name in knowledge_points_map:
+            knowledge_point_ids.append(knowledge_points_map[point_name])
+        else:
+            logger.warning(f"未找到知识点: {point_name}")
+    return knowledge_point_ids
+
+def format_batch_question(task: Tuple[int, str, Dict, List[str]]) -> Tuple[int, Dict]:
+    """
+    流水线格式化阶段：把批量导入中的一道题目转换为请求体
+    
+    定义为模块级函数，以便在进程池中执行
+    """
+    index, subject, question, knowledge_point_ids = task
+    return index, build_text_question_payload(
+        subject,
+        question['content'],
+        question['options'],
+        question['correct_answer'],
+        question['explanation'],
+        knowledge_point_ids,
+        question.get('difficulty', DEFAULT_QUESTION_CONFIG['difficulty'])
+    )
+
+def serialize_question(item: Tuple[int, Dict]) -> Tuple[int, Dict, bytes]:
+    """
+    流水线序列化阶段：把请求体编码为紧凑的UTF-8 JSON
+    """
+    index, question_data = item
+    return index, question_data, get_codec(UPLOAD_CONFIG['json_backend']).dumps(question_data)
+
 class EnhancedQuestionManager:
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None):
         """
         初始化增强版题目管理器
+        
+        Args:
+            base_url: API服务器地址，默认读取 SERVER_CONFIG；知识点缓存、去重、token缓存都按该地址区分，
+                      创建后不能修改
         """
-        self.base_url = SERVER_CONFIG['base_url'].rstrip('/')
-        self.timeout = SERVER_CONFIG['timeout']
         self.token = AUTH_CONFIG['token']
+        self.headers = build_auth_headers(self.token)
         
-        self.headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {self.token}' if self.token != 'your_auth_token_here' else None
-        }
+        # 共用的上传传输层：连接池会话、JSON编码、压缩、重试、自适应并发、多副本路由和统计
+        self.transport = UploadTransport(base_url or SERVER_CONFIG['base_url'], self.headers)
+        self.timeout = self.transport.timeout
+        self.session = self.transport.session
+        self.codec = self.transport.codec
+        self.retry_policy = self.transport.retry_policy
+        self.concurrency = self.transport.concurrency
+        self.router = self.transport.router
+        
+        self.token_validator = TokenValidator(self.token, self.base_url, TOKEN_VALIDATION_CONFIG)
+        
+        # 存储创建的知识点ID（持久化到本地文件），避免重复创建
+        self.knowledge_point_cache = KnowledgePointCache(
+            KP_CACHE_CONFIG['file'], self.base_url, KP_CACHE_CONFIG['ttl']
+        )
+        
+        # 上传前批量解析题目引用的知识点（预取列表 + 并发获取缺失项）
+        self.kp_resolver = KnowledgePointResolver(
+            self.session, self.base_url, self.timeout, self.knowledge_point_cache,
+            KP_CACHE_CONFIG['resolve_workers'], self.retry_policy
+        )
+        
+        # 导入日志，启用后已确认的题目在重新运行时会被跳过
+        self.import_journal = None
+        
+        # 失败队列，重试耗尽后仍失败的题目写入其中，可用 replay_dead_letters() 重新提交
+        self.dead_letters = DeadLetterQueue(DEAD_LETTER_CONFIG['file'])
         
-        # 存储创建的知识点ID，避免重复创建
-        self.knowledge_point_cache = {}
+        # 上传前按内容哈希跳过题库中已有的题目
+        self.deduplicator = None
+        if DEDUP_CONFIG['enabled']:
+            self.deduplicator = QuestionDeduplicator(self.session, self.base_url, self.timeout, DEDUP_CONFIG)
+        
+        # 演练模式：设置后只格式化和序列化题目并统计请求体，不发送任何请求
+        self.profiler = None
         
         logger.info("题目管理器初始化完成")
     
+    @property
+    def base_url(self) -> str:
+        return self.transport.base_url
+    
+    @property
+    def connections_reused(self) -> int:
+        """
+        复用已有连接的请求次数
+        """
+        return self.transport.connections_reused
+    
+    def enable_import_journal(self, path: Optional[str] = None) -> ImportJournal:
+        """
+        启用导入日志（断点续传）
+        
+        Args:
+            path: 日志文件路径，默认读取 IMPORT_JOURNAL_CONFIG
+        """
+        self.import_journal = ImportJournal(path or IMPORT_JOURNAL_CONFIG['file'])
+        if self.import_journal.acknowledged_count:
+            print(f"📒 导入日志中已有 {self.import_journal.acknowledged_count} 道题目，将自动跳过")
+        return self.import_journal
+    
+    def enable_dry_run(self) -> PayloadProfiler:
+        """
+        启用演练模式（不联网），返回统计请求体的 PayloadProfiler
+        
+        知识点按名称直接使用，题目走完整的格式化和序列化流程但不上传
+        """
+        self.profiler = PayloadProfiler(self.codec, DRY_RUN_CONFIG['top_n'])
+        print("🧪 演练模式：不会连接服务器，只统计请求体")
+        return self.profiler
+    
+    def _journal_key(self, question_data: Dict) -> Optional[str]:
+        """
+        计算题目在导入日志中的键，未启用导入日志时返回None
+        """
+        if self.import_journal is None:
+            return None
+        return ImportJournal.content_hash(question_data, self.base_url)
+    
+    def _record_journal(self, journal_key: Optional[str], success: bool, result: Dict) -> None:
+        if journal_key:
+            self.import_journal.record(journal_key, success, result)
+    
+    def save_question(self, question_data: Dict, verbose: bool = True, body: Optional[bytes] = None) -> bool:
+        """
+        保存已构造好的题目请求体（可含SVG图形、图片等字段）
+        
+        与批量导入使用同一条上传路径：导入日志、去重、重试、压缩、失败队列和统计都会生效，
+        供几何题生成等脚本使用
+        
+        Args:
+            question_data: {"question": {...}} 请求体
+            verbose: 是否在终端输出结果
+            body: 已用 self.codec 序列化的请求体，为None时在发送前序列化
+        """
+        return self._post_question(question_data, verbose, body)
+    
+    def close(self):
+        """
+        关闭会话，释放连接池
+        """
+        self.transport.close()
+    
     def check_server_connection(self) -> bool:
         """
         检查服务器连接状态
@@ -61,18 +272,21 @@ class EnhancedQuestionManager:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
                 'Accept': 'application/json, text/plain, */*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Connection': 'keep-alive'
+                'Accept-Language': 'en-US,en;q=0.9'
             }
-            # 禁用代理以避免503错误
-            proxies = {'http': None, 'https': None}
-            response = requests.get(f"{self.base_url}/health", timeout=5, headers=headers, proxies=proxies)
+            probe_timeout = (self.timeout[0], 5)
+            # 配置了多个副本时上传只发往各副本，检查副本而不是 base_url
+            if self.router is not None:
+                healthy = self.router.probe('/health', probe_timeout)
+                print(f"🔀 可用副本 {healthy}/{len(self.router.replicas)}")
+                return healthy > 0
+            response = self.session.get(f"{self.base_url}/health", timeout=probe_timeout, headers=headers)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"服务器连接失败: {e}")
             try:
                 # 尝试访问根路径
-                response = requests.get(self.base_url, timeout=5, headers=headers, proxies=proxies)
+                response = self.session.get(self.base_url, timeout=probe_timeout, headers=headers)
                 return True
             except Exception as e2:
                 logger.error(f"根路径连接也失败: {e2}")
@@ -82,25 +296,71 @@ class EnhancedQuestionManager:
         """
         验证认证token是否有效
         
+        先在本地检查JWT是否过期，无法判断时才访问轻量的认证接口（结果会被缓存）
+        
         Returns:
             token是否有效
         """
         if not self.headers.get('Authorization'):
             return False
         
+        return self.token_validator.is_valid(self._probe_token)
+    
+    def _probe_token(self) -> Optional[bool]:
+        """
+        访问需要认证的接口检查token，请求失败时返回None
+        """
         try:
-            # 尝试访问需要认证的接口
-            # 禁用代理以避免503错误
-            proxies = {'http': None, 'https': None}
-            response = requests.get(
-                f"{self.base_url}/api/ai/study-advice",
-                headers=self.headers,
-                timeout=self.timeout,
-                proxies=proxies
+            response = self.session.get(
+                f"{self.base_url}{TOKEN_VALIDATION_CONFIG['probe_path']}",
+                timeout=self.timeout
             )
             return response.status_code != 401
-        except:
-            return False
+        except Exception as e:
+            logger.warning(f"token校验请求失败: {str(e)}")
+            return None
+    
+    def preflight(self, subjects: Iterable[str] = (), check_token: bool = True) -> Dict[str, bool]:
+        """
+        启动预检：同时检查服务器连接、验证token、预取各科目的知识点列表
+        
+        服务器连接和知识点预取的成功结果缓存 PREFLIGHT_CONFIG['ttl'] 秒，
+        期间重复运行直接使用缓存；token由 TokenValidator 在本地判断或自行缓存
+        
+        Args:
+            subjects: 需要预取知识点列表的科目
+            check_token: 是否验证token
+            
+        Returns:
+            各检查项是否成功：'server'、'token'（check_token为True时）、'kp:<科目>'
+        """
+        subjects = list(dict.fromkeys(subjects))
+        preflight = Preflight(
+            PreflightCache(PREFLIGHT_CONFIG['cache_file'], self.base_url, PREFLIGHT_CONFIG['ttl']),
+            PREFLIGHT_CONFIG['max_workers']
+        )
+        preflight.add('server', self.check_server_connection)
+        if check_token:
+            preflight.add('token', self.validate_token, cacheable=False)
+        for subject in subjects:
+            def prefetch(subject=subject) -> bool:
+                self.kp_resolver.prefetch(subject)
+                return self.kp_resolver.is_prefetched(subject)
+            preflight.add(f"kp:{subject}", prefetch)
+        
+        started = time.perf_counter()
+        results, cached = preflight.run()
+        
+        # 缓存有效期内知识点列表已在本地缓存中，解析时不再预取
+        for subject in subjects:
+            if results[f"kp:{subject}"]:
+                self.kp_resolver.mark_prefetched(subject)
+        
+        labels = {'server': '服务器', 'token': 'token', **{f"kp:{subject}": f"知识点({subject})" for subject in subjects}}
+        summary = "，".join(f"{labels[name]} {'✅' if ok else '❌'}" for name, ok in results.items())
+        hint = f"（使用缓存: {'、'.join(labels[name] for name in cached)}）" if cached else ""
+        print(f"🔍 预检 {time.perf_counter() - started:.2f} 秒：{summary}{hint}")
+        return results
     
     def create_knowledge_point_batch(self, subject: str, points: List[Dict]) -> Dict[str, str]:
         """
@@ -113,22 +373,42 @@ class EnhancedQuestionManager:
         Returns:
             知识点名称到ID的映射
         """
-        created_points = {}
+        created_points = self._resolve_knowledge_points(subject, [point['name'] for point in points])
         
         for point in points:
-            point_id = self.create_knowledge_point(
-                name=point['name'],
-                subject=subject,
-                description=point.get('description', '')
-            )
-            
-            if point_id:
-                created_points[point['name']] = point_id
-                self.knowledge_point_cache[f"{subject}:{point['name']}"] = point_id
+            if point['name'] in created_points:
+                print(f"✅ 知识点就绪: {point['name']}")
+            else:
+                print(f"❌ 知识点创建失败: {point['name']}")
         
         logger.info(f"批量创建知识点完成，科目：{subject}，成功：{len(created_points)}个")
         return created_points
     
+    def complete_knowledge_points_map(self, subject: str, questions: List[Dict],
+                                      knowledge_points_map: Dict[str, str]) -> Dict[str, str]:
+        """
+        补全题目引用但映射中没有的知识点，返回新的完整映射
+        
+        上传开始前一次性解析，避免逐题查找时遗漏知识点
+        """
+        missing = [
+            name
+            for question in questions
+            for name in question.get('knowledge_points', [])
+            if name not in knowledge_points_map
+        ]
+        if not missing:
+            return knowledge_points_map
+        return {**knowledge_points_map, **self._resolve_knowledge_points(subject, missing)}
+    
+    def _resolve_knowledge_points(self, subject: str, names: List[str]) -> Dict[str, str]:
+        """
+        解析知识点名称；演练模式下不访问服务器，直接使用名称
+        """
+        if self.profiler is not None:
+            return {name: name for name in names}
+        return self.kp_resolver.resolve(subject, names)
+    
     def create_knowledge_point(self, name: str, subject: str, description: str = "") -> Optional[str]:
         """
         创建知识点（带缓存）
@@ -146,9 +426,7 @@ class EnhancedQuestionManager:
         }
         
         try:
-            # 禁用代理以避免503错误
-            proxies = {'http': None, 'https': None}
-            response = requests.post(url, json=data, headers=self.headers, timeout=self.timeout, proxies=proxies)
+            response = self.session.post(url, json=data, timeout=self.timeout)
             if response.status_code == 201:
                 result = response.json()
                 point_id = result['knowledgePoint']['_id']
@@ -189,7 +467,8 @@ class EnhancedQuestionManager:
         
         return True, ""
     
-    def add_question_batch(self, subject: str, questions: List[Dict], knowledge_points_map: Dict[str, str]) -> int:
+    def add_question_batch(self, subject: str, questions: List[Dict], knowledge_points_map: Dict[str, str],
+                           max_workers: Optional[int] = None) -> int:
         """
         批量添加题目
         
@@ -197,38 +476,351 @@ class EnhancedQuestionManager:
             subject: 科目名称
             questions: 题目列表
             knowledge_points_map: 知识点名称到ID的映射
+            max_workers: 同时进行的上传请求数，默认读取 UPLOAD_CONFIG，1表示顺序上传
             
         Returns:
             成功添加的题目数量
         """
-        success_count = 0
+        knowledge_points_map = self.complete_knowledge_points_map(subject, questions, knowledge_points_map)
+        retries_before = self.retry_policy.retries
+        serialized_before = self.transport.snapshot()
+        results = self.upload_question_batch(subject, questions, knowledge_points_map, max_workers)
+        success_count = sum(results)
+        retries = self.retry_policy.retries - retries_before
         
-        for i, question in enumerate(questions, 1):
-            print(f"\n正在添加第 {i}/{len(questions)} 道题目...")
+        if retries:
+            print(f"🔁 本批次共重试 {retries} 次")
+        self.transport.report(serialized_before)
+        logger.info(f"批量添加题目完成，科目：{subject}，成功：{success_count}/{len(questions)}，重试：{retries}次")
+        return success_count
+    
+    def upload_question_batch(self, subject: str, questions: List[Dict], knowledge_points_map: Dict[str, str],
+                              max_workers: Optional[int] = None) -> List[bool]:
+        """
+        批量上传题目，返回与输入顺序一致的结果列表
+        
+        Args:
+            subject: 科目名称
+            questions: 题目列表
+            knowledge_points_map: 知识点名称到ID的映射
+            max_workers: 同时进行的上传请求数，默认读取 UPLOAD_CONFIG
             
-            # 转换知识点名称为ID
-            knowledge_point_ids = []
-            for point_name in question.get('knowledge_points', []):
-                if point_name in knowledge_points_map:
-                    knowledge_point_ids.append(knowledge_points_map[point_name])
-                else:
-                    logger.warning(f"未找到知识点: {point_name}")
+        Returns:
+            每道题目是否添加成功
+        """
+        return self._upload_items(
+            [question['content'] for question in questions],
+            lambda index, verbose: self._add_batch_question(subject, questions[index], knowledge_points_map, verbose),
+            max_workers
+        )
+    
+    def _upload_items(self, labels: List[str], upload_one: Callable[[int, bool], bool],
+                      max_workers: Optional[int] = None) -> List[bool]:
+        """
+        顺序或并发执行一组上传
+        
+        Args:
+            labels: 每道题目的内容，用于输出进度
+            upload_one: 上传第 index 道题目的函数，第二个参数为是否输出详细结果
+            max_workers: 同时进行的上传请求数，默认读取 UPLOAD_CONFIG
             
-            success = self.add_text_question(
-                subject=subject,
-                content=question['content'],
-                options=question['options'],
-                correct_answer=question['correct_answer'],
-                explanation=question['explanation'],
-                knowledge_points=knowledge_point_ids,
-                difficulty=question.get('difficulty', DEFAULT_QUESTION_CONFIG['difficulty'])
+        Returns:
+            与输入顺序一致的结果列表
+        """
+        if max_workers is None:
+            max_workers = UPLOAD_CONFIG['max_workers']
+        total = len(labels)
+        
+        if max_workers <= 1 or total <= 1:
+            results = []
+            for i in range(total):
+                print(f"\n正在添加第 {i + 1}/{total} 道题目...")
+                results.append(upload_one(i, True))
+            return results
+        
+        print(f"\n并发上传 {total} 道题目（并发数：{max_workers}）...")
+        results = [False] * total
+        print_lock = threading.Lock()
+        
+        def upload(index: int) -> None:
+            success = upload_one(index, False)
+            results[index] = success
+            # 每道题目只输出一行完整进度，避免多线程输出交错
+            with print_lock:
+                status = "✅ 题目添加成功" if success else "❌ 题目添加失败"
+                print(f"[{index + 1}/{total}] {status}: {labels[index][:30]}...")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for future in [executor.submit(upload, i) for i in range(total)]:
+                future.result()
+        
+        if self.concurrency is not None:
+            print(f"📈 自适应并发：实际并发 {self.concurrency.effective_limit(max_workers)}"
+                  f"（上限 {self.concurrency.limit}，线程数 {max_workers}），"
+                  f"p95延迟 {self.concurrency.p95_latency:.2f} 秒")
+        
+        failed = [str(i) for i, success in enumerate(results, 1) if not success]
+        if failed:
+            print(f"⚠️ 添加失败的题目序号: {', '.join(failed)}（详见日志）")
+        return results
+    
+    def pipeline_upload_questions(self, subject: str, questions: Iterable[Dict],
+                                  knowledge_points_map: Dict[str, str]) -> Tuple[int, int]:
+        """
+        通过 格式化 → 序列化 → 上传 流水线上传题目
+        
+        KaTeX格式化在进程池中执行，上传由多个线程同时进行，两者互相重叠；
+        阶段之间的队列有界，questions 可以是边读取边产生的生成器。
+        
+        Args:
+            subject: 科目名称
+            questions: 题目（列表或生成器）
+            knowledge_points_map: 知识点名称到ID的映射（生成器输入时需事先补全）
+            
+        Returns:
+            (成功数量, 题目总数)
+        """
+        total = 0
+        print_lock = threading.Lock()
+        
+        def tasks():
+            nonlocal total
+            for index, question in enumerate(questions):
+                total += 1
+                yield index, subject, question, resolve_knowledge_point_ids(question, knowledge_points_map)
+        
+        def upload(item: Tuple[int, Dict, bytes]) -> bool:
+            index, question_data, body = item
+            success = self._post_question(question_data, verbose=False, body=body)
+            with print_lock:
+                status = "✅ 题目添加成功" if success else "❌ 题目添加失败"
+                print(f"[{index + 1}] {status}: {question_data['question']['content'][:30]}...")
+            return success
+        
+        use_processes = PIPELINE_CONFIG['use_processes']
+        pipeline = Pipeline([
+            Stage("格式化", format_batch_question,
+                  workers=PIPELINE_CONFIG['cpu_workers'] or default_process_workers(),
+                  use_process=use_processes),
+            Stage("序列化", serialize_question, workers=PIPELINE_CONFIG['serialize_workers']),
+            Stage("上传", upload, workers=PIPELINE_CONFIG['upload_workers']),
+        ], queue_size=PIPELINE_CONFIG['queue_size'])
+        
+        serialized_before = self.transport.snapshot()
+        results = pipeline.run(tasks())
+        success_count = sum(results)
+        
+        print(f"\n📊 {pipeline.report()}")
+        self.transport.report(serialized_before)
+        logger.info(f"流水线上传完成，科目：{subject}，成功：{success_count}/{total}\n{pipeline.report()}")
+        return success_count, total
+    
+    def bulk_upload_questions(self, subject: str, questions: List[Dict],
+                              knowledge_points_map: Dict[str, str]) -> List[bool]:
+        """
+        通过批量接口分块上传题目，失败的题目逐条重试
+        
+        每道题目只编码一次，再按字节预算和自适应题目数上限打包成块（见 BULK_UPLOAD_CONFIG）；
+        超过单题大小上限的题目（如大图片）和分块中失败的题目，逐道以单题的批量创建请求上传，
+        与分块使用同一个接口，图片等字段不会丢失
+        
+        只有服务器确定没有处理整块时（连接没有建立、429、带 Retry-After 的503、其他4xx）
+        才逐道重发；5xx、读取超时等情况下整块可能已经写入，这些题目不重发、不计为成功，
+        以“结果未知”写入失败队列
+        
+        Args:
+            subject: 科目名称
+            questions: 题目列表，可带 svg_data/figure_properties 或 image_data/mime_type
+            knowledge_points_map: 知识点名称到ID的映射
+            
+        Returns:
+            与输入顺序一致的结果列表
+        """
+        knowledge_points_map = self.complete_knowledge_points_map(subject, questions, knowledge_points_map)
+        started = time.perf_counter()
+        payloads = [self._bulk_question_payload(subject, question, knowledge_points_map) for question in questions]
+        if self.profiler is not None:
+            self.profiler.add_format_time(time.perf_counter() - started)
+            return [self._post_question({"question": payload}, verbose=False) for payload in payloads]
+        
+        total = len(payloads)
+        results = [False] * total
+        
+        # 跳过导入日志中已确认的题目和题库中已有的题目
+        pending = []
+        duplicates = 0
+        for index, payload in enumerate(payloads):
+            journal_key = self._journal_key({"question": payload})
+            if journal_key and self.import_journal.is_acknowledged(journal_key):
+                results[index] = True
+            elif self.deduplicator is not None and not self.deduplicator.reserve(payload):
+                results[index] = True
+                duplicates += 1
+            else:
+                pending.append((index, payload, journal_key))
+        if len(pending) + duplicates < total:
+            print(f"⏭️ 跳过已导入的题目 {total - len(pending) - duplicates} 道")
+        if duplicates:
+            print(f"⏭️ 跳过题库中已有的相同题目 {duplicates} 道")
+        
+        sizer = AdaptiveChunkSizer(BULK_UPLOAD_CONFIG)
+        packer = ByteBudgetPacker(BULK_UPLOAD_CONFIG)
+        retries_before = self.retry_policy.retries
+        serialized_before = self.transport.snapshot()
+        request_count = 0
+        unknown_count = 0
+        
+        encoded = [self.codec.dumps(item[1]) for item in pending]
+        regular, oversized = packer.split_oversized([len(body) for body in encoded])
+        
+        if oversized:
+            # 单题接口会重新检查重复
+            if self.deduplicator is not None:
+                for i in oversized:
+                    self.deduplicator.release(pending[i][1])
+            print(f"📦 {len(oversized)} 道题目超过 {packer.oversize_bytes // 1024} KB，改为逐道上传")
+            oversized_results = self._upload_items(
+                [pending[i][1]['content'] for i in oversized],
+                lambda index, verbose: self._post_question(
+                    {"question": pending[oversized[index]][1]}, verbose,
+                    body=build_batch_body([encoded[oversized[index]]]), path=batch_create_path(subject)
+                )
             )
+            request_count += len(oversized)
+            for i, success in zip(oversized, oversized_results):
+                results[pending[i][0]] = success
+        
+        sizes = [len(encoded[i]) for i in regular]
+        start = 0
+        while start < len(regular):
+            count = packer.take(sizes, start, sizer.next_size())
+            chunk = [pending[i] for i in regular[start:start + count]]
+            body = build_batch_body([encoded[i] for i in regular[start:start + count]])
+            
+            started = time.perf_counter()
+            shard_key = self.transport.shard_key(chunk[0][1])
+            chunk_results, failure = self._post_question_chunk(subject, body, len(chunk), shard_key)
+            request_count += 1
+            sizer.record(len(chunk), len(body), time.perf_counter() - started, chunk_results is not None)
             
-            if success:
-                success_count += 1
+            chunk_success = 0
+            for (index, payload, journal_key), item in zip(chunk, chunk_results or [{'success': False}] * len(chunk)):
+                success = bool(item.get('success'))
+                if failure is not None and not failure['not_processed']:
+                    # 整块可能已经写入，重发会重复创建
+                    self._record_unknown_outcome(subject, payload, journal_key, failure)
+                    unknown_count += 1
+                elif success:
+                    self._record_journal(journal_key, True, {'status': 200, 'questionId': item.get('questionId')})
+                    if self.deduplicator is not None:
+                        self.deduplicator.commit(payload)
+                else:
+                    # 批量写入失败的题目逐条重试
+                    if self.deduplicator is not None:
+                        self.deduplicator.release(payload)
+                    request_count += 1
+                    success = self._post_question({"question": payload}, verbose=False,
+                                                  path=batch_create_path(subject))
+                results[index] = success
+                chunk_success += success
+            
+            print(f"[{start + len(chunk)}/{len(regular)}] 分块上传完成：{chunk_success}/{len(chunk)} 成功"
+                  f"（{len(body) / 1024:.0f} KB，下一块最多 {sizer.next_size()} 道）")
+            start += len(chunk)
         
-        logger.info(f"批量添加题目完成，科目：{subject}，成功：{success_count}/{len(questions)}")
-        return success_count
+        if unknown_count:
+            print(f"⚠️ {unknown_count} 道题目的分块请求结果未知（可能已写入），未重发，已写入 {self.dead_letters.path}")
+        self.transport.report(serialized_before)
+        logger.info(f"分块上传完成，科目：{subject}，成功：{sum(results)}/{total}，请求数：{request_count}，"
+                    f"单独上传：{len(oversized)}道，结果未知：{unknown_count}道，"
+                    f"重试：{self.retry_policy.retries - retries_before}次")
+        return results
+    
+    def _bulk_question_payload(self, subject: str, question: Dict, knowledge_points_map: Dict[str, str]) -> Dict:
+        """
+        构造批量上传中单道题目的数据，附带题目中的SVG图形或图片
+        """
+        payload = build_text_question_payload(
+            subject=subject,
+            content=question['content'],
+            options=question['options'],
+            correct_answer=question['correct_answer'],
+            explanation=question['explanation'],
+            knowledge_points=resolve_knowledge_point_ids(question, knowledge_points_map),
+            difficulty=question.get('difficulty', DEFAULT_QUESTION_CONFIG['difficulty'])
+        )['question']
+        if question.get('svg_data'):
+            payload.update(svgData=question['svg_data'], hasGeometryFigure=True)
+            if question.get('figure_properties'):
+                payload['figureProperties'] = question['figure_properties']
+        if question.get('image_data'):
+            payload.update(imageData=question['image_data'], mimeType=question.get('mime_type', 'image/png'))
+        return payload
+    
+    def _post_question_chunk(self, subject: str, body: bytes, item_count: int,
+                             shard_key: str = '') -> Tuple[Optional[List[Dict]], Optional[Dict]]:
+        """
+        发送一块题目到批量创建接口（多副本时整块路由到同一个副本）
+        
+        Returns:
+            (每道题目的服务器结果（含success、questionId/message）, None)；
+            整个请求失败时为 (None, 失败信息)，失败信息含 error、status 和 not_processed（服务器确定没有处理）
+        """
+        try:
+            response = self.transport.post(batch_create_path(subject), item_count=item_count,
+                                           shard_key=shard_key, data=body)
+            if response.status_code != 200:
+                logger.error(f"分块上传失败，状态码: {response.status_code}, 题目数: {item_count}")
+                return None, {
+                    'error': f"状态码 {response.status_code}",
+                    'status': response.status_code,
+                    'not_processed': (RetryPolicy.is_safe_to_resend(response)
+                                      or 400 <= response.status_code < 500),
+                }
+            
+            item_results = [{'success': False}] * item_count
+            for item in response.json().get('data', {}).get('results', []):
+                index = item.get('index')
+                if isinstance(index, int) and 0 <= index < item_count:
+                    item_results[index] = item
+                    if not item.get('success'):
+                        logger.warning(f"分块中第 {index + 1} 道题目创建失败: {item.get('message', '未知错误')}")
+            return item_results, None
+        except Exception as e:
+            logger.error(f"分块上传时发生异常: {str(e)}")
+            return None, {'error': str(e), 'status': None, 'not_processed': request_not_sent(e)}
+    
+    def _record_unknown_outcome(self, subject: str, payload: Dict, journal_key: Optional[str],
+                                failure: Dict) -> None:
+        """
+        记录结果未知的题目：不确认导入、取消去重占用，以 outcome='unknown' 写入失败队列
+        
+        重放前去重会先从服务器同步，已经写入的题目会被跳过
+        """
+        self._record_journal(journal_key, False, {'status': failure['status'], 'error': failure['error'],
+                                                  'outcome': 'unknown'})
+        if self.deduplicator is not None:
+            self.deduplicator.release(payload)
+        self.dead_letters.record(batch_create_path(subject), {"question": payload},
+                                 f"结果未知（{failure['error']}）", self.retry_policy.last_attempts,
+                                 failure['status'], source='EnhancedQuestionManager.bulk_upload_questions',
+                                 outcome='unknown')
+    
+    def _add_batch_question(self, subject: str, question: Dict, knowledge_points_map: Dict[str, str],
+                            verbose: bool = True) -> bool:
+        """
+        添加批量导入中的单道题目，将知识点名称转换为ID
+        """
+        return self.add_text_question(
+            subject=subject,
+            content=question['content'],
+            options=question['options'],
+            correct_answer=question['correct_answer'],
+            explanation=question['explanation'],
+            knowledge_points=resolve_knowledge_point_ids(question, knowledge_points_map),
+            difficulty=question.get('difficulty', DEFAULT_QUESTION_CONFIG['difficulty']),
+            verbose=verbose
+        )
     
     def add_text_question(self, 
                          subject: str,
@@ -237,56 +829,163 @@ class EnhancedQuestionManager:
                          correct_answer: str,
                          explanation: str,
                          knowledge_points: List[str],
-                         difficulty: str = "medium") -> bool:
+                         difficulty: str = "medium",
+                         verbose: bool = True) -> bool:
         """
         添加普通文本试题（自动格式化数学公式为KaTeX标准）
+        
+        verbose为False时不在终端输出结果，仅记录日志（用于并发上传）
         """
-        url = f"{self.base_url}/api/ai/save-question"
-        
-        # 格式化数学公式为KaTeX标准
-        formatted_content = format_math_content(content)
-        formatted_options = [format_math_content(option) for option in options]
-        formatted_explanation = format_math_content(explanation)
-        
-        # 验证KaTeX兼容性
-        content_valid, content_issues = validate_math_content(formatted_content)
-        if not content_valid:
-            logger.warning(f"题目内容KaTeX兼容性问题: {content_issues}")
-        
-        explanation_valid, explanation_issues = validate_math_content(formatted_explanation)
-        if not explanation_valid:
-            logger.warning(f"题目解释KaTeX兼容性问题: {explanation_issues}")
-        
-        question_data = {
-            "question": {
-                "content": formatted_content,
-                "subject": subject,
-                "options": formatted_options,
-                "correctAnswer": correct_answer,
-                "explanation": formatted_explanation,
-                "knowledgePoints": knowledge_points,
-                "difficulty": difficulty,
-                "type": DEFAULT_QUESTION_CONFIG['type']
-            }
-        }
+        started = time.perf_counter()
+        question_data = build_text_question_payload(
+            subject, content, options, correct_answer, explanation, knowledge_points, difficulty
+        )
+        if self.profiler is not None:
+            self.profiler.add_format_time(time.perf_counter() - started)
+        return self._post_question(question_data, verbose)
+    
+    def _post_question(self, question_data: Dict, verbose: bool = True, body: Optional[bytes] = None,
+                       prior_attempts: int = 0, path: str = SAVE_QUESTION_PATH) -> bool:
+        """
+        发送已构造好的题目请求体到 /api/ai/save-question，或作为单题请求发送到批量创建接口
+        
+        body 为已序列化的请求体（与 path 对应的格式）时直接发送，不再重复编码；
+        失败的题目连同错误信息和累计尝试次数（含 prior_attempts）写入失败队列
+        """
+        content = question_data['question']['content']
+        if self.profiler is not None:
+            body = self.profiler.measure(question_data, body)
+            if verbose:
+                print(f"🧪 演练: {content[:30]}...（{len(body)} 字节）")
+            return True
+        
+        shard_key = self.transport.shard_key(question_data['question'])
         
+        journal_key = self._journal_key(question_data)
+        if journal_key and self.import_journal.is_acknowledged(journal_key):
+            logger.info(f"题目已导入过，跳过: {content[:30]}...")
+            if verbose:
+                print(f"⏭️ 题目已导入过，跳过: {content[:30]}...")
+            return True
+        
+        if self.deduplicator is not None and not self.deduplicator.reserve(question_data['question']):
+            logger.info(f"题库中已有相同题目，跳过: {content[:30]}...")
+            if verbose:
+                print(f"⏭️ 题库中已有相同题目，跳过: {content[:30]}...")
+            return True
+        
+        success = False
         try:
-            # 禁用代理以避免503错误
-            proxies = {'http': None, 'https': None}
-            response = requests.post(url, json=question_data, headers=self.headers, timeout=self.timeout, proxies=proxies)
-            if response.status_code == 200:
+            if body is not None:
+                response = self.transport.post(path, shard_key=shard_key, data=body)
+            elif is_batch_create_path(path):
+                response = self.transport.post(path, shard_key=shard_key,
+                                               json={"action": "create", "questions": [question_data['question']]})
+            else:
+                response = self.transport.post(path, shard_key=shard_key, json=question_data)
+            saved, question_id, error_msg = self._parse_save_response(response, path)
+            if saved:
+                self._record_journal(journal_key, True, {
+                    'status': response.status_code,
+                    'questionId': question_id
+                })
                 logger.info(f"题目添加成功: {content[:30]}...")
-                print(f"✅ 题目添加成功: {content[:30]}...")
+                if verbose:
+                    print(f"✅ 题目添加成功: {content[:30]}...")
+                success = True
                 return True
             else:
-                error_msg = response.json().get('error', '未知错误')
+                self._record_journal(journal_key, False, {'status': response.status_code, 'error': error_msg})
+                self.dead_letters.record(path, question_data, error_msg,
+                                         prior_attempts + self.retry_policy.last_attempts,
+                                         response.status_code, source='EnhancedQuestionManager')
                 logger.error(f"题目添加失败: {content[:30]}..., 错误: {error_msg}")
-                print(f"❌ 题目添加失败: {error_msg}")
+                if verbose:
+                    print(f"❌ 题目添加失败: {error_msg}")
                 return False
         except Exception as e:
+            self._record_journal(journal_key, False, {'error': str(e)})
+            self.dead_letters.record(path, question_data, str(e),
+                                     prior_attempts + self.retry_policy.last_attempts,
+                                     source='EnhancedQuestionManager')
             logger.error(f"添加题目时发生异常: {content[:30]}..., 异常: {str(e)}")
-            print(f"❌ 添加题目时发生错误: {str(e)}")
+            if verbose:
+                print(f"❌ 添加题目时发生错误: {str(e)}")
             return False
+        finally:
+            if self.deduplicator is not None:
+                if success:
+                    self.deduplicator.commit(question_data['question'])
+                else:
+                    self.deduplicator.release(question_data['question'])
+    
+    @staticmethod
+    def _is_replayable(path: Optional[str]) -> bool:
+        return path == SAVE_QUESTION_PATH or is_batch_create_path(path)
+    
+    @staticmethod
+    def _parse_save_response(response, path: str) -> Tuple[bool, Optional[str], str]:
+        """
+        解析保存题目的响应
+        
+        Returns:
+            (是否保存成功, 题目ID, 失败时的错误信息)
+        """
+        if is_batch_create_path(path):
+            if response.status_code == 200:
+                results = response.json().get('data', {}).get('results') or [{}]
+                item = results[0] or {}
+                if item.get('success'):
+                    return True, item.get('questionId'), ''
+                return False, None, item.get('message', '未知错误')
+            return False, None, response.json().get('message', '未知错误')
+        if response.status_code == 200:
+            return True, response.json().get('questionId'), ''
+        return False, None, response.json().get('error', '未知错误')
+    
+    def replay_dead_letters(self, max_workers: Optional[int] = None) -> Tuple[int, int]:
+        """
+        重新提交失败队列中的题目（与批量上传使用相同的顺序/并发路径）
+        
+        再次失败的题目会带着累计尝试次数重新写入失败队列
+        
+        Args:
+            max_workers: 同时进行的上传请求数，默认读取 UPLOAD_CONFIG
+            
+        Returns:
+            (成功数量, 重新提交的题目总数)
+        """
+        entries = self.dead_letters.take_all()
+        replayable = [entry for entry in entries if self._is_replayable(entry.get('path'))]
+        for entry in entries:
+            if not self._is_replayable(entry.get('path')):
+                # 不支持重放的接口原样放回队列
+                self.dead_letters.record(entry.get('path'), entry.get('payload'), entry.get('error', ''),
+                                         entry.get('attempts', 0), entry.get('status'), entry.get('source', ''),
+                                         entry.get('outcome', 'failed'))
+        
+        if not replayable:
+            self.dead_letters.finish_replay()
+            print("✅ 失败队列为空，无需重新提交")
+            return 0, 0
+        
+        print(f"\n🔁 重新提交失败队列中的 {len(replayable)} 道题目...")
+        results = self._upload_items(
+            [entry['payload']['question'].get('content', '') for entry in replayable],
+            lambda index, verbose: self._post_question(
+                replayable[index]['payload'], verbose, prior_attempts=replayable[index].get('attempts', 0),
+                path=replayable[index]['path']
+            ),
+            max_workers
+        )
+        self.dead_letters.finish_replay()
+        
+        success_count = sum(results)
+        print(f"\n📊 重新提交完成：{success_count}/{len(replayable)} 成功")
+        if success_count < len(replayable):
+            print(f"⚠️ 仍有 {len(replayable) - success_count} 道题目失败，已重新写入 {self.dead_letters.path}")
+        logger.info(f"失败队列重放完成，成功：{success_count}/{len(replayable)}")
+        return success_count, len(replayable)
     
     def interactive_demo(self):
         """
@@ -296,17 +995,16 @@ class EnhancedQuestionManager:
         print("🎓 学习系统题目管理器 - 交互式演示")
         print("="*50)
         
-        # 检查服务器连接
-        print("\n🔍 检查服务器连接...")
-        if not self.check_server_connection():
+        # 同时检查服务器连接和认证，并预取示例科目的知识点
+        print("\n🔍 检查服务器连接和认证token...")
+        checks = self.preflight(SAMPLE_KNOWLEDGE_POINTS.keys())
+        if not checks['server']:
             print(f"❌ 无法连接到服务器: {self.base_url}")
             print("请确保服务器正在运行")
             return
         print("✅ 服务器连接正常")
         
-        # 检查认证
-        print("\n🔐 验证认证token...")
-        if not self.validate_token():
+        if not checks['token']:
             print("❌ 认证token无效或未配置")
             print("请在 config.py 中配置正确的token")
             return
@@ -455,7 +1153,7 @@ class EnhancedQuestionManager:
         批量导入模式
         """
         print("\n📦 批量导入模式")
-        print("支持从JSON文件导入题目数据")
+        print("支持从JSON或NDJSON文件导入题目数据")
         
         file_path = input("\n请输入JSON文件路径: ").strip()
         
@@ -463,40 +1161,106 @@ class EnhancedQuestionManager:
             print(f"❌ 文件不存在: {file_path}")
             return
         
+        dry_run = input("是否只演练（不上传，统计请求体大小和预计耗时）？(y/N): ").strip().lower() == 'y'
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if dry_run:
+                self.enable_dry_run()
+            success_count, total = self.import_file(file_path)
             
-            # 验证数据格式
-            if not isinstance(data, dict) or 'subject' not in data or 'questions' not in data:
-                print("❌ JSON文件格式错误，需要包含 'subject' 和 'questions' 字段")
+            if dry_run:
+                print(f"\n📊 {self.profiler.report_with_config(DRY_RUN_CONFIG)}")
                 return
-            
-            subject = data['subject']
-            questions = data['questions']
-            knowledge_points_data = data.get('knowledge_points', [])
-            
-            print(f"\n📖 导入科目: {subject}")
-            print(f"📝 知识点数量: {len(knowledge_points_data)}")
-            print(f"📋 题目数量: {len(questions)}")
-            
-            # 创建知识点
-            points_map = {}
-            if knowledge_points_data:
-                print("\n创建知识点...")
-                points_map = self.create_knowledge_point_batch(subject, knowledge_points_data)
-            
-            # 导入题目
-            print("\n导入题目...")
-            success_count = self.add_question_batch(subject, questions, points_map)
-            
             print(f"\n✨ 批量导入完成！")
-            print(f"📊 导入统计: {success_count}/{len(questions)} 道题目成功")
+            print(f"📊 导入统计: {success_count}/{total} 道题目成功")
             
         except json.JSONDecodeError:
             print("❌ JSON文件格式错误")
+        except ValueError as e:
+            print(f"❌ {str(e)}")
         except Exception as e:
             print(f"❌ 导入过程中发生错误: {str(e)}")
+        finally:
+            self.profiler = None
+    
+    def import_file(self, file_path: str, shard: Optional[Shard] = None) -> Tuple[int, int]:
+        """
+        流式导入题库文件，边读取边上传
+        
+        知识点和题目逐条读取，题目每凑满 UPLOAD_CONFIG['stream_batch_size'] 道就上传一组，
+        内存占用与文件大小无关
+        
+        Args:
+            file_path: JSON 或 NDJSON 文件路径（格式见 json_stream.py）
+            shard: 只导入属于该分片的题目（见 shard_partition.py），None表示导入全部
+            
+        Returns:
+            (成功数量, 题目总数)，分片时只统计本分片的题目
+        """
+        # 启用导入日志，中断后重新运行会跳过已导入的题目
+        self.enable_import_journal()
+        if shard is not None:
+            print(f"🧩 只导入第 {shard[0] + 1}/{shard[1]} 个分片的题目")
+        
+        group_size = UPLOAD_CONFIG['stream_batch_size']
+        subject = None
+        points_map = {}
+        pending_points = []
+        pending_questions = []
+        point_count = success_count = total = 0
+        
+        def flush_points():
+            nonlocal point_count
+            if not pending_points:
+                return
+            points_map.update(self.create_knowledge_point_batch(subject, pending_points))
+            point_count += len(pending_points)
+            pending_points.clear()
+        
+        def flush_questions():
+            nonlocal success_count, total
+            # 科目确定前读到的题目在此按分片筛选
+            pending_questions[:] = [q for q in pending_questions if in_shard(q, shard, subject)]
+            if not pending_questions:
+                return
+            # 上传前先一次性解析已读到的知识点和题目引用的知识点
+            flush_points()
+            print(f"\n导入第 {total + 1}-{total + len(pending_questions)} 道题目...")
+            points_map.update(self.complete_knowledge_points_map(subject, pending_questions, points_map))
+            if BULK_UPLOAD_CONFIG['enabled']:
+                success_count += sum(self.bulk_upload_questions(subject, pending_questions, points_map))
+            elif PIPELINE_CONFIG['enabled']:
+                success_count += self.pipeline_upload_questions(subject, pending_questions, points_map)[0]
+            else:
+                success_count += self.add_question_batch(subject, pending_questions, points_map)
+            total += len(pending_questions)
+            pending_questions.clear()
+        
+        for kind, item in iter_import_file(file_path):
+            if kind == 'field':
+                key, value = item
+                if key == 'subject' and subject is None:
+                    subject = value
+                    print(f"\n📖 导入科目: {subject}")
+            elif kind == 'knowledge_point':
+                pending_points.append(item)
+            elif subject is None or in_shard(item, shard, subject):
+                pending_questions.append(item)
+            
+            # 科目确定后才能创建知识点和上传题目
+            if subject is not None and len(pending_questions) >= group_size:
+                flush_questions()
+        
+        if subject is None:
+            raise ValueError("文件格式错误，需要包含 'subject' 和 'questions' 字段")
+        flush_points()
+        flush_questions()
+        
+        print(f"\n📝 知识点数量: {point_count}")
+        print(f"📋 题目数量: {total}")
+        logger.info(f"文件导入完成: {file_path}，成功：{success_count}/{total}")
+        logger.info(katex_cache_report())
+        return success_count, total
 
 def main():
     """
@@ -19,20 +19,36 @@ import json
 import base64
 from typing import Dict, List, Optional
 
+from upload_transport import UploadTransport
+
 class StudyQuestionManager:
-    def __init__(self, base_url: str = "http://localhost:3000", token: str = None):
+    def __init__(self, base_url: str = "http://localhost:3000", token: str = None,
+                 compress_min_size: Optional[int] = None):
         """
         初始化题目管理器
         
         Args:
             base_url: API服务器地址
             token: 认证token
+            compress_min_size: 请求体超过该字节数时gzip压缩（适合base64图片），None表示不压缩
         """
         self.base_url = base_url.rstrip('/')
         self.headers = {
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {token}' if token else None
         }
+        compression = {
+            "enabled": compress_min_size is not None,
+            "min_size": compress_min_size or 0
+        }
+        # 与其他导入脚本共用的传输层（连接池、重试、按需压缩）
+        self.transport = UploadTransport(self.base_url, self.headers, compression)
+    
+    def _post_json(self, path: str, data: Dict) -> requests.Response:
+        """
+        发送JSON请求，按需压缩请求体
+        """
+        return self.transport.post(path, json=data)
     
     def create_knowledge_point(self, name: str, subject: str, description: str = "") -> Optional[str]:
         """
@@ -46,7 +62,6 @@ class StudyQuestionManager:
         Returns:
             知识点ID，创建失败返回None
         """
-        url = f"{self.base_url}/api/knowledge-points"
         data = {
             "name": name,
             "subject": subject,
@@ -54,7 +69,7 @@ class StudyQuestionManager:
         }
         
         try:
-            response = requests.post(url, json=data, headers=self.headers)
+            response = self._post_json("/api/knowledge-points", data)
             if response.status_code == 201:
                 result = response.json()
                 print(f"✅ 知识点创建成功: {name} (ID: {result['knowledgePoint']['_id']})")
@@ -89,8 +104,6 @@ class StudyQuestionManager:
         Returns:
             是否添加成功
         """
-        url = f"{self.base_url}/api/ai/save-question"
-        
         # 将字符串数组转换为对象数组格式
         options_objects = []
         for i, option in enumerate(options):
@@ -115,7 +128,7 @@ class StudyQuestionManager:
         }
         
         try:
-            response = requests.post(url, json=question_data, headers=self.headers)
+            response = self._post_json("/api/ai/save-question", question_data)
             if response.status_code == 200:
                 result = response.json()
                 print(f"✅ 普通试题添加成功: {content[:30]}...")
@@ -183,8 +196,6 @@ class StudyQuestionManager:
         if not image_data:
             return False
         
-        url = f"{self.base_url}/api/ai/save-question"
-        
         # 将字符串数组转换为对象数组格式
         options_objects = []
         for i, option in enumerate(options):
@@ -211,7 +222,7 @@ class StudyQuestionManager:
         }
         
         try:
-            response = requests.post(url, json=question_data, headers=self.headers)
+            response = self._post_json("/api/ai/save-question", question_data)
             if response.status_code == 200:
                 result = response.json()
                 print(f"✅ 图片试题添加成功: {content[:30]}...")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用的本地题库服务器
+
+在后台线程中运行，记录收到的每个请求（方法、路径、解析后的请求体），
+按 save-question、question-bank 批量创建和知识点接口的响应格式返回结果。
+测试通过 accept 控制哪些题目写入成功，通过 batch_status 模拟写入后返回错误状态码（如504），
+通过 knowledge_points 设置服务器上已有的知识点，通过 kp_status 模拟获取/创建知识点失败。
+"""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+class FakeQuestionServer:
+    """
+    用法：
+        with FakeQuestionServer() as server:
+            manager = EnhancedQuestionManager(server.url)
+            ...
+            server.requests  # [(方法, 路径, 请求体), ...]
+    """
+
+    def __init__(self, accept: Callable[[str, Dict, int], bool] = lambda path, question, count: True,
+                 batch_status: Callable[[int], int] = lambda count: 200,
+                 knowledge_points: Optional[Dict[str, List[str]]] = None,
+                 kp_status: Callable[[str], int] = lambda name: 200):
+        """
+        Args:
+            accept: accept(接口路径, 题目, 同一请求中的题目数) 返回该题目是否写入成功
+            batch_status: batch_status(题目数) 返回批量创建请求的响应状态码（5xx在写入之后返回）
+            knowledge_points: 科目到已有知识点名称的映射，由 /api/knowledge-points/list 返回
+            kp_status: kp_status(知识点名称) 返回获取/创建单个知识点的响应状态码
+        """
+        self.accept = accept
+        self.batch_status = batch_status
+        self.knowledge_points = knowledge_points or {}
+        self.kp_status = kp_status
+        self.requests: List[Tuple[str, str, Any]] = []
+        self.created: List[Dict] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def posted(self, path_suffix: str) -> List[Any]:
+        """
+        发送到以 path_suffix 结尾的接口的请求体
+        """
+        with self._lock:
+            return [body for method, path, body in self.requests if method == 'POST' and path.endswith(path_suffix)]
+
+    def fetched(self, path_prefix: str) -> List[str]:
+        """
+        以 path_prefix 开头的 GET 请求路径（含查询参数）
+        """
+        with self._lock:
+            return [path for method, path, _ in self.requests if method == 'GET' and path.startswith(path_prefix)]
+
+    def __enter__(self) -> "FakeQuestionServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, status: int, data: Dict) -> None:
+                body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(('GET', unquote(self.path), None))
+                url = urlsplit(self.path)
+                path = unquote(url.path)
+                subject = parse_qs(url.query).get('subject', [''])[0]
+                if path == '/api/knowledge-points/list':
+                    names = server.knowledge_points.get(subject, [])
+                    return self._send(200, {'success': True, 'data': {subject: [{'name': name} for name in names]}})
+                if path.startswith('/api/knowledge-points/'):
+                    name = path[len('/api/knowledge-points/'):]
+                    status = server.kp_status(name)
+                    return self._send(status, {'success': status == 200, 'data': {'name': name, 'subject': subject}})
+                self._send(200, {'success': True, 'status': 'OK', 'data': {}})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.headers.get('Content-Encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                data = json.loads(body)
+                path = unquote(self.path)
+                with server._lock:
+                    server.requests.append(('POST', path, data))
+
+                if path.endswith('/batch'):
+                    questions = data.get('questions', [])
+                    results = [
+                        {'index': i, 'success': True, 'questionId': f'q{i}'}
+                        if server.accept(path, question, len(questions))
+                        else {'index': i, 'success': False, 'message': '写入失败'}
+                        for i, question in enumerate(questions)
+                    ]
+                    status = server.batch_status(len(questions))
+                    if status < 400 or status >= 500:
+                        # 5xx 模拟写入之后才出错（如网关超时），4xx 表示请求被拒绝、没有写入
+                        with server._lock:
+                            server.created.extend(q for q, r in zip(questions, results) if r['success'])
+                    if status != 200:
+                        return self._send(status, {'success': False, 'message': '网关超时'})
+                    created = sum(result['success'] for result in results)
+                    return self._send(200, {'success': True, 'data': {'createdCount': created, 'results': results}})
+                if path == '/api/ai/save-question':
+                    if server.accept(path, data.get('question', {}), 1):
+                        with server._lock:
+                            server.created.append(data.get('question', {}))
+                        return self._send(200, {'success': True, 'questionId': 'q1'})
+                    return self._send(400, {'success': False, 'error': '写入失败'})
+                self._send(201, {'success': True, 'knowledgePoint': {'_id': f"kp_{data.get('name', '')}"}})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -5,13 +5,18 @@
 生成20道高考难度的几何题目
 """
 
+import argparse
+import copy
 import json
-import requests
 import random
 import math
-from typing import Dict, List
+import threading
+from typing import Dict, List, Optional, Tuple
 from geometry_generator import GeometryGenerator
 from enhanced_example import EnhancedQuestionManager
+from config import PIPELINE_CONFIG, DRY_RUN_CONFIG
+from pipeline import Pipeline, Stage, default_process_workers
+from shard_partition import Shard, shard_of_key
 
 class AdvancedGeometryGenerator:
     """高考级别几何题生成器"""
@@ -20,13 +25,15 @@ class AdvancedGeometryGenerator:
         self.base_url = base_url
         self.question_manager = EnhancedQuestionManager()
         self.generator = GeometryGenerator()
+        # 题目生成使用独立的随机数生成器，不受其他线程（如上传重试的抖动）影响
+        self.rng = random.Random()
     
     def generate_advanced_triangle_questions(self, count: int = 8) -> List[Dict]:
         """生成高级三角形题目"""
         questions = []
         
         for i in range(count):
-            question_type = random.choice([
+            question_type = self.rng.choice([
                 'triangle_similarity',
                 'triangle_congruence', 
                 'triangle_median_altitude',
@@ -53,7 +60,7 @@ class AdvancedGeometryGenerator:
         """生成三角形相似题目"""
         # 生成两个相似三角形
         a1, b1, c1 = 6, 8, 10  # 第一个三角形
-        scale = random.uniform(1.5, 2.5)  # 相似比
+        scale = self.rng.uniform(1.5, 2.5)  # 相似比
         a2, b2, c2 = a1 * scale, b1 * scale, c1 * scale
         
         # 生成SVG图形
@@ -290,7 +297,7 @@ class AdvancedGeometryGenerator:
         questions = []
         
         for i in range(count):
-            question_type = random.choice([
+            question_type = self.rng.choice([
                 'parallelogram_properties',
                 'rhombus_diagonal',
                 'trapezoid_median',
@@ -312,9 +319,9 @@ class AdvancedGeometryGenerator:
     
     def _generate_parallelogram_question(self) -> Dict:
         """生成平行四边形题目"""
-        a = random.randint(8, 12)  # 底边
-        h = random.randint(6, 10)  # 高
-        angle = random.randint(60, 120)  # 内角
+        a = self.rng.randint(8, 12)  # 底边
+        h = self.rng.randint(6, 10)  # 高
+        angle = self.rng.randint(60, 120)  # 内角
         
         # 计算邻边长度
         b = h / math.sin(math.radians(angle))
@@ -365,9 +372,9 @@ class AdvancedGeometryGenerator:
     
     def _generate_rhombus_question(self) -> Dict:
         """生成菱形题目"""
-        side = random.randint(8, 12)
-        d1 = random.randint(12, 16)  # 对角线1
-        d2 = random.randint(10, 14)  # 对角线2
+        side = self.rng.randint(8, 12)
+        d1 = self.rng.randint(12, 16)  # 对角线1
+        d2 = self.rng.randint(10, 14)  # 对角线2
         
         svg_content = self.generator._create_svg_header()
         
@@ -411,9 +418,9 @@ class AdvancedGeometryGenerator:
     
     def _generate_trapezoid_question(self) -> Dict:
         """生成梯形题目"""
-        a = random.randint(12, 16)  # 上底
-        b = random.randint(18, 24)  # 下底
-        h = random.randint(8, 12)   # 高
+        a = self.rng.randint(12, 16)  # 上底
+        b = self.rng.randint(18, 24)  # 下底
+        h = self.rng.randint(8, 12)   # 高
         
         svg_content = self.generator._create_svg_header()
         
@@ -463,8 +470,8 @@ class AdvancedGeometryGenerator:
     
     def _generate_rectangle_diagonal_question(self) -> Dict:
         """生成矩形对角线题目"""
-        length = random.randint(12, 16)
-        width = random.randint(8, 12)
+        length = self.rng.randint(12, 16)
+        width = self.rng.randint(8, 12)
         
         svg_content = self.generator._create_svg_header()
         
@@ -511,7 +518,7 @@ class AdvancedGeometryGenerator:
         questions = []
         
         for i in range(count):
-            question_type = random.choice([
+            question_type = self.rng.choice([
                 'circle_tangent',
                 'circle_chord',
                 'circle_sector',
@@ -533,8 +540,8 @@ class AdvancedGeometryGenerator:
     
     def _generate_tangent_question(self) -> Dict:
         """生成圆的切线题目"""
-        r = random.randint(5, 8)  # 圆半径
-        d = random.randint(10, 15)  # 外点到圆心距离
+        r = self.rng.randint(5, 8)  # 圆半径
+        d = self.rng.randint(10, 15)  # 外点到圆心距离
         
         # 计算切线长
         tangent_length = math.sqrt(d*d - r*r)
@@ -589,8 +596,8 @@ class AdvancedGeometryGenerator:
     
     def _generate_chord_question(self) -> Dict:
         """生成圆的弦长题目"""
-        r = random.randint(8, 12)  # 圆半径
-        d = random.randint(4, 7)   # 弦心距
+        r = self.rng.randint(8, 12)  # 圆半径
+        d = self.rng.randint(4, 7)   # 弦心距
         
         # 计算弦长
         chord_length = 2 * math.sqrt(r*r - d*d)
@@ -639,8 +646,8 @@ class AdvancedGeometryGenerator:
     
     def _generate_sector_question(self) -> Dict:
         """生成扇形题目"""
-        r = random.randint(8, 12)  # 半径
-        angle = random.randint(60, 120)  # 圆心角（度）
+        r = self.rng.randint(8, 12)  # 半径
+        angle = self.rng.randint(60, 120)  # 圆心角（度）
         
         # 计算扇形面积和弧长
         area = (angle / 360) * math.pi * r * r
@@ -691,7 +698,7 @@ class AdvancedGeometryGenerator:
     
     def _generate_inscribed_triangle_question(self) -> Dict:
         """生成圆内接三角形题目"""
-        r = random.randint(8, 12)  # 外接圆半径
+        r = self.rng.randint(8, 12)  # 外接圆半径
         
         # 等边三角形内接于圆
         side = r * math.sqrt(3)
@@ -735,78 +742,168 @@ class AdvancedGeometryGenerator:
             'grade': '高二'
         }
     
-    def add_questions_to_database(self):
-        """将生成的题目添加到数据库"""
-        print("开始生成20道高考级别几何题目...")
-        
-        # 生成各类题目
-        triangle_questions = self.generate_advanced_triangle_questions(8)
-        quad_questions = self.generate_advanced_quadrilateral_questions(6)
-        circle_questions = self.generate_advanced_circle_questions(6)
-        
-        all_questions = triangle_questions + quad_questions + circle_questions
-        
-        print(f"共生成 {len(all_questions)} 道高考级别几何题目")
-        print(f"- 高级三角形题目: {len(triangle_questions)} 道")
-        print(f"- 高级四边形题目: {len(quad_questions)} 道")
-        print(f"- 高级圆形题目: {len(circle_questions)} 道")
-        
-        # 添加到数据库
-        success_count = 0
-        for i, question in enumerate(all_questions, 1):
-            try:
-                print(f"\n正在添加第 {i} 道题目...")
-                print(f"题目类型: {question.get('knowledgePoints', ['未知'])[0]}")
-                print(f"题目内容: {question['content'][:50]}...")
-                
-                url = "http://localhost:5001/api/ai/save-question"
-                question_data = {
-                    "question": {
-                        "content": question["content"],
-                        "subject": question["subject"],
-                        "type": question["type"],
-                        "difficulty": question["difficulty"],
-                        "correctAnswer": question["correctAnswer"],
-                        "explanation": question["explanation"],
-                        "knowledgePoints": question["knowledgePoints"],
-                        "svgData": question["svgData"],
-                        "figureProperties": question["figureProperties"],
-                        "hasGeometryFigure": True,
-                        "grade": question.get("grade", "高二")
-                    }
+    def add_questions_to_database(self, seed: Optional[int] = None, dry_run: bool = False,
+                                  triangle_count: int = 8, quad_count: int = 6, circle_count: int = 6,
+                                  shard: Optional[Shard] = None) -> Tuple[int, int]:
+        """
+        将生成的题目添加到数据库
+        
+        生成（含SVG绘制）→ 序列化 → 上传 三个阶段通过流水线同时进行，生成阶段在进程池中执行，
+        上传通过 EnhancedQuestionManager 的上传路径（连接池、认证、重试、压缩、去重、失败队列）。
+        每道题目使用由 seed 派生的独立种子生成，结果与进程调度无关；
+        已成功保存的题目记录在导入日志中，中断后使用相同的随机种子重新运行可续传；
+        dry_run 为True时不联网，上传阶段只统计请求体大小和预计上传耗时；
+        指定 shard 时按（类别, 种子）的哈希只生成和上传属于该分片的题目，
+        多个进程使用相同的随机种子和不同的分片即可分担生成和上传
+        
+        Returns:
+            (成功数量, 题目总数)
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        print(f"开始生成{triangle_count + quad_count + circle_count}道高考级别几何题目...（随机种子: {seed}）")
+        
+        manager = self.question_manager
+        if dry_run:
+            manager.enable_dry_run()
+        else:
+            manager.enable_import_journal()
+        retries_before = manager.retry_policy.retries
+        serialized_before = manager.transport.snapshot()
+        
+        # 各类题目数量
+        categories = [('triangle', '高级三角形题目', triangle_count),
+                      ('quadrilateral', '高级四边形题目', quad_count),
+                      ('circle', '高级圆形题目', circle_count)]
+        rng = random.Random(seed)
+        tasks = [(category, rng.randrange(2**32)) for category, _, count in categories for _ in range(count)]
+        
+        print(f"共生成 {len(tasks)} 道高考级别几何题目")
+        for _, label, count in categories:
+            print(f"- {label}: {count} 道")
+        if shard is not None:
+            # 每道题目由（类别, 种子）完全确定，按其哈希分片即可在生成前划分
+            tasks = [task for task in tasks if shard_of_key(f"{task[0]}:{task[1]}", shard[1]) == shard[0]]
+            print(f"🧩 第 {shard[0] + 1}/{shard[1]} 个分片: {len(tasks)} 道")
+        total = len(tasks)
+        
+        def serialize(question: Dict) -> Tuple[Dict, Optional[bytes]]:
+            question_data = {
+                "question": {
+                    "content": question["content"],
+                    "subject": question["subject"],
+                    "type": question["type"],
+                    "difficulty": question["difficulty"],
+                    "correctAnswer": question["correctAnswer"],
+                    "explanation": question["explanation"],
+                    "knowledgePoints": question["knowledgePoints"],
+                    "svgData": question["svgData"],
+                    "figureProperties": question["figureProperties"],
+                    "hasGeometryFigure": True,
+                    "grade": question.get("grade", "高二")
                 }
-                
-                response = requests.post(url, json=question_data, timeout=10)
-                if response.status_code == 200:
-                    success_count += 1
-                    print(f"✓ 题目添加成功")
-                else:
-                    print(f"✗ 题目添加失败 - 状态码: {response.status_code}")
-                    
-            except Exception as e:
-                print(f"✗ 添加题目时出错: {str(e)}")
+            }
+            # 演练模式下由统计器序列化并计时
+            if dry_run:
+                return question_data, None
+            return question_data, manager.codec.dumps(question_data)
+        
+        print_lock = threading.Lock()
+        
+        def upload(item: Tuple[Dict, Optional[bytes]]) -> bool:
+            question_data, body = item
+            question = question_data["question"]
+            success = manager.save_question(question_data, verbose=False, body=body)
+            
+            # 每道题目的输出一次性打印，避免多线程输出交错
+            with print_lock:
+                print(f"\n题目类型: {question['knowledgePoints'][0] if question['knowledgePoints'] else '未知'}")
+                print(f"题目内容: {question['content'][:50]}...")
+                print("✓ 题目添加成功" if success else "✗ 题目添加失败（详见日志）")
+            return success
+        
+        use_processes = PIPELINE_CONFIG['use_processes']
+        pipeline = Pipeline([
+            # 每道题目使用独立的随机数生成器，线程模式下也可多线程生成
+            Stage("生成", generate_question_task,
+                  workers=PIPELINE_CONFIG['cpu_workers'] or default_process_workers(),
+                  use_process=use_processes),
+            Stage("序列化", serialize, workers=PIPELINE_CONFIG['serialize_workers']),
+            Stage("上传", upload, workers=PIPELINE_CONFIG['upload_workers']),
+        ], queue_size=PIPELINE_CONFIG['queue_size'])
+        
+        success_count = sum(pipeline.run(tasks))
+        
+        if dry_run:
+            print(f"\n📊 {manager.profiler.report_with_config(DRY_RUN_CONFIG)}")
+            print(pipeline.report())
+            return success_count, total
+        if not total:
+            return 0, 0
         
         print(f"\n高考级别几何题目添加完成！")
         print(f"成功添加: {success_count} 道")
-        print(f"失败: {len(all_questions) - success_count} 道")
-        print(f"成功率: {success_count/len(all_questions)*100:.1f}%")
+        print(f"失败: {total - success_count} 道")
+        print(f"成功率: {success_count/total*100:.1f}%")
+        print(f"重试次数: {manager.retry_policy.retries - retries_before}")
+        manager.transport.report(serialized_before)
+        if success_count < total:
+            print(f"失败的题目已写入 {manager.dead_letters.path}，可运行 replay_dead_letters.py 重新提交")
+        print(pipeline.report())
+        return success_count, total
+
+# 工作进程内的题目生成器（每个进程创建一次）
+_worker_generator = None
+_worker_generator_lock = threading.Lock()
+
+# 题目类别对应的批量生成方法
+CATEGORY_GENERATORS = {
+    'triangle': 'generate_advanced_triangle_questions',
+    'quadrilateral': 'generate_advanced_quadrilateral_questions',
+    'circle': 'generate_advanced_circle_questions',
+}
+
+def generate_question_task(task: Tuple[str, int]) -> Dict:
+    """
+    流水线生成阶段：按类别和种子生成一道题目（含SVG）
+    
+    定义为模块级函数，以便在进程池中执行；
+    每个任务使用由种子创建的独立随机数生成器，不修改全局随机状态，线程间互不干扰
+    """
+    global _worker_generator
+    category, seed = task
+    with _worker_generator_lock:
+        if _worker_generator is None:
+            _worker_generator = AdvancedGeometryGenerator()
+    generator = copy.copy(_worker_generator)
+    generator.rng = random.Random(seed)
+    return getattr(generator, CATEGORY_GENERATORS[category])(1)[0]
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="高考级别几何题生成器")
+    parser.add_argument('--dry-run', action='store_true', help="只生成和序列化题目并统计请求体，不连接服务器")
+    parser.add_argument('--seed', type=int, default=None, help="随机种子，中断后使用相同种子重新运行可续传")
+    args = parser.parse_args()
+    
     print("=== 高考级别几何题生成器 ===")
     
     try:
         generator = AdvancedGeometryGenerator()
         
         # 检查服务器连接
-        if not generator.question_manager.check_server_connection():
-            print("❌ 无法连接到服务器，请确保后端服务正在运行")
-            return
-        
-        print("✓ 服务器连接正常")
+        if not args.dry_run:
+            checks = generator.question_manager.preflight(['数学'])
+            if not checks['server']:
+                print("❌ 无法连接到服务器，请确保后端服务正在运行")
+                return
+            if not checks['token']:
+                print("❌ Token验证失败，请检查配置")
+                return
+            print("✓ 服务器连接正常")
         
         # 生成并添加题目
-        generator.add_questions_to_database()
+        generator.add_questions_to_database(seed=args.seed, dry_run=args.dry_run)
         
     except Exception as e:
         print(f"❌ 程序执行出错: {str(e)}")
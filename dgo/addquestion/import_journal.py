@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+导入日志（断点续传）
+
+以追加方式记录每道题目请求体的内容哈希和服务器返回结果（NDJSON，每行一条）。
+导入中断后重新运行时，已被服务器确认的题目通过哈希在O(1)时间内跳过，
+不会重复创建。
+多个分片进程可以共用同一个日志文件，写入时持有跨进程文件锁。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from local_store import file_lock
+
+logger = logging.getLogger(__name__)
+
+
+class ImportJournal:
+    """
+    追加写入的导入日志
+
+    同一哈希出现多次时以最后一条为准；成功记录不会被之后的失败覆盖。
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 日志文件路径，不存在时自动创建
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._acknowledged = set()
+        # 文件末尾是否为完整的行（进程中断时最后一行可能没有换行符）
+        self._terminated = True
+        self._load()
+
+    @staticmethod
+    def content_hash(payload: Dict, scope: str = "") -> str:
+        """
+        计算请求体的内容哈希
+
+        Args:
+            payload: 请求体
+            scope: 附加到哈希中的范围（如服务器地址），不同范围互不影响
+        """
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(f"{scope}\n{canonical}".encode('utf-8')).hexdigest()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        with file_lock(self.path, shared=True), open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                self._terminated = line.endswith('\n')
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程中断时最后一行可能只写了一半
+                    logger.warning(f"导入日志第 {line_number} 行损坏，已忽略")
+                    continue
+                if entry.get('ok'):
+                    self._acknowledged.add(entry['hash'])
+
+        logger.info(f"已加载导入日志: {self.path}，已确认 {len(self._acknowledged)} 道题目")
+
+    def is_acknowledged(self, key: str) -> bool:
+        """
+        题目是否已被服务器确认
+        """
+        return key in self._acknowledged
+
+    def record(self, key: str, success: bool, result: Optional[Dict] = None) -> None:
+        """
+        追加一条记录
+
+        Args:
+            key: 内容哈希
+            success: 服务器是否确认保存成功
+            result: 服务器返回的结果（状态码、题目ID或错误信息）
+        """
+        line = json.dumps({
+            'hash': key,
+            'ok': success,
+            'result': result or {},
+            'ts': time.time()
+        }, ensure_ascii=False)
+
+        with self._lock, file_lock(self.path):
+            with open(self.path, 'a', encoding='utf-8') as f:
+                # 先结束写了一半的行，新记录不会与其拼在一起
+                f.write(line + '\n' if self._terminated else '\n' + line + '\n')
+            self._terminated = True
+            if success:
+                self._acknowledged.add(key)
+
+    @property
+    def acknowledged_count(self) -> int:
+        """已确认的题目数量"""
+        return len(self._acknowledged)
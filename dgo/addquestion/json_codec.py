@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+请求体JSON编码
+
+把请求体编码为紧凑的UTF-8字节：中文字符保持3字节UTF-8，不转义为6字节的 \\uXXXX，
+也不输出多余空格。安装了 orjson 时自动使用更快的 orjson 后端，否则使用标准库 json。
+
+两个后端输出等价的JSON（解析结果相同），但字节不一定相同：
+浮点数的表示、非字符串键的处理（orjson拒绝非字符串键）等方面存在差异。
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # orjson是可选依赖
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class JSONCodec:
+    """
+    JSON编解码器
+
+    dumps 返回UTF-8字节，loads 接受字节或字符串
+    """
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[Union[bytes, str]], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+BACKENDS: Dict[str, JSONCodec] = {
+    'json': JSONCodec('json', _json_dumps, json.loads),
+}
+if orjson is not None:
+    # orjson默认即输出紧凑的UTF-8
+    BACKENDS['orjson'] = JSONCodec('orjson', orjson.dumps, orjson.loads)
+
+
+def get_codec(backend: str = 'auto') -> JSONCodec:
+    """
+    获取JSON编解码器
+
+    Args:
+        backend: 'auto'（有orjson时使用orjson）、'orjson' 或 'json'；
+                 指定的后端未安装时退回标准库json
+    """
+    if backend == 'auto':
+        backend = 'orjson' if 'orjson' in BACKENDS else 'json'
+    if backend not in BACKENDS:
+        logger.warning(f"JSON后端 {backend} 不可用，使用标准库json")
+        backend = 'json'
+    return BACKENDS[backend]
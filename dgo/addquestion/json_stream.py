@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题库文件流式读取
+
+逐条读取导入文件中的知识点和题目，不把整个文件加载进内存，
+读到第一道题目即可开始上传。支持两种格式：
+
+1. JSON：{"subject": ..., "knowledge_points": [...], "questions": [...]}
+2. NDJSON（.ndjson / .jsonl）：每行一个对象。含 content 的是题目，
+   含 name 的是知识点，其余对象的字段（如 subject）作为文件级字段。
+"""
+
+import json
+import os
+from typing import Any, IO, Iterator, Optional, Tuple
+
+# 流式读取的数组字段及其元素类型
+STREAMED_ARRAYS = {
+    'knowledge_points': 'knowledge_point',
+    'questions': 'question',
+}
+
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+_WHITESPACE = ' \t\r\n'
+
+
+class _StreamReader:
+    """
+    基于 JSONDecoder.raw_decode 的增量读取器
+
+    缓冲区中只保留尚未解析的内容；单个值跨越缓冲区时按倍数扩大读取量，
+    避免大元素（如base64图片）被反复解析。
+    """
+
+    def __init__(self, f: IO[str], chunk_size: int = 64 * 1024):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int) -> None:
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+
+    def peek(self) -> str:
+        """
+        跳过空白后返回下一个字符，文件结束时返回空字符串
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._fill(self.chunk_size)
+
+    def expect(self, char: str) -> None:
+        actual = self.peek()
+        if actual != char:
+            raise json.JSONDecodeError(f"期望 '{char}'，实际为 '{actual or 'EOF'}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """
+        解析下一个完整的JSON值
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # 值恰好在缓冲区末尾结束时可能被截断（如数字），需读取更多内容确认
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+
+def _elements(reader: _StreamReader, closing: str) -> Iterator[None]:
+    """
+    遍历数组或对象的元素，每次产出时读取器位于下一个元素的开头
+
+    元素之间必须有 ','，最后一个元素之后必须是 closing（']' 或 '}'），
+    缺少逗号、多余的逗号或文件被截断时抛出 JSONDecodeError
+    """
+    if reader.peek() != closing:
+        while True:
+            yield
+            if reader.peek() == closing:
+                break
+            reader.expect(',')
+    reader.expect(closing)
+
+
+def _iter_json(f: IO[str]) -> Iterator[Tuple[str, Any]]:
+    reader = _StreamReader(f)
+    reader.expect('{')
+
+    for _ in _elements(reader, '}'):
+        key = reader.decode_value()
+        reader.expect(':')
+
+        if key in STREAMED_ARRAYS and reader.peek() == '[':
+            reader.expect('[')
+            for _ in _elements(reader, ']'):
+                yield STREAMED_ARRAYS[key], reader.decode_value()
+        else:
+            yield 'field', (key, reader.decode_value())
+
+
+def _iter_ndjson(f: IO[str]) -> Iterator[Tuple[str, Any]]:
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(f"第 {line_number} 行格式错误: {e.msg}", e.doc, e.pos)
+
+        if 'content' in record:
+            yield 'question', record
+        elif 'name' in record:
+            yield 'knowledge_point', record
+        else:
+            for key, value in record.items():
+                yield 'field', (key, value)
+
+
+def iter_import_file(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    按文件中的顺序逐条读取导入文件
+
+    Args:
+        path: JSON 或 NDJSON 文件路径
+
+    Yields:
+        (类型, 内容)：类型为 'knowledge_point'、'question' 或 'field'，
+        'field' 的内容为 (字段名, 值)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if is_ndjson_file(path):
+            yield from _iter_ndjson(f)
+        else:
+            yield from _iter_json(f)
+
+
+def read_subject(path: str) -> Optional[str]:
+    """
+    读取导入文件的科目（subject 字段），读到第一道题目仍未出现时返回None
+    """
+    for kind, item in iter_import_file(path):
+        if kind == 'field' and item[0] == 'subject':
+            return item[1]
+        if kind == 'question':
+            return None
+    return None
+
+
+def is_ndjson_file(path: str) -> bool:
+    """
+    是否按NDJSON格式读取
+    """
+    return os.path.splitext(path)[1].lower() in NDJSON_EXTENSIONS
@@ -4,207 +4,304 @@
 KaTeX公式格式化工具
 
 本模块用于将数学公式转换为严格符合KaTeX标准的格式
+
+公式先由 latex_lexer 切分为记号（命令、花括号分组、上下标、文本），
+再在记号序列上一次遍历完成全部转换，耗时与公式长度成线性关系。
+转换只作用于相应的记号：命令名中的字母不会被当作 a/b 或三角函数名，
+已有的 \\sin 等命令保持不变，\\text{...} 中的文字原样保留。
 """
 
 import re
 from typing import Dict, List, Tuple
 
+from config import KATEX_CACHE_CONFIG
+from latex_lexer import Token, match_groups, tokenize
+from lru_memo import LRUMemo
+
+# 普通文本中的函数名会被转换为LaTeX命令
+MATH_FUNCTIONS = frozenset(('sin', 'cos', 'tan', 'cot', 'sec', 'csc',
+                            'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh',
+                            'log', 'ln'))
+
+# 花括号的最大嵌套层数
+MAX_GROUP_DEPTH = 100
+
+# 参数为文字的命令，参数原样保留
+_TEXT_COMMANDS = frozenset(('text', 'textbf', 'textit', 'textrm', 'mbox'))
+
+# 上下标参数：开头的一个数（可含小数）或一串字母
+_SCRIPT_HEAD = re.compile(r'[0-9]+(?:\.[0-9]+)?|[a-zA-Z]+')
+
+# 文本中的公式：$$...$$、$...$、\(...\)、\[...\]，一次扫描全部找出
+_FORMULA_PATTERN = re.compile(r'\$\$(.+?)\$\$|\$([^$]+)\$|\\\((.+?)\\\)|\\\[(.+?)\\\]', re.S)
+_FORMULA_DELIMITERS = {1: ('$$', '$$'), 2: ('$', '$'), 3: ('\\(', '\\)'), 4: ('\\[', '\\]')}
+
 class KaTeXFormatter:
     """
     KaTeX公式格式化器
-    
+
     将LaTeX数学公式转换为严格符合KaTeX标准的格式
     """
-    
+
     def __init__(self):
-        # KaTeX不支持的命令映射到支持的命令
+        # KaTeX不支持的命令映射到支持的命令（命令名不含反斜杠，映射为空表示删除）
         self.unsupported_commands = {
             # 分数相关
-            r'\\dfrac': r'\\frac',
-            r'\\tfrac': r'\\frac',
-            
+            'dfrac': 'frac',
+            'tfrac': 'frac',
+
             # 根号相关
-            r'\\surd': r'\\sqrt',
-            
+            'surd': 'sqrt',
+
             # 字体相关
-            r'\\mathbb': r'\\mathbf',  # KaTeX支持有限的mathbb
-            r'\\mathfrak': r'\\mathbf',
-            r'\\mathscr': r'\\mathcal',
-            
+            'mathbb': 'mathbf',  # KaTeX支持有限的mathbb
+            'mathfrak': 'mathbf',
+            'mathscr': 'mathcal',
+
             # 空格相关
-            r'\\,': r'\\:',  # 细空格
-            r'\\;': r'\\quad',  # 中等空格
-            r'\\!': '',  # 负空格，KaTeX中移除
-            
+            ',': ':',  # 细空格
+            ';': 'quad',  # 中等空格
+            '!': '',  # 负空格，KaTeX中移除
+
             # 其他不支持的命令
-            r'\\displaystyle': '',
-            r'\\textstyle': '',
-            r'\\scriptstyle': '',
-            r'\\scriptscriptstyle': '',
+            'displaystyle': '',
+            'textstyle': '',
+            'scriptstyle': '',
+            'scriptscriptstyle': '',
         }
-        
+
         # 需要特殊处理的环境
         self.environment_replacements = {
-            r'\\begin\{align\}': r'\\begin{aligned}',
-            r'\\end\{align\}': r'\\end{aligned}',
-            r'\\begin\{eqnarray\}': r'\\begin{aligned}',
-            r'\\end\{eqnarray\}': r'\\end{aligned}',
+            'align': 'aligned',
+            'eqnarray': 'aligned',
         }
-        
-        # 函数名标准化
+
+        # 函数名标准化（参数原样保留）
         self.function_names = {
-            r'\\operatorname\{([^}]+)\}': r'\\text{\\1}',
-            r'\\mathrm\{([^}]+)\}': r'\\text{\\1}',
+            'operatorname': 'text',
+            'mathrm': 'text',
         }
-    
+
+        # 括号命令
+        self.bracket_replacements = {
+            'lbrace': '\\{',
+            'rbrace': '\\}',
+            'lbrack': '[',
+            'rbrack': ']',
+        }
+
     def format_latex_formula(self, text: str) -> str:
         """
         格式化LaTeX公式为KaTeX兼容格式
-        
+
         Args:
             text: 包含LaTeX公式的文本
-            
+
         Returns:
             格式化后的文本
         """
         if not text:
             return text
-            
-        # 处理行内公式 $...$
-        text = re.sub(r'\$([^$]+)\$', lambda m: f'${self._format_single_formula(m.group(1))}$', text)
-        
-        # 处理行间公式 $$...$$
-        text = re.sub(r'\$\$([^$]+)\$\$', lambda m: f'$${self._format_single_formula(m.group(1))}$$', text)
-        
-        # 处理\(...\)格式
-        text = re.sub(r'\\\(([^)]+)\\\)', lambda m: f'\\({self._format_single_formula(m.group(1))}\\)', text)
-        
-        # 处理\[...\]格式
-        text = re.sub(r'\\\[([^\]]+)\\\]', lambda m: f'\\[{self._format_single_formula(m.group(1))}\\]', text)
-        
-        return text
-    
+
+        def replace(match):
+            opening, closing = _FORMULA_DELIMITERS[match.lastindex]
+            return f'{opening}{self._format_single_formula(match.group(match.lastindex))}{closing}'
+
+        return _FORMULA_PATTERN.sub(replace, text)
+
     def _format_single_formula(self, formula: str) -> str:
         """
         格式化单个公式
-        
+
         Args:
             formula: LaTeX公式字符串
-            
+
         Returns:
             KaTeX兼容的公式字符串
         """
-        # 移除多余的空格
-        formula = re.sub(r'\s+', ' ', formula.strip())
-        
-        # 替换不支持的命令
-        for old_cmd, new_cmd in self.unsupported_commands.items():
-            formula = re.sub(old_cmd, new_cmd, formula)
-        
-        # 替换环境
-        for old_env, new_env in self.environment_replacements.items():
-            formula = re.sub(old_env, new_env, formula)
-        
-        # 处理函数名
-        for pattern, replacement in self.function_names.items():
-            formula = re.sub(pattern, replacement, formula)
-        
-        # 标准化分数格式
-        formula = self._standardize_fractions(formula)
-        
-        # 标准化上下标
-        formula = self._standardize_scripts(formula)
-        
-        # 标准化括号
-        formula = self._standardize_brackets(formula)
-        
-        # 标准化三角函数
-        formula = self._standardize_trig_functions(formula)
-        
-        # 标准化对数函数
-        formula = self._standardize_log_functions(formula)
-        
-        return formula
-    
-    def _standardize_fractions(self, formula: str) -> str:
+        formula = formula.strip()
+        tokens = self._restore_functions(tokenize(formula))
+        groups, depth = match_groups(tokens)
+        if depth > MAX_GROUP_DEPTH:
+            # 逐层递归转换，嵌套过深的公式原样保留
+            return formula
+
+        output: List[str] = []
+        self._render(tokens, 0, len(tokens), groups, output)
+        return ''.join(output)
+
+    @staticmethod
+    def _restore_functions(tokens: List[Token]) -> List[Token]:
         """
-        标准化分数格式
+        还原旧版本把 \\sin 替换成的 \\\\sin
+
+        环境（aligned、cases、array等）中的 \\\\ 是换行，\\\\sin 表示下一行以 sin 开头，保持不变
         """
-        # 确保\frac后面有正确的大括号
-        formula = re.sub(r'\\frac\s*([^{])([^{])', r'\\frac{\1}{\2}', formula)
-        
-        # 处理简单的a/b格式转换为\frac{a}{b}
-        # 但要小心不要转换已经在\frac中的内容
-        def replace_simple_fraction(match):
-            numerator = match.group(1)
-            denominator = match.group(2)
-            # 检查是否已经在数学环境中
-            if '\\' in numerator or '\\' in denominator:
-                return match.group(0)
-            return f'\\frac{{{numerator}}}{{{denominator}}}'
-        
-        # 匹配简单的数字/数字或变量/变量格式
-        formula = re.sub(r'([a-zA-Z0-9]+)/([a-zA-Z0-9]+)', replace_simple_fraction, formula)
-        
-        return formula
-    
-    def _standardize_scripts(self, formula: str) -> str:
+        if ('command', '\\begin') in tokens:
+            return tokens
+        restored: List[Token] = []
+        for kind, value in tokens:
+            if (kind == 'text' and value in MATH_FUNCTIONS and restored
+                    and restored[-1] == ('command', '\\\\')):
+                restored[-1] = ('command', f'\\{value}')
+            else:
+                restored.append((kind, value))
+        return restored
+
+    def _render(self, tokens: List[Token], start: int, end: int, groups: List[int], output: List[str]) -> None:
         """
-        标准化上下标格式
+        转换 tokens[start:end]，结果追加到 output
         """
-        # 确保上下标有正确的大括号（当内容超过一个字符时）
-        # 上标
-        formula = re.sub(r'\^([a-zA-Z0-9]{2,})', r'^{\1}', formula)
-        # 下标
-        formula = re.sub(r'_([a-zA-Z0-9]{2,})', r'_{\1}', formula)
-        
-        return formula
-    
-    def _standardize_brackets(self, formula: str) -> str:
+        index = start
+        previous = None  # 上一个记号的类型，紧跟命令或上下标的文本不作为 a/b 的分子
+        while index < end:
+            kind, value = tokens[index]
+
+            if kind == 'text':
+                index, previous = self._render_text(tokens, index, end, previous, output)
+                continue
+
+            if kind == 'command':
+                index = self._render_command(tokens, index, end, groups, output)
+            elif kind == 'script':
+                output.append(value)
+                index = self._render_script(tokens, index + 1, end, output)
+            elif kind == 'open' and groups[index] >= 0:
+                index = self._render_group(tokens, index, groups, output)
+            else:
+                output.append(' ' if kind == 'space' else value)
+                index += 1
+            previous = kind
+
+    def _render_group(self, tokens: List[Token], index: int, groups: List[int], output: List[str]) -> int:
         """
-        标准化括号格式
+        转换花括号分组，返回分组之后的位置
         """
-        # 替换不支持的括号命令
-        replacements = {
-            r'\\langle': r'\\langle',  # KaTeX支持
-            r'\\rangle': r'\\rangle',  # KaTeX支持
-            r'\\lbrace': r'\\{',
-            r'\\rbrace': r'\\}',
-            r'\\lbrack': r'[',
-            r'\\rbrack': r']',
-        }
-        
-        for old, new in replacements.items():
-            formula = re.sub(old, new, formula)
-        
-        return formula
-    
-    def _standardize_trig_functions(self, formula: str) -> str:
+        close = groups[index]
+        output.append('{')
+        self._render(tokens, index + 1, close, groups, output)
+        output.append('}')
+        return close + 1
+
+    def _render_text(self, tokens: List[Token], index: int, end: int, previous, output: List[str]):
         """
-        标准化三角函数
+        转换文本记号：a/b 转换为 \\frac{a}{b}，函数名转换为命令
+
+        Returns:
+            (下一个位置, 记号类型)
         """
-        # 确保三角函数使用正确的格式
-        trig_functions = ['sin', 'cos', 'tan', 'cot', 'sec', 'csc', 
-                         'arcsin', 'arccos', 'arctan', 'sinh', 'cosh', 'tanh']
-        
-        for func in trig_functions:
-            # 将普通文本的三角函数转换为LaTeX格式
-            formula = re.sub(f'\\b{func}\\b', f'\\\\{func}', formula)
-        
-        return formula
-    
-    def _standardize_log_functions(self, formula: str) -> str:
+        value = tokens[index][1]
+        if (previous not in ('command', 'script') and index + 2 < end
+                and tokens[index + 1] == ('other', '/') and tokens[index + 2][0] == 'text'
+                and (index + 3 >= end or tokens[index + 3][0] != 'script')):
+            output.append(f'\\frac{{{self._function(value)}}}{{{self._function(tokens[index + 2][1])}}}')
+            return index + 3, 'fraction'
+
+        output.append(self._function(value))
+        return index + 1, 'text'
+
+    def _render_script(self, tokens: List[Token], index: int, end: int, output: List[str]) -> int:
         """
-        标准化对数函数
+        转换上下标参数：多位数字或多个字母加花括号（x^10 → x^{10}）
         """
-        # 标准化对数函数格式
-        # log_a(x) -> \log_a(x)
-        formula = re.sub(r'\\blog_([a-zA-Z0-9]+)\\b', r'\\log_{\1}', formula)
-        formula = re.sub(r'\\blog\\b', r'\\log', formula)
-        formula = re.sub(r'\\bln\\b', r'\\ln', formula)
-        
-        return formula
-    
+        if index >= end or tokens[index][0] != 'text':
+            return index
+
+        value = tokens[index][1]
+        head = _SCRIPT_HEAD.match(value).group()
+        output.append(f'{{{self._function(head)}}}' if len(head) > 1 else head)
+        if len(head) < len(value):
+            # 剩余部分（如 x^2y 中的 y）作为普通文本继续转换
+            tokens[index] = ('text', value[len(head):])
+            return index
+        return index + 1
+
+    def _render_command(self, tokens: List[Token], index: int, end: int, groups: List[int], output: List[str]) -> int:
+        """
+        转换命令及其参数，返回命令（和参数）之后的位置
+        """
+        name = tokens[index][1][1:]
+        name = self.unsupported_commands.get(name, name)
+        index += 1
+
+        if not name:
+            # 删除的命令连同其后的一个空格
+            if index < end and tokens[index][0] == 'space':
+                index += 1
+            return index
+
+        if name in self.bracket_replacements:
+            output.append(self.bracket_replacements[name])
+            return index
+
+        argument = self._find_argument(tokens, index, end)
+        if argument >= 0 and groups[argument] >= 0:
+            content = ''.join(value for _, value in tokens[argument + 1:groups[argument]])
+            if name in self.function_names:
+                output.append(f'\\{self.function_names[name]}{{{content}}}')
+                return groups[argument] + 1
+            if name in _TEXT_COMMANDS:
+                output.append(f'\\{name}{{{content}}}')
+                return groups[argument] + 1
+            if name in ('begin', 'end'):
+                output.append(f'\\{name}{{{self.environment_replacements.get(content, content)}}}')
+                return groups[argument] + 1
+
+        output.append(f'\\{name}')
+        if name == 'frac':
+            # 两个参数都加花括号：\frac12 → \frac{1}{2}
+            for _ in range(2):
+                index = self._render_frac_argument(tokens, index, end, groups, output)
+        elif name.isalpha() and index < end and tokens[index][0] == 'text' and tokens[index][1][0].isalpha():
+            # 替换后的命令名与后面的字母分开（\;x → \quad x）
+            output.append(' ')
+        return index
+
+    def _find_argument(self, tokens: List[Token], index: int, end: int) -> int:
+        """
+        命令后（跳过空白）的左花括号位置，没有则为 -1
+        """
+        while index < end and tokens[index][0] == 'space':
+            index += 1
+        return index if index < end and tokens[index][0] == 'open' else -1
+
+    def _render_frac_argument(self, tokens: List[Token], index: int, end: int, groups: List[int],
+                              output: List[str]) -> int:
+        """
+        转换 \\frac 的一个参数：分组照常转换，单个字符或命令加花括号
+        """
+        while index < end and tokens[index][0] == 'space':
+            index += 1
+        if index >= end:
+            return index
+
+        kind, value = tokens[index]
+        if kind == 'open' and groups[index] >= 0:
+            return self._render_group(tokens, index, groups, output)
+        if kind == 'text':
+            # 按TeX的规则只取第一个字符，剩余部分留给下一个参数或后续文本
+            output.append(f'{{{value[0]}}}')
+            if len(value) > 1:
+                tokens[index] = ('text', value[1:])
+                return index
+            return index + 1
+        if kind == 'command':
+            # 只转换命令名本身（\frac\pi2 → \frac{\pi}{2}）
+            name = self.unsupported_commands.get(value[1:], value[1:])
+            command = self.bracket_replacements.get(name, '\\' + name if name else '')
+            output.append(f'{{{command}}}')
+            return index + 1
+        if kind == 'other':
+            output.append(f'{{{value}}}')
+            return index + 1
+        return index
+
+    def _function(self, word: str) -> str:
+        """
+        函数名转换为命令（sin → \\sin）
+        """
+        return f'\\{word}' if word in MATH_FUNCTIONS else word
+
     def validate_katex_compatibility(self, formula: str) -> Tuple[bool, List[str]]:
         """
         验证公式是否符合KaTeX标准
@@ -245,9 +342,22 @@ class KaTeXFormatter:
 # 全局格式化器实例
 katex_formatter = KaTeXFormatter()
 
+def _freeze(result: Tuple[bool, List[str]]) -> Tuple[bool, Tuple[str, ...]]:
+    """问题列表转换为元组，缓存的结果不会被调用方修改"""
+    is_valid, issues = result
+    return is_valid, tuple(issues)
+
+# 题库中的文本大量重复，两个模块函数的结果按文本缓存
+_format_memo = LRUMemo(katex_formatter.format_latex_formula,
+                       KATEX_CACHE_CONFIG.get('max_entries', 4096),
+                       KATEX_CACHE_CONFIG.get('max_text_length'))
+_validate_memo = LRUMemo(lambda content: _freeze(katex_formatter.validate_katex_compatibility(content)),
+                         KATEX_CACHE_CONFIG.get('max_entries', 4096),
+                         KATEX_CACHE_CONFIG.get('max_text_length'))
+
 def format_math_content(content: str) -> str:
     """
-    格式化包含数学公式的内容
+    格式化包含数学公式的内容（结果按内容缓存）
     
     Args:
         content: 包含数学公式的文本内容
@@ -255,11 +365,13 @@ def format_math_content(content: str) -> str:
     Returns:
         格式化后的内容
     """
-    return katex_formatter.format_latex_formula(content)
+    if not content:
+        return content
+    return _format_memo(content)
 
 def validate_math_content(content: str) -> Tuple[bool, List[str]]:
     """
-    验证数学内容的KaTeX兼容性
+    验证数学内容的KaTeX兼容性（结果按内容缓存）
     
     Args:
         content: 包含数学公式的文本内容
@@ -267,4 +379,28 @@ def validate_math_content(content: str) -> Tuple[bool, List[str]]:
     Returns:
         (是否兼容, 问题列表)
     """
-    return katex_formatter.validate_katex_compatibility(content)
\ No newline at end of file
+    is_valid, issues = _validate_memo(content)
+    return is_valid, list(issues)
+
+def katex_cache_stats() -> Dict[str, Dict]:
+    """
+    格式化和验证缓存的统计（命中、未命中、命中率、条目数）
+    """
+    return {'format': _format_memo.stats(), 'validate': _validate_memo.stats()}
+
+def katex_cache_report() -> str:
+    """
+    缓存命中情况的一行摘要
+    """
+    parts = []
+    for label, stats in (('格式化', _format_memo.stats()), ('验证', _validate_memo.stats())):
+        calls = stats['hits'] + stats['misses']
+        parts.append(f"{label} 命中 {stats['hits']}/{calls}（{stats['hit_rate']:.0%}）")
+    return f"公式缓存: {'，'.join(parts)}"
+
+def clear_katex_cache() -> None:
+    """
+    清空格式化和验证缓存（修改 katex_formatter 的规则后需要调用）
+    """
+    _format_memo.clear()
+    _validate_memo.clear()
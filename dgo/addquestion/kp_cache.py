@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+知识点ID持久化缓存
+
+将 "科目:知识点名称" 到知识点ID的映射保存在本地文件中，按服务器地址隔离，
+条目超过有效期后视为不存在。多个进程可同时读写同一个缓存文件。
+"""
+
+import time
+from typing import Dict, Optional
+
+from local_store import file_lock, read_json, atomic_write_json
+
+
+class KnowledgePointCache:
+    """
+    知识点ID缓存
+
+    用法与字典相同，键为 "科目:知识点名称"：
+        if key in cache: point_id = cache[key]
+        cache[key] = point_id
+
+    文件在第一次访问时才读取。
+    """
+
+    def __init__(self, path: Optional[str], server_url: str, ttl: float):
+        """
+        Args:
+            path: 缓存文件路径，为None时只缓存在内存中
+            server_url: 服务器地址，不同服务器的缓存互不影响
+            ttl: 条目有效期（秒）
+        """
+        self.path = path
+        self.server_url = server_url.rstrip('/')
+        self.ttl = ttl
+        self._entries = None
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path:
+                with file_lock(self.path, shared=True):
+                    data = read_json(self.path, {})
+                self._entries = data.get(self.server_url, {})
+        return self._entries
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry.get('ts', 0) < self.ttl
+
+    def _update_file(self, update) -> None:
+        """
+        在文件锁内读取最新内容、应用修改并写回，保留其他进程写入的条目
+        """
+        if not self.path:
+            return
+        with file_lock(self.path):
+            data = read_json(self.path, {})
+            entries = data.setdefault(self.server_url, {})
+            update(entries)
+            # 写回时顺便清理过期条目
+            data[self.server_url] = {k: v for k, v in entries.items() if self._is_fresh(v)}
+            atomic_write_json(self.path, data)
+            self._entries = dict(data[self.server_url])
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        获取未过期的知识点ID
+        """
+        entry = self._load().get(key)
+        if entry and self._is_fresh(entry):
+            return entry['id']
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> str:
+        point_id = self.get(key)
+        if point_id is None:
+            raise KeyError(key)
+        return point_id
+
+    def __setitem__(self, key: str, point_id: str) -> None:
+        entry = {'id': point_id, 'ts': time.time()}
+        self._load()[key] = entry
+        self._update_file(lambda entries: entries.__setitem__(key, entry))
+
+    def update(self, point_ids: Dict[str, str]) -> None:
+        """
+        批量写入多个条目，只读写一次缓存文件
+        """
+        if not point_ids:
+            return
+        now = time.time()
+        new_entries = {key: {'id': point_id, 'ts': now} for key, point_id in point_ids.items()}
+        self._load().update(new_entries)
+        self._update_file(lambda entries: entries.update(new_entries))
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._load().values() if self._is_fresh(entry))
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        使缓存失效
+
+        Args:
+            key: 要删除的 "科目:知识点名称"，为None时清空当前服务器的全部缓存
+        """
+        def remove(entries: Dict) -> None:
+            if key is None:
+                entries.clear()
+            else:
+                entries.pop(key, None)
+
+        remove(self._load())
+        self._update_file(remove)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+知识点批量解析
+
+上传题目前先把题目引用的全部知识点名称解析为ID：
+每个科目先用一次 GET /api/knowledge-points/list 预取已有知识点，
+只有服务器上不存在的名称才并发调用 GET /api/knowledge-points/{name}（不存在时自动创建）。
+题目中的知识点以名称保存，因此解析得到的ID即知识点名称。
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Set
+
+import requests
+
+from kp_cache import KnowledgePointCache
+from retry_policy import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class KnowledgePointResolver:
+    """
+    知识点名称到ID的解析器
+
+    解析结果写入 KnowledgePointCache，之后的运行直接命中缓存；
+    每个科目在一个解析器的生命周期内只预取一次。
+    """
+
+    def __init__(self, session: requests.Session, base_url: str, timeout,
+                 cache: KnowledgePointCache, max_workers: int = 8,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Args:
+            session: 带认证信息的会话
+            base_url: 服务器地址
+            timeout: 请求超时时间
+            cache: 知识点ID缓存
+            max_workers: 同时获取/创建知识点的请求数
+            retry_policy: 请求重试策略，为None时不重试
+        """
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.retry_policy = retry_policy
+        self._prefetched: Set[str] = set()
+
+    def _get(self, url: str, params: Dict) -> requests.Response:
+        def send():
+            return self.session.get(url, params=params, timeout=self.timeout)
+        if self.retry_policy is None:
+            return send()
+        return self.retry_policy.execute(send)
+
+    def prefetch(self, subject: str) -> int:
+        """
+        一次请求获取科目下全部已有知识点并写入缓存
+
+        Returns:
+            服务器上已有的知识点数量，请求失败时为0
+        """
+        if subject in self._prefetched:
+            return 0
+
+        try:
+            response = self._get(f"{self.base_url}/api/knowledge-points/list", {'subject': subject})
+            if response.status_code != 200:
+                logger.warning(f"预取知识点列表失败，科目：{subject}，状态码：{response.status_code}")
+                return 0
+            points = response.json().get('data', {}).get(subject, [])
+        except Exception as e:
+            logger.warning(f"预取知识点列表时发生异常，科目：{subject}，异常：{str(e)}")
+            return 0
+
+        self._prefetched.add(subject)
+        self.cache.update({
+            f"{subject}:{point['name']}": point['name']
+            for point in points
+            if f"{subject}:{point['name']}" not in self.cache
+        })
+        logger.info(f"预取知识点完成，科目：{subject}，共 {len(points)} 个")
+        return len(points)
+
+    def is_prefetched(self, subject: str) -> bool:
+        return subject in self._prefetched
+
+    def mark_prefetched(self, subject: str) -> None:
+        """
+        标记科目的知识点列表已在缓存中（例如在预检缓存有效期内），解析时不再预取
+        """
+        self._prefetched.add(subject)
+
+    def _fetch_or_create(self, subject: str, name: str) -> Optional[str]:
+        """
+        获取单个知识点，服务器上不存在时自动创建
+        """
+        try:
+            response = self._get(f"{self.base_url}/api/knowledge-points/{name}", {'subject': subject})
+            if response.status_code == 200 and response.json().get('success'):
+                return name
+            logger.error(f"获取/创建知识点失败: {name}，状态码：{response.status_code}")
+        except Exception as e:
+            logger.error(f"获取/创建知识点时发生异常: {name}，异常：{str(e)}")
+        return None
+
+    def resolve(self, subject: str, names: Iterable[str]) -> Dict[str, str]:
+        """
+        解析一组知识点名称
+
+        Args:
+            subject: 科目名称
+            names: 知识点名称（可重复）
+
+        Returns:
+            名称到ID的映射；获取和创建都失败的名称不在映射中
+        """
+        names = list(dict.fromkeys(names))
+        resolved = {}
+        missing = []
+        for name in names:
+            point_id = self.cache.get(f"{subject}:{name}")
+            if point_id is not None:
+                resolved[name] = point_id
+            else:
+                missing.append(name)
+
+        if missing and self.prefetch(subject):
+            still_missing = []
+            for name in missing:
+                point_id = self.cache.get(f"{subject}:{name}")
+                if point_id is not None:
+                    resolved[name] = point_id
+                else:
+                    still_missing.append(name)
+            missing = still_missing
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                point_ids = list(executor.map(lambda name: self._fetch_or_create(subject, name), missing))
+            created = {name: point_id for name, point_id in zip(missing, point_ids) if point_id is not None}
+            resolved.update(created)
+            self.cache.update({f"{subject}:{name}": point_id for name, point_id in created.items()})
+
+        logger.info(f"知识点解析完成，科目：{subject}，{len(resolved)}/{len(names)} 个，"
+                    f"需获取/创建 {len(missing)} 个")
+        return resolved
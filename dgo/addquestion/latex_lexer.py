@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LaTeX公式词法分析
+
+把公式切分为记号序列，KaTeXFormatter 在记号序列上一次遍历完成全部转换。
+切分只用一个编译好的正则表达式从左到右扫描一遍，耗时与公式长度成线性关系。
+
+记号是 (类型, 原文) 二元组，类型包括：
+    command  命令：\\ 加字母串（如 \\frac），或 \\ 加单个字符（如 \\, \\{ \\\\）
+    text     字母数字串，可含小数（如 x、2x、0.5）
+    open     左花括号 {
+    close    右花括号 }
+    script   上下标符号 ^ 或 _
+    space    连续空白
+    other    其他单个字符（运算符、括号、中文等）
+"""
+
+import re
+from typing import List, Tuple
+
+Token = Tuple[str, str]
+
+_TOKEN_PATTERN = re.compile(
+    r'(?P<command>\\(?:[a-zA-Z]+|.))'
+    r'|(?P<text>[a-zA-Z0-9]+(?:\.[0-9]+[a-zA-Z0-9]*)*)'
+    r'|(?P<open>\{)'
+    r'|(?P<close>\})'
+    r'|(?P<script>[\^_])'
+    r'|(?P<space>\s+)'
+    r'|(?P<other>.)',
+    re.S
+)
+
+
+def tokenize(formula: str) -> List[Token]:
+    """
+    把公式切分为记号序列，记号原文依次拼接即为原公式
+
+    Args:
+        formula: LaTeX公式字符串
+
+    Returns:
+        记号列表
+    """
+    return [(match.lastgroup, match.group()) for match in _TOKEN_PATTERN.finditer(formula)]
+
+
+def match_groups(tokens: List[Token]) -> Tuple[List[int], int]:
+    """
+    找出每个左花括号对应的右花括号
+
+    Args:
+        tokens: tokenize 返回的记号列表
+
+    Returns:
+        (与 tokens 等长的列表：左花括号处为对应右花括号的位置，未配对的左花括号和其他记号处为 -1,
+         花括号的最大嵌套层数)
+    """
+    groups = [-1] * len(tokens)
+    stack = []
+    depth = 0
+    for index, (kind, _) in enumerate(tokens):
+        if kind == 'open':
+            stack.append(index)
+            depth = max(depth, len(stack))
+        elif kind == 'close' and stack:
+            groups[stack.pop()] = index
+    return groups, depth
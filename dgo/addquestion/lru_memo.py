@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+有界LRU记忆化
+
+题库中大量重复相同的字符串（选项文本、单位、生成器输出的固定解析），
+对纯函数（如公式格式化）用 LRUMemo 包装后，重复的输入直接返回上次的结果。
+缓存条目数有上限，超出时淘汰最久未使用的条目；可在多个线程中同时调用。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class LRUMemo:
+    """
+    以字符串为参数的纯函数的有界LRU缓存，记录命中和未命中次数
+    """
+
+    def __init__(self, func: Callable[[Any], Any], max_entries: int = 4096,
+                 max_key_length: Optional[int] = None):
+        """
+        Args:
+            func: 被缓存的函数，相同参数必须返回相同结果
+            max_entries: 最多缓存的条目数，0表示不缓存
+            max_key_length: 参数长度超过该值时不缓存（很长的文本很少重复），None表示不限制
+        """
+        self.func = func
+        self.max_entries = max(0, max_entries)
+        self.max_key_length = max_key_length
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, key: str) -> Any:
+        cacheable = self.max_entries > 0 and (self.max_key_length is None or len(key) <= self.max_key_length)
+        if cacheable:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                self.misses += 1
+        else:
+            with self._lock:
+                self.misses += 1
+
+        # 在锁外计算，其他线程不必等待；同一参数被同时计算时结果相同，后写入的覆盖先写入的
+        value = self.func(key)
+
+        if cacheable:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """
+        清空缓存和计数
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        缓存统计：命中次数、未命中次数、命中率、当前条目数、条目上限
+        """
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / calls if calls else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+上传演练（不联网）的请求体分析
+
+演练模式下题目照常格式化和序列化，但不发送请求，而是统计：
+各字段（content、options、explanation、svgData、imageData）占用的字节数、
+格式化和序列化耗时，以及按给定往返延迟和并发数估算的上传耗时。
+用于大批量导入前确定分块大小、找出体积异常的图形。
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from json_codec import JSONCodec, get_codec
+
+# 单独统计的字段，其余字段合计为“其他”
+PROFILED_FIELDS = ('content', 'options', 'explanation', 'svgData', 'imageData')
+
+
+class PayloadProfiler:
+    """
+    请求体统计器（线程安全，可在并发上传和流水线中使用）
+    """
+
+    def __init__(self, codec: Optional[JSONCodec] = None, top_n: int = 5):
+        """
+        Args:
+            codec: 与实际上传相同的JSON编解码器
+            top_n: 报告中列出的最大请求体数量
+        """
+        self.codec = codec or get_codec()
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_bytes = 0
+        self.field_bytes = {field: 0 for field in PROFILED_FIELDS}
+        self.format_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.largest: List[Tuple[int, str]] = []
+
+    def add_format_time(self, seconds: float) -> None:
+        """
+        累计KaTeX格式化耗时
+        """
+        with self._lock:
+            self.format_seconds += seconds
+
+    def measure(self, question_data: Dict, body: Optional[bytes] = None) -> bytes:
+        """
+        统计一道题目的请求体
+
+        Args:
+            question_data: {"question": {...}} 请求体
+            body: 已序列化的请求体；为None时在此序列化并计时
+
+        Returns:
+            序列化后的请求体
+        """
+        elapsed = 0.0
+        if body is None:
+            started = time.perf_counter()
+            body = self.codec.dumps(question_data)
+            elapsed = time.perf_counter() - started
+
+        question = question_data.get('question', question_data)
+        sizes = {field: len(self.codec.dumps(question[field])) for field in PROFILED_FIELDS if field in question}
+
+        with self._lock:
+            self.count += 1
+            self.total_bytes += len(body)
+            self.serialize_seconds += elapsed
+            for field, size in sizes.items():
+                self.field_bytes[field] += size
+            self.largest.append((len(body), question.get('content', '')[:30]))
+            self.largest.sort(key=lambda item: item[0], reverse=True)
+            del self.largest[self.top_n:]
+        return body
+
+    def projected_upload_seconds(self, rtt: float, concurrency: int, bandwidth_mbps: float = 0) -> float:
+        """
+        估算逐题上传的总耗时
+
+        每个请求耗时按 往返延迟 + 传输时间 计算：延迟被并发请求分摊，传输时间受总带宽限制
+
+        Args:
+            rtt: 单个请求的往返延迟（秒，含服务器处理时间）
+            concurrency: 同时进行的请求数
+            bandwidth_mbps: 上行带宽（Mbps），0表示不计传输时间
+        """
+        if self.count == 0:
+            return 0.0
+        latency = self.count * rtt / max(1, concurrency)
+        transfer = self.total_bytes * 8 / (bandwidth_mbps * 1_000_000) if bandwidth_mbps > 0 else 0.0
+        return latency + transfer
+
+    def report(self, rtt: float, concurrency: int, bandwidth_mbps: float = 0) -> str:
+        """
+        生成统计报告
+        """
+        if self.count == 0:
+            return "演练统计：没有题目"
+
+        lines = [f"演练统计：{self.count} 道题目，请求体共 {self.total_bytes / 1024:.1f} KB"
+                 f"（平均 {self.total_bytes / self.count:.0f} 字节/道）"]
+        other = self.total_bytes - sum(self.field_bytes.values())
+        for field, size in list(self.field_bytes.items()) + [('其他', other)]:
+            if size:
+                lines.append(f"   {field:<12} {size / 1024:>10.1f} KB  {size / self.total_bytes * 100:>5.1f}%"
+                             f"  平均 {size / self.count:.0f} 字节/道")
+        lines.append(f"   格式化耗时 {self.format_seconds * 1000:.1f} ms，"
+                     f"序列化耗时 {self.serialize_seconds * 1000:.1f} ms（{self.codec.name}）")
+
+        bandwidth = f"，带宽 {bandwidth_mbps:g} Mbps" if bandwidth_mbps > 0 else ""
+        lines.append(f"   预计上传耗时 {self.projected_upload_seconds(rtt, concurrency, bandwidth_mbps):.1f} 秒"
+                     f"（往返延迟 {rtt * 1000:.0f} ms，并发 {concurrency}{bandwidth}）")
+        lines.append("   最大的请求体：")
+        for size, content in self.largest:
+            lines.append(f"     {size / 1024:>8.1f} KB  {content}...")
+        return "\n".join(lines)
+
+    def report_with_config(self, config: Dict) -> str:
+        """
+        按 DRY_RUN_CONFIG 生成统计报告
+        """
+        return self.report(config['rtt'], config['concurrency'], config.get('bandwidth_mbps', 0))
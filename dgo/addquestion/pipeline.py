@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分阶段流水线（生产者/消费者）
+
+把题目处理拆成若干阶段（如 生成 → 格式化 → 序列化 → 上传），阶段之间用有界队列连接，
+每个阶段可配置工作线程数。CPU密集的阶段（KaTeX格式化、SVG生成）可以放到进程池中执行，
+与I/O密集的上传阶段同时进行。运行结束后可输出各阶段的吞吐量和队列深度。
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue
+from typing import Any, Callable, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# 队列结束标记
+_STOP = object()
+
+
+class Stage:
+    """
+    流水线中的一个阶段
+
+    func 接收上一阶段的输出并返回本阶段的输出；抛出异常的条目会被记录并丢弃。
+    use_process 为True时 func 在进程池中执行，func 和数据都必须可以被pickle
+    （即模块级函数和普通的dict/list/str）。
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, use_process: bool = False):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.use_process = use_process
+
+
+class StageStats:
+    """单个阶段的运行统计"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    def sample_queue_depth(self, depth: int) -> None:
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    @property
+    def avg_queue_depth(self) -> float:
+        """取出条目时输入队列的平均深度"""
+        return self._depth_total / self._depth_samples if self._depth_samples else 0.0
+
+    def throughput(self, elapsed: float) -> float:
+        """整个运行期间的平均吞吐量（条/秒）"""
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+
+class Pipeline:
+    """
+    有界队列连接的多阶段流水线
+
+    输入队列写满时上游阻塞（背压），内存占用只与 queue_size 和阶段数有关。
+    队列深度持续接近 queue_size 的阶段即为瓶颈，可以增加该阶段的工作线程数。
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 64):
+        """
+        Args:
+            stages: 按顺序排列的阶段
+            queue_size: 每个阶段输入队列的容量
+        """
+        if not stages:
+            raise ValueError("流水线至少需要一个阶段")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.stats: Dict[str, StageStats] = {}
+        self.elapsed = 0.0
+
+    def run(self, items: Iterable) -> List:
+        """
+        把 items 依次送入流水线，等待全部处理完成
+
+        Args:
+            items: 输入条目，可以是生成器（边生成边处理）
+
+        Returns:
+            最后一个阶段的输出（按完成顺序，不保证与输入顺序一致）
+        """
+        self.stats = {stage.name: StageStats(stage.name) for stage in self.stages}
+        queues = [Queue(maxsize=self.queue_size) for _ in self.stages]
+        remaining = [stage.workers for stage in self.stages]
+        results = []
+        lock = threading.Lock()
+
+        process_workers = sum(stage.workers for stage in self.stages if stage.use_process)
+        pool = ProcessPoolExecutor(max_workers=process_workers) if process_workers else None
+
+        def worker(index: int) -> None:
+            stage = self.stages[index]
+            stats = self.stats[stage.name]
+            inbox = queues[index]
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+
+            while True:
+                depth = inbox.qsize()
+                item = inbox.get()
+                if item is _STOP:
+                    break
+
+                started = time.perf_counter()
+                try:
+                    if stage.use_process:
+                        output = pool.submit(stage.func, item).result()
+                    else:
+                        output = stage.func(item)
+                    failed = False
+                except Exception as e:
+                    logger.error(f"流水线阶段 {stage.name} 处理失败: {e}")
+                    failed = True
+                busy = time.perf_counter() - started
+
+                with lock:
+                    stats.sample_queue_depth(depth)
+                    stats.busy_time += busy
+                    if failed:
+                        stats.failed += 1
+                    else:
+                        stats.processed += 1
+                        if outbox is None:
+                            results.append(output)
+                if not failed and outbox is not None:
+                    outbox.put(output)
+
+            # 本阶段最后一个退出的线程通知下一阶段结束
+            with lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            if last and outbox is not None:
+                for _ in range(self.stages[index + 1].workers):
+                    outbox.put(_STOP)
+
+        threads = [
+            threading.Thread(target=worker, args=(index,), name=f"pipeline-{stage.name}-{n}", daemon=True)
+            for index, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            for item in items:
+                queues[0].put(item)
+        finally:
+            # 输入出错时也要让所有线程退出
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_STOP)
+            for thread in threads:
+                thread.join()
+            if pool is not None:
+                pool.shutdown()
+            self.elapsed = time.perf_counter() - started
+
+        return results
+
+    def report(self) -> str:
+        """
+        各阶段的吞吐量和队列深度
+        """
+        lines = [f"流水线耗时 {self.elapsed:.2f} 秒"]
+        for stage in self.stages:
+            stats = self.stats.get(stage.name) or StageStats(stage.name)
+            mode = "进程" if stage.use_process else "线程"
+            line = (f"  {stage.name}（{stage.workers}{mode}）: {stats.processed} 条，"
+                    f"{stats.throughput(self.elapsed):.1f} 条/秒，"
+                    f"队列深度 平均{stats.avg_queue_depth:.1f}/最大{stats.max_queue_depth}")
+            if stats.failed:
+                line += f"，失败 {stats.failed} 条"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def default_process_workers() -> int:
+    """
+    CPU密集阶段的默认进程数
+    """
+    return max(1, (os.cpu_count() or 2) - 1)
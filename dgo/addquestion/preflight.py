@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动预检
+
+脚本开始工作前需要检查服务器连接、验证token、预取知识点列表，
+原先依次进行，每项都要等待往返（服务器检查最多两次5秒超时）。
+预检把这些检查同时执行，并把成功的结果按服务器地址缓存在本地文件中，
+短时间内重复运行（CI、定时任务）时直接使用缓存，不再发送请求。
+失败的结果不缓存，下次运行重新检查。
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from local_store import file_lock, read_json, atomic_write_json
+
+logger = logging.getLogger(__name__)
+
+
+class PreflightCache:
+    """
+    预检结果缓存：{服务器地址: {检查项: 成功时间}}
+    """
+
+    def __init__(self, path: Optional[str], server_url: str, ttl: float):
+        """
+        Args:
+            path: 缓存文件路径，None表示不缓存
+            server_url: 服务器地址
+            ttl: 成功结果的有效期（秒）
+        """
+        self.path = path
+        self.server_url = server_url.rstrip('/')
+        self.ttl = ttl
+
+    def fresh(self) -> Dict[str, float]:
+        """
+        仍在有效期内的检查项及其成功时间
+        """
+        if not self.path or self.ttl <= 0:
+            return {}
+        with file_lock(self.path, shared=True):
+            entries = read_json(self.path, {}).get(self.server_url, {})
+        now = time.time()
+        return {name: ts for name, ts in entries.items() if now - ts < self.ttl}
+
+    def store(self, names: List[str]) -> None:
+        """
+        记录检查成功
+        """
+        if not self.path or self.ttl <= 0 or not names:
+            return
+        with file_lock(self.path):
+            data = read_json(self.path, {})
+            now = time.time()
+            entries = {name: ts for name, ts in data.get(self.server_url, {}).items() if now - ts < self.ttl}
+            entries.update({name: now for name in names})
+            data[self.server_url] = entries
+            atomic_write_json(self.path, data)
+
+
+class Preflight:
+    """
+    并发执行一组预检，可缓存的检查项成功后写入 PreflightCache
+    """
+
+    def __init__(self, cache: PreflightCache, max_workers: int = 4):
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self._checks: List[Tuple[str, Callable[[], bool], bool]] = []
+
+    def add(self, name: str, check: Callable[[], bool], cacheable: bool = True) -> None:
+        """
+        Args:
+            name: 检查项名称（缓存键）
+            check: 检查函数，返回是否成功
+            cacheable: 成功结果是否可以跨运行缓存
+        """
+        self._checks.append((name, check, cacheable))
+
+    def run(self) -> Tuple[Dict[str, bool], List[str]]:
+        """
+        执行全部检查
+
+        Returns:
+            (各检查项是否成功, 命中缓存的检查项)
+        """
+        fresh = self.cache.fresh()
+        cached = [name for name, _, cacheable in self._checks if cacheable and name in fresh]
+        results = {name: True for name in cached}
+        pending = [(name, check) for name, check, _ in self._checks if name not in results]
+
+        def run_check(item: Tuple[str, Callable[[], bool]]) -> bool:
+            name, check = item
+            try:
+                return bool(check())
+            except Exception as e:
+                logger.error(f"预检 {name} 出错: {e}")
+                return False
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                results.update(zip((name for name, _ in pending), executor.map(run_check, pending)))
+
+        cacheable = {name for name, _, can_cache in self._checks if can_cache}
+        self.cache.store([name for name, _ in pending if results[name] and name in cacheable])
+        logger.info(f"预检完成: {results}，命中缓存: {cached}")
+        return results, cached
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无交互的命令行入口
+
+与交互式程序读取同一份 config.py，不等待任何输入，适合脚本和多进程并行运行：
+
+    python -m question_cli import 题库.ndjson [--shard 1/4] [--dry-run]
+    python -m question_cli generate advanced --seed 42 [--shard 1/4] [--triangles 80 --quads 60 --circles 60]
+    python -m question_cli reformat [math_test_questions.json] [--preview | --in-place]
+
+--shard i/N 按题目内容哈希划分输入，N个进程（可在不同机器上）分别使用 1/N ... N/N 即可
+互不重叠地处理同一份输入。生成题目时各进程必须使用相同的 --seed。
+
+退出码：0 全部成功，1 有题目失败或无法连接服务器，2 参数错误。
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from config import DRY_RUN_CONFIG
+from json_stream import read_subject
+from shard_partition import parse_shard
+
+
+def _shard_arg(value: str):
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _preflight_ok(manager, subjects: List[str]) -> bool:
+    """
+    检查服务器连接和token，同时预取各科目的知识点
+    """
+    checks = manager.preflight(subjects)
+    if not checks['server']:
+        print(f"❌ 无法连接到服务器: {manager.base_url}")
+        return False
+    if not checks['token']:
+        print("❌ Token验证失败，请检查配置")
+        return False
+    return True
+
+
+def run_import(args) -> int:
+    """
+    导入题库文件
+    """
+    from enhanced_example import EnhancedQuestionManager
+
+    manager = EnhancedQuestionManager()
+    try:
+        if args.dry_run:
+            manager.enable_dry_run()
+        else:
+            subject = read_subject(args.file)
+            if not _preflight_ok(manager, [subject] if subject else []):
+                return 1
+
+        success_count, total = manager.import_file(args.file, shard=args.shard)
+        if args.dry_run:
+            print(f"\n📊 {manager.profiler.report_with_config(DRY_RUN_CONFIG)}")
+            return 0
+        print(f"\n📊 导入统计: {success_count}/{total} 道题目成功")
+        return 0 if success_count == total else 1
+    finally:
+        manager.close()
+
+
+def run_generate(args) -> int:
+    """
+    生成几何题目并上传
+    """
+    counts = {name: value for name, value in (
+        ('triangle_count', args.triangles), ('quad_count', args.quads), ('circle_count', args.circles)
+    ) if value is not None}
+
+    if args.kind == 'advanced':
+        from generate_advanced_geometry import AdvancedGeometryGenerator
+        generator = AdvancedGeometryGenerator()
+        add_questions = generator.add_questions_to_database
+    else:
+        from add_geometry_questions import GeometryQuestionGenerator
+        generator = GeometryQuestionGenerator()
+        add_questions = generator.add_geometry_questions_to_database
+
+    manager = generator.question_manager
+    try:
+        if not args.dry_run and not _preflight_ok(manager, ['数学']):
+            return 1
+        success_count, total = add_questions(seed=args.seed, dry_run=args.dry_run, shard=args.shard, **counts)
+        return 0 if args.dry_run or success_count == total else 1
+    finally:
+        manager.close()
+
+
+def run_reformat(args) -> int:
+    """
+    把题目文件中的公式格式化为KaTeX标准
+    """
+    from update_math_questions import preview_changes, update_math_questions
+
+    if args.preview:
+        preview_changes(args.file)
+        return 0
+    return 0 if update_math_questions(args.file, replace=args.in_place) else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m question_cli", description="题库导入、题目生成和公式格式化（无交互）")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    shard_help = "只处理按内容哈希属于第i个分片的题目（共N个分片，i从1开始）"
+
+    import_parser = subparsers.add_parser('import', help="导入JSON或NDJSON题库文件")
+    import_parser.add_argument('file', help="题库文件路径（格式见 json_stream.py）")
+    import_parser.add_argument('--shard', type=_shard_arg, default=None, metavar='i/N', help=shard_help)
+    import_parser.add_argument('--dry-run', action='store_true', help="只格式化和序列化题目并统计请求体，不连接服务器")
+    import_parser.set_defaults(handler=run_import)
+
+    generate_parser = subparsers.add_parser('generate', help="生成带图形的几何题目并上传")
+    generate_parser.add_argument('kind', choices=['basic', 'advanced'], help="basic：基础几何题；advanced：高考级别几何题")
+    generate_parser.add_argument('--seed', type=int, default=None, help="随机种子，使用相同种子重新运行可续传")
+    generate_parser.add_argument('--triangles', type=int, default=None, help="三角形题目数量")
+    generate_parser.add_argument('--quads', type=int, default=None, help="四边形题目数量")
+    generate_parser.add_argument('--circles', type=int, default=None, help="圆形题目数量")
+    generate_parser.add_argument('--shard', type=_shard_arg, default=None, metavar='i/N', help=shard_help)
+    generate_parser.add_argument('--dry-run', action='store_true', help="只生成和序列化题目并统计请求体，不连接服务器")
+    generate_parser.set_defaults(handler=run_generate)
+
+    reformat_parser = subparsers.add_parser('reformat', help="把题目文件中的公式格式化为KaTeX标准")
+    reformat_parser.add_argument('file', nargs='?', default='math_test_questions.json', help="题目文件路径")
+    mode = reformat_parser.add_mutually_exclusive_group()
+    mode.add_argument('--preview', action='store_true', help="只预览变更，不写入文件")
+    mode.add_argument('--in-place', action='store_true', help="用格式化结果替换原文件（默认写入 <文件名>_katex.json）")
+    reformat_parser.set_defaults(handler=run_reformat)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'generate' and args.shard is not None and args.seed is None:
+        parser.error("generate 使用 --shard 时必须指定 --seed，各进程才能生成相同的题目集合")
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        print("\n\n👋 程序已退出")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
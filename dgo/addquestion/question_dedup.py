@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按题目内容哈希去重
+
+重复运行导入或生成脚本时，先把题库中已有题目的内容哈希同步到本地，
+上传前对题目（题干、选项、答案、图片）做规范化并计算哈希，已存在的题目直接跳过，不再发送请求。
+
+哈希集合按科目保存为紧凑的二进制文件（每道题目8字节），
+100万道题目约8MB，加载后在内存集合中以O(1)查找；新上传的题目追加写入。
+同步时只请求计算哈希所需的字段，按创建时间从新到旧用游标分页读取，读到上次同步的位置即停止。
+多个分片进程共用哈希文件：写入持有跨进程文件锁，同一时间只有一个进程同步，
+其余进程等待后重新加载文件，只读取之后新增的题目。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from array import array
+from typing import Any, Dict, Optional, Set
+
+import requests
+
+from config import CACHE_DIR
+from local_store import atomic_write_json, file_lock, read_json
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+# 哈希的组成变化时递增，旧版本的哈希文件不再使用
+HASH_VERSION = 2
+
+# 参与哈希的图片字段（只取摘要）
+MEDIA_FIELDS = ('svgData', 'imageData')
+
+# 同步时向服务器请求的字段
+SYNC_FIELDS = 'subject,content,options,correctAnswer,svgData,imageData,createdAt'
+
+
+def normalize_content(content: str) -> str:
+    """
+    规范化题目内容：统一全角/半角（NFKC）、去掉所有空白、转为小写
+    """
+    return _WHITESPACE.sub('', unicodedata.normalize('NFKC', content or '')).lower()
+
+
+def _normalize_option(option: Any) -> str:
+    """
+    规范化选项：上传时的 "A. 1" 与题库中的 {"label": "A", "content": "1"} 结果相同
+    """
+    if isinstance(option, dict):
+        label = option.get('label')
+        option = f"{label}.{option.get('content', '')}" if label else option.get('content', '')
+    return normalize_content(str(option))
+
+
+def _normalize_answer(answer: Any) -> str:
+    """
+    规范化正确答案（字符串、列表或对象）
+    """
+    if isinstance(answer, (list, tuple)):
+        return ','.join(normalize_content(str(item)) for item in answer)
+    if isinstance(answer, dict):
+        return normalize_content(json.dumps(answer, ensure_ascii=False, sort_keys=True))
+    return normalize_content('' if answer is None else str(answer))
+
+
+def question_hash(question: Dict) -> int:
+    """
+    题目的64位内容哈希（科目、规范化后的题干、选项、正确答案，以及SVG/图片数据的摘要）
+    """
+    parts = [
+        question.get('subject', ''),
+        normalize_content(question.get('content', '')),
+        '\x1f'.join(_normalize_option(option) for option in question.get('options') or []),
+        _normalize_answer(question.get('correctAnswer')),
+    ]
+    for field in MEDIA_FIELDS:
+        if question.get(field):
+            parts.append(f"{field}:{hashlib.blake2b(question[field].encode('utf-8'), digest_size=16).hexdigest()}")
+    key = '\n'.join(parts)
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class ContentHashIndex:
+    """
+    单个科目的内容哈希集合
+
+    .bin 文件依次保存每个哈希（8字节无符号整数），.json 文件记录同步进度
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 哈希文件路径（不含扩展名）
+        """
+        self.bin_path = f"{path}.bin"
+        self.meta_path = f"{path}.json"
+        self.sync_lock_path = f"{path}.sync"
+        self._lock = threading.Lock()
+        self._hashes: Set[int] = set()
+        self.synced_until: Optional[str] = None
+        self._load()
+
+    def _load(self) -> None:
+        if os.path.exists(self.bin_path):
+            hashes = array('Q')
+            with file_lock(self.bin_path, shared=True), open(self.bin_path, 'rb') as f:
+                data = f.read()
+            # 进程中断时最后一个哈希可能只写了一部分
+            hashes.frombytes(data[:len(data) - len(data) % hashes.itemsize])
+            with self._lock:
+                self._hashes.update(hashes)
+        meta = read_json(self.meta_path)
+        if isinstance(meta, dict):
+            self.synced_until = meta.get('synced_until')
+        elif os.path.exists(self.meta_path):
+            logger.warning(f"去重同步记录损坏，将重新同步: {self.meta_path}")
+
+    def reload(self) -> None:
+        """
+        重新读取文件，加入其他进程写入的哈希和同步进度
+        """
+        self._load()
+
+    def __contains__(self, value: int) -> bool:
+        return value in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add_many(self, values) -> int:
+        """
+        加入一组哈希并追加写入文件
+
+        Returns:
+            新加入的哈希数量
+        """
+        with self._lock:
+            new = array('Q', {value for value in values if value not in self._hashes})
+            if not new:
+                return 0
+            self._hashes.update(new)
+            with file_lock(self.bin_path), open(self.bin_path, 'ab') as f:
+                new.tofile(f)
+            return len(new)
+
+    def add(self, value: int) -> bool:
+        return self.add_many([value]) == 1
+
+    def set_synced_until(self, created_at: str) -> None:
+        """
+        记录同步进度，不会退回到其他进程已记录的更晚位置
+        """
+        with self._lock, file_lock(self.meta_path):
+            meta = read_json(self.meta_path)
+            recorded = meta.get('synced_until') if isinstance(meta, dict) else None
+            self.synced_until = max(created_at, recorded) if recorded else created_at
+            atomic_write_json(self.meta_path, {'synced_until': self.synced_until, 'count': len(self._hashes)})
+
+
+class QuestionDeduplicator:
+    """
+    上传前的题目去重
+
+    reserve() 在上传前调用：题库中已有或正在上传的相同题目返回False；
+    上传成功后调用 commit() 写入哈希集合，失败时调用 release()
+    """
+
+    def __init__(self, session: requests.Session, base_url: str, timeout, config: Dict):
+        """
+        Args:
+            session: 共用的HTTP会话
+            base_url: API服务器地址
+            timeout: 请求超时
+            config: DEDUP_CONFIG 配置字典
+        """
+        self.session = session
+        self.base_url = base_url
+        self.timeout = timeout
+        self.directory = config.get('dir', os.path.join(CACHE_DIR, 'content_hashes'))
+        self.page_size = config.get('page_size', 500)
+        self.sync_on_start = config.get('sync', True)
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, ContentHashIndex] = {}
+        self._in_flight: Set[int] = set()
+        self.skipped = 0
+
+    def index(self, subject: str) -> ContentHashIndex:
+        """
+        获取科目的哈希集合，首次使用时从服务器同步
+        """
+        with self._lock:
+            if subject not in self._indexes:
+                server_key = hashlib.sha1(self.base_url.encode('utf-8')).hexdigest()[:8]
+                index = ContentHashIndex(os.path.join(self.directory, f"{server_key}_{subject}.v{HASH_VERSION}"))
+                if self.sync_on_start:
+                    # 同一时间只有一个进程同步；等待期间其他进程同步的结果在重新加载后直接使用
+                    with file_lock(index.sync_lock_path):
+                        index.reload()
+                        self._sync(subject, index)
+                self._indexes[subject] = index
+            return self._indexes[subject]
+
+    def _sync(self, subject: str, index: ContentHashIndex) -> int:
+        """
+        从服务器读取上次同步之后新增的题目哈希
+
+        Returns:
+            新增的哈希数量
+        """
+        url = f"{self.base_url}/api/question-bank/{subject}"
+        newest = None
+        added = 0
+        cursor = ''
+        try:
+            while True:
+                response = self.session.get(url, params={
+                    'cursor': cursor, 'limit': self.page_size, 'fields': SYNC_FIELDS
+                }, timeout=self.timeout)
+                if response.status_code != 200:
+                    logger.warning(f"同步题库哈希失败，状态码: {response.status_code}，仅使用本地记录")
+                    return added
+                data = response.json().get('data', {})
+                questions = data.get('questions', [])
+
+                reached_synced = False
+                page_hashes = []
+                for question in questions:
+                    created_at = question.get('createdAt')
+                    if index.synced_until and created_at and created_at <= index.synced_until:
+                        reached_synced = True
+                        break
+                    newest = newest or created_at
+                    page_hashes.append(question_hash(question))
+                added += index.add_many(page_hashes)
+
+                cursor = data.get('pagination', {}).get('nextCursor')
+                if reached_synced or not questions or not cursor:
+                    break
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"同步题库哈希时出错，仅使用本地记录: {e}")
+            return added
+
+        if newest:
+            index.set_synced_until(newest)
+        if added:
+            print(f"🔎 已同步 {subject} 题库中 {added} 道题目的内容哈希（共 {len(index)} 道）")
+        logger.info(f"题库哈希同步完成，科目：{subject}，新增：{added}，共：{len(index)}")
+        return added
+
+    def reserve(self, question: Dict) -> bool:
+        """
+        上传前检查题目是否重复
+
+        Args:
+            question: 题目数据（含 subject 和 content）
+
+        Returns:
+            是否需要上传；重复的题目返回False
+        """
+        index = self.index(question.get('subject', ''))
+        value = question_hash(question)
+        with self._lock:
+            if value in index or value in self._in_flight:
+                self.skipped += 1
+                return False
+            self._in_flight.add(value)
+            return True
+
+    def commit(self, question: Dict) -> None:
+        """
+        题目上传成功，记录其哈希
+        """
+        value = question_hash(question)
+        self.index(question.get('subject', '')).add(value)
+        with self._lock:
+            self._in_flight.discard(value)
+
+    def release(self, question: Dict) -> None:
+        """
+        题目上传失败，取消占用，之后可以重新上传
+        """
+        with self._lock:
+            self._in_flight.discard(question_hash(question))
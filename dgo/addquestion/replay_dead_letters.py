@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+重新提交失败队列中的题目
+
+服务器故障恢复后运行，只重新提交重试耗尽后写入失败队列的题目，
+不需要重新生成题目或重新导入源文件。
+
+用法：
+    python replay_dead_letters.py [--workers 4]
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from enhanced_example import EnhancedQuestionManager
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="重新提交失败队列中的题目")
+    parser.add_argument('--workers', type=int, default=None, help="同时进行的上传请求数，默认读取 UPLOAD_CONFIG")
+    args = parser.parse_args(argv)
+
+    manager = EnhancedQuestionManager()
+    try:
+        pending = len(manager.dead_letters)
+        if pending == 0:
+            print(f"✅ 失败队列为空（{manager.dead_letters.path}）")
+            return 0
+
+        print(f"📋 失败队列中共有 {pending} 条记录")
+        print("🔍 检查服务器连接和token...")
+        subjects = [entry['payload']['question'].get('subject')
+                    for entry in manager.dead_letters.entries()
+                    if isinstance(entry.get('payload'), dict) and 'question' in entry['payload']]
+        checks = manager.preflight(subject for subject in subjects if subject)
+        if not checks['server']:
+            print(f"❌ 无法连接到服务器: {manager.base_url}，失败队列保持不变")
+            return 1
+        if not checks['token']:
+            print("❌ Token验证失败，请检查配置，失败队列保持不变")
+            return 1
+
+        success_count, total = manager.replay_dead_letters(max_workers=args.workers)
+        return 0 if success_count == total else 1
+    finally:
+        manager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
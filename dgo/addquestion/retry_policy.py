@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+上传重试策略
+
+区分可重试和不可重试的失败，按指数退避加随机抖动重试；
+当最近请求的错误率过高时由熔断器暂停整个批次，避免在服务器过载时
+继续发送注定失败的请求。
+
+创建题目的请求不是幂等的：读取超时或5xx时服务器可能已经写入，重发会重复创建。
+这类请求只在确定服务器没有处理时重发：连接没有建立、429（限流在路由之前拒绝）、
+带 Retry-After 的503。
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Collection, Dict, Optional
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+def request_not_sent(error: Exception) -> bool:
+    """
+    异常是否发生在建立连接阶段（请求一定没有到达服务器）
+
+    连接被拒绝、域名解析失败、连接超时属于此类；读取超时、连接中途断开则无法确定服务器是否已处理
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        reason = getattr(error.args[0], 'reason', error.args[0])
+        # urllib3 的 NewConnectionError、NameResolutionError 都是 ConnectTimeoutError 的子类
+        return isinstance(reason, ConnectTimeoutError)
+    return False
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    统计最近 window 次请求的结果，错误率超过阈值时打开，
+    之后的请求都会等待冷却时间结束再继续。
+    """
+
+    def __init__(self, config: Dict):
+        """
+        Args:
+            config: RETRY_CONFIG 配置字典
+        """
+        self.window = config.get('breaker_window', 20)
+        self.error_rate = config.get('breaker_error_rate', 0.5)
+        self.min_requests = config.get('breaker_min_requests', 10)
+        self.cooldown = config.get('breaker_cooldown', 30)
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=self.window)
+        self._open_until = 0.0
+        self.trips = 0
+
+    def record(self, success: bool) -> None:
+        """
+        记录一次请求结果，错误率超过阈值时打开熔断器
+        """
+        with self._lock:
+            self._outcomes.append(success)
+            if len(self._outcomes) < self.min_requests or time.monotonic() < self._open_until:
+                return
+
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.error_rate:
+                self._open_until = time.monotonic() + self.cooldown
+                self._outcomes.clear()
+                self.trips += 1
+                logger.warning(f"最近请求错误率过高，暂停上传 {self.cooldown} 秒")
+                print(f"⚠️ 最近请求错误率过高（{failures}/{self.window}），暂停上传 {self.cooldown} 秒...")
+
+    def wait_until_closed(self) -> None:
+        """
+        熔断器打开时阻塞，直到冷却时间结束
+        """
+        while True:
+            with self._lock:
+                remaining = self._open_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._open_until
+
+
+class RetryPolicy:
+    """
+    重试策略
+
+    幂等请求：连接错误、超时以及 retryable_status 中的状态码会重试，
+    其他状态码（如400、401）直接返回，不再重试。
+    非幂等请求：只在 request_not_sent 或 is_safe_to_resend 成立时重试。
+    """
+
+    def __init__(self, config: Dict, breaker: Optional[CircuitBreaker] = None):
+        """
+        Args:
+            config: RETRY_CONFIG 配置字典
+            breaker: 共享的熔断器，为None时不熔断
+        """
+        self.max_retries = config.get('max_retries', 3)
+        self.base_delay = config.get('base_delay', 0.5)
+        self.max_delay = config.get('max_delay', 30)
+        self.retryable_status = set(config.get('retryable_status', [408, 429, 500, 502, 503, 504]))
+        self.breaker = breaker
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # 退避抖动使用独立的随机数生成器，不改变全局随机状态（题目生成可能依赖固定种子）
+        self._random = random.Random()
+        self.retries = 0
+
+    @property
+    def last_attempts(self) -> int:
+        """当前线程最近一次 execute() 的尝试次数"""
+        return getattr(self._local, 'attempts', 0)
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """
+        状态码是否属于临时性失败
+        """
+        return status_code in self.retryable_status
+
+    @staticmethod
+    def is_safe_to_resend(response: requests.Response) -> bool:
+        """
+        该响应是否说明服务器没有处理请求（429，或带 Retry-After 的503）
+        """
+        return response.status_code == 429 or (
+            response.status_code == 503 and 'Retry-After' in response.headers
+        )
+
+    def backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """
+        第 attempt 次重试前的等待时间（指数退避 + 全抖动），优先使用 Retry-After
+        """
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(self.max_delay, float(retry_after))
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def execute(self, send: Callable[[], requests.Response], idempotent: bool = True,
+                resend_status: Collection[int] = ()) -> requests.Response:
+        """
+        按重试策略执行请求
+
+        Args:
+            send: 发送一次请求并返回响应的函数
+            idempotent: 请求是否可以安全地重复执行；为False时只重发服务器确定没有处理的请求
+            resend_status: 非幂等请求也可以重发的其他状态码（如多副本时副本不可用的502/503）
+
+        Returns:
+            最后一次请求的响应；重试耗尽时仍是连接错误则抛出异常
+        """
+        attempt = 0
+        while True:
+            if self.breaker is not None:
+                self.breaker.wait_until_closed()
+
+            response, error = None, None
+            try:
+                response = send()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            transient = response is None or self.is_retryable_status(response.status_code)
+            if self.breaker is not None:
+                self.breaker.record(not transient)
+
+            retry = transient and (idempotent or (
+                request_not_sent(error) if response is None
+                else self.is_safe_to_resend(response) or response.status_code in resend_status
+            ))
+            if not retry or attempt >= self.max_retries:
+                self._local.attempts = attempt + 1
+                if response is None:
+                    raise error
+                return response
+
+            delay = self.backoff(attempt, response)
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            reason = f"状态码 {response.status_code}" if response is not None else str(error)
+            logger.warning(f"请求失败（{reason}），{delay:.2f} 秒后第 {attempt} 次重试")
+            time.sleep(delay)
+
+
+def create_retry_policy(config: Dict) -> RetryPolicy:
+    """
+    创建带熔断器的重试策略
+    """
+    return RetryPolicy(config, CircuitBreaker(config))
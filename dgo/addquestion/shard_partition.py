@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按内容哈希划分题目分片
+
+同时运行N个导入进程时，每个进程使用 --shard i/N 只处理属于第i个分片的题目。
+分片只取决于题目的内容哈希（与去重相同的规范化哈希）和分片总数，与读取顺序无关，
+因此N个进程处理同一输入时互不重叠、合起来恰好覆盖全部题目。
+"""
+
+import hashlib
+from typing import Dict, Optional, Tuple
+
+from question_dedup import question_hash
+
+# (分片序号（从0开始）, 分片总数)
+Shard = Tuple[int, int]
+
+
+def parse_shard(spec: str) -> Shard:
+    """
+    解析 "i/N" 格式的分片参数（i 从1开始）
+
+    Raises:
+        ValueError: 格式错误或序号超出范围
+    """
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"分片参数格式应为 i/N，例如 1/4: {spec}")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"分片序号应在 1 到 {max(count, 1)} 之间: {spec}")
+    return index - 1, count
+
+
+def shard_of_key(key: str, count: int) -> int:
+    """
+    任意字符串键所属的分片
+    """
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % count
+
+
+def in_shard(question: Dict, shard: Optional[Shard], subject: Optional[str] = None) -> bool:
+    """
+    题目是否属于指定分片
+
+    Args:
+        question: 题目数据（含 content）
+        shard: parse_shard() 的结果，None表示不分片
+        subject: 题目所属科目，默认读取题目的 subject 字段
+    """
+    if shard is None:
+        return True
+    index, count = shard
+    key = {'subject': subject if subject is not None else question.get('subject', ''),
+           'content': question.get('content', '')}
+    return question_hash(key) % count == index
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多服务器分片上传
+
+把题目按科目或内容哈希路由到多个API副本，每个副本有独立的连接池和健康状态。
+连续失败的副本在冷却期内被跳过，请求自动转移到下一个副本；
+同一道题目始终按相同顺序选择副本（最高随机权重哈希），增减副本时只有少量题目改变路由。
+
+所有副本共用同一个数据库，请求一旦被某个副本处理，再发给其他副本就会重复创建题目。
+因此只在请求确定没有被处理时转移（连接没有建立，或 failover_status 中的502/503），
+转移到下一个副本算作一次重试，由 RetryPolicy 统一计入重试次数，而不是每次重试都遍历全部副本。
+"""
+
+import hashlib
+import logging
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from transport import create_session
+
+logger = logging.getLogger(__name__)
+
+
+class Replica:
+    """
+    单个API副本：独立的会话（连接池）和健康状态
+    """
+
+    def __init__(self, base_url: str, session: requests.Session):
+        self.base_url = base_url
+        self.session = session
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+
+class ShardRouter:
+    """
+    副本路由与故障转移
+    """
+
+    def __init__(self, endpoints: List[str], server_config: Dict, config: Dict,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            endpoints: 副本地址列表
+            server_config: SERVER_CONFIG 配置字典（连接池大小等）
+            config: SHARDING_CONFIG 配置字典
+            headers: 每个会话的默认请求头
+        """
+        self.replicas = [Replica(url.rstrip('/'), create_session(server_config, headers)) for url in endpoints]
+        self.route_by = config.get('route_by', 'content')
+        self.failure_threshold = max(1, config.get('failure_threshold', 3))
+        self.cooldown = config.get('cooldown', 30)
+        self.failover_status = set(config.get('failover_status', [502, 503]))
+        self._lock = threading.Lock()
+
+    def shard_key(self, question: Dict) -> str:
+        """
+        题目的路由键：按科目或按题目内容
+        """
+        if self.route_by == 'subject':
+            return question.get('subject', '')
+        return question.get('content', '')
+
+    def candidates(self, key: str) -> List[Replica]:
+        """
+        按路由键给出副本的尝试顺序：健康的副本在前，各自按哈希权重排序
+        """
+        def weight(replica: Replica) -> bytes:
+            return hashlib.sha1(f"{replica.base_url}\n{key}".encode('utf-8')).digest()
+
+        ordered = sorted(self.replicas, key=weight, reverse=True)
+        return [r for r in ordered if r.healthy] + [r for r in ordered if not r.healthy]
+
+    def attempts(self, key: str) -> Iterator[Replica]:
+        """
+        一次请求依次尝试的副本：按 candidates 的顺序循环，每次重试换到下一个副本
+        """
+        return itertools.cycle(self.candidates(key))
+
+    def is_failover_status(self, status_code: int) -> bool:
+        """
+        该状态码是否说明副本本身不可用（应转移到其他副本）
+        """
+        return status_code in self.failover_status
+
+    def record(self, replica: Replica, success: bool) -> None:
+        """
+        记录一次请求结果，连续失败达到阈值时副本进入冷却期
+        """
+        with self._lock:
+            replica.requests += 1
+            if success:
+                replica.consecutive_failures = 0
+                return
+            replica.failures += 1
+            replica.consecutive_failures += 1
+            if replica.consecutive_failures >= self.failure_threshold and replica.healthy:
+                replica.unhealthy_until = time.monotonic() + self.cooldown
+                logger.warning(f"副本 {replica.base_url} 连续失败 {replica.consecutive_failures} 次，"
+                               f"暂停使用 {self.cooldown} 秒")
+
+    def send(self, replica: Replica, path: str,
+             request: Callable[[requests.Session, str], requests.Response]) -> requests.Response:
+        """
+        向指定副本发送一次请求并记录结果
+
+        是否转移到下一个副本由调用方的重试策略决定（见 UploadTransport.post）
+
+        Args:
+            replica: 目标副本（通常取自 attempts()）
+            path: 接口路径
+            request: request(session, url) 发送一次请求
+
+        Returns:
+            副本的响应；请求异常时记录失败后原样抛出
+        """
+        try:
+            response = request(replica.session, f"{replica.base_url}{path}")
+        except requests.RequestException as e:
+            self.record(replica, False)
+            logger.warning(f"副本 {replica.base_url} 请求失败: {e}")
+            raise
+        self.record(replica, not self.is_failover_status(response.status_code))
+        return response
+
+    def probe(self, path: str, timeout) -> int:
+        """
+        检查每个副本的健康接口，不可访问的副本立即进入冷却期
+
+        Returns:
+            健康的副本数量
+        """
+        healthy = 0
+        for replica in self.replicas:
+            try:
+                ok = replica.session.get(f"{replica.base_url}{path}", timeout=timeout).status_code == 200
+            except requests.RequestException:
+                ok = False
+            with self._lock:
+                if ok:
+                    replica.consecutive_failures = 0
+                    replica.unhealthy_until = 0.0
+                    healthy += 1
+                else:
+                    replica.unhealthy_until = time.monotonic() + self.cooldown
+        return healthy
+
+    def report(self) -> str:
+        """
+        每个副本的请求数、失败数和健康状态
+        """
+        lines = []
+        for replica in self.replicas:
+            status = "正常" if replica.healthy else "冷却中"
+            lines.append(f"   {replica.base_url}: {replica.requests} 次请求，{replica.failures} 次失败（{status}）")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        for replica in self.replicas:
+            replica.session.close()
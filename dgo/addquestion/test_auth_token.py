@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试认证token本地校验
+"""
+
+import base64
+import json
+import time
+
+from auth_token import check_token_locally, TokenValidator
+
+def make_token(payload: dict) -> str:
+    """构造未签名的测试JWT"""
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(payload)}.signature"
+
+def test_token_expiry_checked_locally():
+    """测试根据exp在本地判断，无法判断时才访问服务器并缓存结果"""
+    assert check_token_locally(make_token({'id': 'u1', 'exp': time.time() + 3600})) is True
+    assert check_token_locally(make_token({'id': 'u1', 'exp': time.time() - 1})) is False
+    assert check_token_locally(make_token({'id': 'u1'})) is None
+    assert check_token_locally('not-a-jwt') is None
+
+    probes = []
+    def probe():
+        probes.append(1)
+        return True
+
+    validator = TokenValidator(make_token({'id': 'u1', 'exp': time.time() + 3600}), 'http://localhost:5001', {})
+    assert validator.is_valid(probe) and not probes
+
+    validator = TokenValidator('not-a-jwt', 'http://localhost:5001', {'cache_file': None})
+    assert validator.is_valid(probe) and validator.is_valid(probe)
+    assert len(probes) == 1
+    print("✅ token本地校验正常")
+
+if __name__ == "__main__":
+    test_token_expiry_checked_locally()
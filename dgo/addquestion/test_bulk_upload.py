@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试批量上传的自适应分块大小
+"""
+
+import json
+import os
+import tempfile
+
+from bulk_upload import AdaptiveChunkSizer, ByteBudgetPacker, build_batch_body
+from config import BULK_UPLOAD_CONFIG
+from dead_letter import DeadLetterQueue
+from enhanced_example import EnhancedQuestionManager
+from fake_question_server import FakeQuestionServer
+
+CONFIG = {
+    "initial_chunk_size": 50,
+    "min_chunk_size": 1,
+    "max_chunk_size": 500,
+    "target_latency": 2.0,
+    "max_request_bytes": 1024 * 1024,
+    "smoothing": 1.0,
+}
+
+def test_chunk_size_follows_latency_and_bytes():
+    """测试分块大小受目标耗时和请求体大小共同限制"""
+    sizer = AdaptiveChunkSizer(CONFIG)
+    assert sizer.next_size() == 50
+
+    # 单题10ms、1KB：按耗时可到200道，但每次最多翻倍
+    assert sizer.record(50, 50 * 1024, 0.5) == 100
+    assert sizer.record(100, 100 * 1024, 1.0) == 200
+
+    # 单题变为20KB：按1MB上限只能放51道
+    assert sizer.record(200, 200 * 20 * 1024, 2.0) == 51
+    print("✅ 分块大小随耗时和字节数调整")
+
+def test_chunk_size_halves_on_failure():
+    """测试请求失败时分块大小减半且不低于下限"""
+    sizer = AdaptiveChunkSizer(CONFIG)
+    assert sizer.record(50, 0, 0, success=False) == 25
+    assert sizer.record(1, 0, 0, success=False) == 1
+    print("✅ 请求失败时分块大小减半")
+
+def test_byte_budget_packing():
+    """测试按字节预算打包，超大题目单独上传"""
+    packer = ByteBudgetPacker({"max_request_bytes": 1024 * 1024, "max_chunk_bytes": 1000, "oversize_item_bytes": 600})
+    # 纯文本题、SVG题、图片题混合
+    sizes = [100, 100, 400, 700, 100, 300, 300, 100]
+    regular, oversized = packer.split_oversized(sizes)
+    assert oversized == [3]
+
+    regular_sizes = [sizes[i] for i in regular]
+    chunks, start = [], 0
+    while start < len(regular_sizes):
+        count = packer.take(regular_sizes, start, max_items=3)
+        chunks.append(regular_sizes[start:start + count])
+        start += count
+    assert chunks == [[100, 100, 400], [100, 300, 300], [100]]
+
+    encoded = [json.dumps({"content": "题" * n}, ensure_ascii=False).encode('utf-8') for n in (10, 200, 200)]
+    body = build_batch_body(encoded)
+    assert json.loads(body)["questions"][1]["content"] == "题" * 200
+    assert packer.take([len(e) for e in encoded], 0, 10) == 2
+    print("✅ 按字节预算打包正常")
+
+def test_image_fields_reach_server_for_single_uploads():
+    """测试超大图片题和分块失败后逐道重试的图片题都带着 imageData/mimeType 发送到批量创建接口"""
+    large_image = "data:image/png;base64," + "A" * 4000
+    small_image = "data:image/png;base64," + "B" * 200
+    images = [large_image, small_image, small_image]
+    questions = [
+        {"content": f"看图回答第{i}题", "options": ["A. 1", "B. 2"], "correct_answer": "A",
+         "explanation": "略", "image_data": image, "mime_type": "image/png"}
+        for i, image in enumerate(images)
+    ]
+    # 第2道题在多题分块中写入失败，单独重试时成功
+    server = FakeQuestionServer(lambda path, question, count: count == 1 or "第2题" not in question["content"])
+
+    original_oversize = BULK_UPLOAD_CONFIG['oversize_item_bytes']
+    BULK_UPLOAD_CONFIG['oversize_item_bytes'] = 2000
+    with server, tempfile.TemporaryDirectory() as directory:
+        manager = EnhancedQuestionManager(server.url)
+        try:
+            manager.deduplicator = None
+            manager.dead_letters = DeadLetterQueue(os.path.join(directory, 'dead_letters.ndjson'))
+            results = manager.bulk_upload_questions("数学", questions, {})
+        finally:
+            BULK_UPLOAD_CONFIG['oversize_item_bytes'] = original_oversize
+            manager.close()
+
+    assert results == [True, True, True]
+    assert server.posted('/save-question') == []
+    single = [body["questions"][0] for body in server.posted('/api/question-bank/数学/batch')
+              if len(body["questions"]) == 1]
+    # 超过大小上限的第0题，以及分块中失败后单独重试的第2题
+    assert [question["content"] for question in single] == ["看图回答第0题", "看图回答第2题"]
+    assert single[0]["imageData"] == large_image and single[1]["imageData"] == small_image
+    assert all(question["mimeType"] == "image/png" for question in single)
+    print("✅ 单独上传的图片题保留图片字段")
+
+def upload_with_server(server, questions):
+    """用本地服务器运行 bulk_upload_questions，返回 (结果, 失败队列条目)"""
+    with server, tempfile.TemporaryDirectory() as directory:
+        manager = EnhancedQuestionManager(server.url)
+        try:
+            manager.deduplicator = None
+            manager.dead_letters = DeadLetterQueue(os.path.join(directory, 'dead_letters.ndjson'))
+            return manager.bulk_upload_questions("数学", questions, {}), manager.dead_letters.entries()
+        finally:
+            manager.close()
+
+def test_chunk_not_resent_when_outcome_unknown():
+    """测试分块写入后返回504时不逐道重发（避免重复创建），题目以结果未知写入失败队列"""
+    questions = [{"content": f"题目{i}", "options": ["A. 1", "B. 2"], "correct_answer": "A",
+                  "explanation": "略"} for i in range(5)]
+
+    server = FakeQuestionServer(batch_status=lambda count: 504)
+    results, dead_letters = upload_with_server(server, questions)
+    assert results == [False] * 5
+    assert len(server.created) == 5 and len(server.posted('/batch')) == 1
+    assert [entry['outcome'] for entry in dead_letters] == ['unknown'] * 5
+
+    # 413：服务器拒绝整块，逐道重发
+    server = FakeQuestionServer(batch_status=lambda count: 413 if count > 1 else 200)
+    results, dead_letters = upload_with_server(server, questions)
+    assert results == [True] * 5 and dead_letters == []
+    assert len(server.created) == 5
+    print("✅ 结果未知的分块不重发")
+
+if __name__ == "__main__":
+    test_chunk_size_follows_latency_and_bytes()
+    test_chunk_size_halves_on_failure()
+    test_byte_budget_packing()
+    test_image_fields_reach_server_for_single_uploads()
+    test_chunk_not_resent_when_outcome_unknown()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试自适应并发控制（AIMD）
+"""
+
+import time
+
+import requests
+
+from concurrency import AIMDLimiter
+
+CONFIG = {
+    "initial_limit": 1,
+    "min_limit": 1,
+    "max_limit": 8,
+    "target_p95_latency": 1.0,
+    "decrease_factor": 0.5,
+    "latency_window": 50,
+    "overload_status": [429, 503],
+}
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+def test_increase_on_success():
+    """测试并发上限被占满且延迟低于目标时加性增加"""
+    limiter = AIMDLimiter(CONFIG)
+    for _ in range(3):
+        assert limiter.call(lambda: FakeResponse(200)).status_code == 200
+    # 上限1被占满，增加到2；之后单线程调用占不满上限，不再增加
+    assert limiter.limit == 2
+    assert limiter.p95_latency < 1.0
+    print("✅ 请求成功时并发上限增加")
+
+def test_halve_on_overload_and_timeout():
+    """测试429和超时时并发上限减半，且不低于下限"""
+    limiter = AIMDLimiter(dict(CONFIG, initial_limit=8))
+    limiter.call(lambda: FakeResponse(429))
+    assert limiter.limit == 4
+
+    def timeout():
+        raise requests.ReadTimeout("读取超时")
+    time.sleep(0.11)  # 同一批请求同时失败只减少一次，间隔至少0.1秒
+    try:
+        limiter.call(timeout)
+        assert False, "应抛出 ReadTimeout"
+    except requests.ReadTimeout:
+        pass
+    assert limiter.limit == 2 and limiter.decreases == 2
+
+    # 紧接着的失败视为同一批，不再减少
+    limiter.call(lambda: FakeResponse(503))
+    assert limiter.limit == 2
+    print("✅ 过载或超时时并发上限减半")
+
+def test_effective_limit_clamped_to_workers():
+    """测试实际并发数不超过调用方线程数"""
+    limiter = AIMDLimiter(dict(CONFIG, initial_limit=6))
+    assert limiter.effective_limit(1) == 1
+    assert limiter.effective_limit(4) == 4
+    assert limiter.effective_limit(16) == 6
+    print("✅ 实际并发数受线程数限制")
+
+if __name__ == "__main__":
+    test_increase_on_success()
+    test_halve_on_overload_and_timeout()
+    test_effective_limit_clamped_to_workers()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试上传失败队列
+"""
+
+import os
+import tempfile
+
+from dead_letter import DeadLetterQueue
+from enhanced_example import EnhancedQuestionManager
+from fake_question_server import FakeQuestionServer
+
+def test_record_and_replay_cycle():
+    """测试写入、取出重放、再次失败重新写入和中断后恢复"""
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = DeadLetterQueue(os.path.join(tmp, 'dead', 'letters.ndjson'))
+        queue.record('/api/ai/save-question', {"question": {"content": "题目1"}}, "500", 3, 500, source='test')
+        queue.record('/api/ai/save-question', {"question": {"content": "题目2"}}, "连接被拒绝", 3)
+        with open(queue.path, 'a', encoding='utf-8') as f:
+            f.write('{"path": "/api/ai/sa')  # 模拟写了一半的行
+        assert len(queue) == 2
+
+        entries = queue.take_all()
+        assert [e['payload']['question']['content'] for e in entries] == ["题目1", "题目2"]
+        assert entries[0]['status'] == 500 and entries[1]['status'] is None
+        assert not os.path.exists(queue.path)
+
+        # 重放中断：.replaying 遗留，新的失败写入新队列，下次一并取出
+        queue.record('/api/ai/save-question', {"question": {"content": "题目3"}}, "超时", 1)
+        assert len(queue.take_all()) == 3
+
+        # 重放时题目2再次失败，累计尝试次数
+        queue.record('/api/ai/save-question', entries[1]['payload'], "连接被拒绝", entries[1]['attempts'] + 3)
+        queue.finish_replay()
+        remaining = queue.entries()
+        assert len(remaining) == 1 and remaining[0]['attempts'] == 6
+    print("✅ 失败队列正常")
+
+def test_manager_replays_dead_letters():
+    """测试 replay_dead_letters 按原接口重新提交，再次失败的累计尝试次数，不支持的接口原样放回"""
+    server = FakeQuestionServer(lambda path, question, count: question["content"] != "仍然失败")
+    with server, tempfile.TemporaryDirectory() as tmp:
+        manager = EnhancedQuestionManager(server.url)
+        try:
+            # 依赖服务器地址的组件都使用构造时传入的地址
+            assert manager.kp_resolver.base_url == manager.knowledge_point_cache.server_url == server.url
+            assert manager.deduplicator.base_url == server.url
+            manager.deduplicator = None
+            manager.dead_letters = DeadLetterQueue(os.path.join(tmp, 'dead_letters.ndjson'))
+            queue = manager.dead_letters
+            queue.record('/api/ai/save-question', {"question": {"content": "题目1"}}, "500", 3, 500)
+            queue.record('/api/question-bank/数学/batch',
+                         {"question": {"content": "仍然失败", "imageData": "data:,"}},
+                         "连接被拒绝", 2)
+            queue.record('/api/knowledge-points', {"name": "函数"}, "500", 1, 500)
+
+            assert manager.replay_dead_letters(max_workers=1) == (1, 2)
+        finally:
+            manager.close()
+
+        assert [body["question"]["content"] for body in server.posted('/api/ai/save-question')] == ["题目1"]
+        assert server.posted('/api/question-bank/数学/batch')[0]["questions"][0]["imageData"] == "data:,"
+        remaining = {entry['path']: entry for entry in queue.entries()}
+        assert set(remaining) == {'/api/question-bank/数学/batch', '/api/knowledge-points'}
+        assert remaining['/api/question-bank/数学/batch']['attempts'] == 3
+        assert not os.path.exists(queue.replaying_path)
+    print("✅ 失败队列重放正常")
+
+if __name__ == "__main__":
+    test_record_and_replay_cycle()
+    test_manager_replays_dead_letters()
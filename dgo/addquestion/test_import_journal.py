@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试导入日志（断点续传）
+"""
+
+import os
+import tempfile
+
+from import_journal import ImportJournal
+
+def test_content_hash_is_stable():
+    """测试内容哈希与字段顺序无关，随内容和范围变化"""
+    payload = {"question": {"content": "题目1", "options": ["A. 1", "B. 2"], "subject": "数学"}}
+    reordered = {"question": {"subject": "数学", "options": ["A. 1", "B. 2"], "content": "题目1"}}
+    key = ImportJournal.content_hash(payload, "http://localhost:5001")
+    assert key == ImportJournal.content_hash(reordered, "http://localhost:5001")
+    assert len(key) == 64
+    assert key != ImportJournal.content_hash(payload, "http://api-2:5001")
+    assert key != ImportJournal.content_hash({"question": {"content": "题目2", "subject": "数学"}},
+                                             "http://localhost:5001")
+    print("✅ 内容哈希稳定")
+
+def test_record_acknowledged_and_unacknowledged():
+    """测试只有服务器确认的题目会被跳过，成功记录不会被之后的失败覆盖"""
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = ImportJournal(os.path.join(tmp, 'journal', 'import.ndjson'))
+        journal.record('a', True, {'status': 200, 'questionId': 'q1'})
+        journal.record('b', False, {'status': 500, 'error': '服务器错误'})
+        journal.record('a', False, {'error': '超时'})
+        assert journal.is_acknowledged('a')
+        assert not journal.is_acknowledged('b')
+        assert journal.acknowledged_count == 1
+
+        reloaded = ImportJournal(journal.path)
+        assert reloaded.is_acknowledged('a') and not reloaded.is_acknowledged('b')
+    print("✅ 导入日志记录正常")
+
+def test_reload_after_truncated_last_line():
+    """测试进程中断时写了一半的最后一行被忽略，之后可以继续追加"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'import.ndjson')
+        journal = ImportJournal(path)
+        journal.record('a', True)
+        journal.record('b', True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"hash": "c", "ok": tr')  # 模拟写了一半的行
+
+        reloaded = ImportJournal(path)
+        assert reloaded.acknowledged_count == 2
+        assert not reloaded.is_acknowledged('c')
+
+        # 截断行之后继续追加，新记录不会与截断行拼在一起
+        reloaded.record('c', True)
+        assert ImportJournal(path).acknowledged_count == 3
+    print("✅ 截断的最后一行被忽略")
+
+if __name__ == "__main__":
+    test_content_hash_is_stable()
+    test_record_acknowledged_and_unacknowledged()
+    test_reload_after_truncated_last_line()
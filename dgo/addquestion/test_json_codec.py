@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试请求体JSON编码
+"""
+
+import json
+
+from json_codec import BACKENDS, get_codec
+
+def test_compact_utf8_encoding():
+    """测试各后端输出等价的紧凑UTF-8 JSON，中文不转义"""
+    payload = {"question": {"content": "已知 $\\sin\\alpha = \\frac{3}{5}$", "knowledgePoints": ["三角函数"],
+                            "figureProperties": {"ratio": 0.1, "scale": 1e-7}}}
+
+    # 浮点数的表示可能不同，只要求解析结果相同
+    for codec in BACKENDS.values():
+        body = codec.dumps(payload)
+        assert json.loads(body) == payload
+        assert b'\\u' not in body and b', ' not in body
+
+    body = get_codec('auto').dumps(payload)
+    assert '三角函数'.encode('utf-8') in body
+    assert b'\\u' not in body and b', ' not in body
+    assert len(body) < len(json.dumps(payload).encode('utf-8'))
+    assert get_codec('auto').loads(body) == payload
+    assert get_codec('missing-backend').name == 'json'
+    print(f"✅ JSON编码正常（可用后端: {', '.join(BACKENDS)}）")
+
+if __name__ == "__main__":
+    test_compact_utf8_encoding()
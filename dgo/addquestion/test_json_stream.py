@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试题库文件流式读取
+"""
+
+import json
+import os
+import tempfile
+
+from json_stream import iter_import_file, read_subject
+
+def read_all(text: str, suffix: str = '.json'):
+    """把 text 写入临时文件后完整读取"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"题库{suffix}")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return list(iter_import_file(path))
+
+def assert_malformed(text: str, suffix: str = '.json'):
+    try:
+        read_all(text, suffix)
+    except json.JSONDecodeError:
+        return
+    assert False, f"应拒绝格式错误的输入: {text}"
+
+def test_json_file():
+    """测试JSON文件按顺序读取字段、知识点和题目，大元素跨越缓冲区也能完整读取"""
+    image = "data:image/png;base64," + "A" * 200000
+    data = {
+        "subject": "数学",
+        "knowledge_points": [{"name": "函数"}],
+        "questions": [{"content": "题目1"}, {"content": "题目2", "imageData": image}],
+        "version": 2,
+    }
+    items = read_all(json.dumps(data, ensure_ascii=False, indent=2))
+    assert items == [
+        ('field', ('subject', '数学')),
+        ('knowledge_point', {"name": "函数"}),
+        ('question', {"content": "题目1"}),
+        ('question', {"content": "题目2", "imageData": image}),
+        ('field', ('version', 2)),
+    ]
+    assert read_all('{"questions": []}') == []
+    print("✅ JSON文件读取正常")
+
+def test_read_subject():
+    """测试只读取到科目字段为止，科目在题目之后时返回None"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, '题库.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"subject": "数学", "questions": [{"content": "题目1"}')  # 之后的内容不会被读取
+        assert read_subject(path) == "数学"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"questions": [{"content": "题目1"}], "subject": "数学"}')
+        assert read_subject(path) is None
+    print("✅ 读取科目正常")
+
+def test_ndjson_file():
+    """测试NDJSON文件按对象内容区分题目、知识点和文件级字段，跳过空行"""
+    lines = ['{"subject": "物理"}', '', '{"name": "力学"}', '{"content": "题目1"}']
+    assert read_all('\n'.join(lines) + '\n', '.ndjson') == [
+        ('field', ('subject', '物理')),
+        ('knowledge_point', {"name": "力学"}),
+        ('question', {"content": "题目1"}),
+    ]
+    print("✅ NDJSON文件读取正常")
+
+def test_malformed_and_truncated_input():
+    """测试缺少逗号、多余逗号、截断的文件都会报错"""
+    assert_malformed('{"questions": [{"content": "a"} {"content": "b"}]}')
+    assert_malformed('{"questions": [{"content": "a"},]}')
+    assert_malformed('{"subject": "数学" "questions": []}')
+    assert_malformed('{"subject": "数学",}')
+    assert_malformed('{"questions": [{"content": "a"}')
+    assert_malformed('{"questions": [{"content": "a"}]')
+    assert_malformed('{"content": "题目1"}\n{"content": "题目', '.ndjson')
+    print("✅ 格式错误和截断的文件被拒绝")
+
+if __name__ == "__main__":
+    test_json_file()
+    test_read_subject()
+    test_ndjson_file()
+    test_malformed_and_truncated_input()
@@ -5,7 +5,9 @@
 """
 
 import json
+
 from katex_formatter import format_math_content, validate_math_content
+from latex_lexer import match_groups, tokenize
 
 def test_katex_formatting():
     """测试KaTeX格式化功能"""
@@ -81,5 +83,51 @@ def test_katex_formatting():
     
     return True
 
+def test_token_rewrites():
+    """测试按记号转换：只改写相应的记号，不误改命令名、已有命令和文字参数"""
+    cases = {
+        r'$\dfrac12 + \frac\pi2$': r'$\frac{1}{2} + \frac{\pi}{2}$',
+        r'$\frac{a}2x$': r'$\frac{a}{2}x$',
+        r'$1/2 + a/b$': r'$\frac{1}{2} + \frac{a}{b}$',
+        r'$\pi/2 + 1/x^2$': r'$\pi/2 + 1/x^2$',
+        r'$x^10 + a_ij + x^2y$': r'$x^{10} + a_{ij} + x^2y$',
+        r'$sin x + \cos y + log_2 x$': r'$\sin x + \cos y + \log_2 x$',
+        r'$\\sin\alpha$': r'$\sin\alpha$',
+        # 环境中的 \\ 是换行，保留换行，sin 照常转换为命令
+        r'$\begin{aligned}x&=1\\sin x&=2\end{aligned}$': r'$\begin{aligned}x&=1\\\sin x&=2\end{aligned}$',
+        r'$\mathrm{km/h} + \text{sin}$': r'$\text{km/h} + \text{sin}$',
+        r'$a \displaystyle b\;x \, c$': r'$a b\quad x \: c$',
+        r'$\begin{align} \lbrace x \rbrace \end{align}$': r'$\begin{aligned} \{ x \} \end{aligned}$',
+        r'$C_5^2 = \frac{5!}{2!3!}$，$(0, +\infty)$': r'$C_5^2 = \frac{5!}{2!3!}$，$(0, +\infty)$',
+        r'$$a/b$$ 和 \(f(x)=x/2\)': r'$$\frac{a}{b}$$ 和 \(f(x)=\frac{x}{2}\)',
+    }
+    for text, expected in cases.items():
+        assert format_math_content(text) == expected, (text, format_math_content(text))
+
+    # 记号原文拼接即为原公式，花括号按嵌套配对
+    formula = r'\frac{a}{b^{2}} + \{x\}'
+    tokens = tokenize(formula)
+    assert ''.join(value for _, value in tokens) == formula
+    groups, depth = match_groups(tokens)
+    assert depth == 2 and tokens[groups[1]] == ('close', '}')
+
+def test_fixture_golden_output():
+    """测试 math_test_questions.json 全部字段的格式化结果与 math_test_questions.katex.json 逐字相同"""
+    with open('math_test_questions.json', 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with open('math_test_questions.katex.json', 'r', encoding='utf-8') as f:
+        golden = json.load(f)
+
+    fields = []
+    for question in data['questions']:
+        fields.append(question.get('content', ''))
+        fields.extend(question.get('options', []))
+        fields.append(question.get('explanation', ''))
+    assert len(fields) == len(golden)
+    for text, expected in zip(fields, golden):
+        assert format_math_content(text) == expected, (text, format_math_content(text))
+
 if __name__ == "__main__":
-    test_katex_formatting()
\ No newline at end of file
+    test_katex_formatting()
+    test_token_rewrites()
+    test_fixture_golden_output()
\ No newline at end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试知识点ID持久化缓存
+"""
+
+import os
+import tempfile
+
+import requests
+
+from fake_question_server import FakeQuestionServer
+from kp_cache import KnowledgePointCache
+from kp_resolver import KnowledgePointResolver
+
+class FakeResponse:
+    """模拟响应"""
+
+    def __init__(self, status_code: int, data: dict):
+        self.status_code = status_code
+        self._data = data
+
+    def json(self) -> dict:
+        return self._data
+
+class FakeSession:
+    """记录请求路径的模拟会话：列表接口只返回一个知识点，获取其他知识点时失败一个"""
+
+    def __init__(self):
+        self.paths = []
+
+    def get(self, url: str, params=None, timeout=None):
+        path = url.split('/api/knowledge-points/', 1)[1]
+        self.paths.append(path)
+        if path == 'list':
+            return FakeResponse(200, {'success': True, 'data': {params['subject']: [{'name': '三角函数'}]}})
+        return FakeResponse(500 if path == '坏知识点' else 200, {'success': path != '坏知识点'})
+
+def test_kp_cache_persistence():
+    """测试缓存跨实例持久化、按服务器隔离、过期和失效"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'knowledge_points.json')
+
+        cache = KnowledgePointCache(path, 'http://localhost:5001/', ttl=60)
+        cache['数学:三角函数'] = 'kp1'
+        cache['数学:数列'] = 'kp2'
+
+        # 新实例从文件读取
+        warm = KnowledgePointCache(path, 'http://localhost:5001', ttl=60)
+        assert warm['数学:三角函数'] == 'kp1'
+        assert len(warm) == 2
+
+        # 其他服务器看不到这些条目
+        other = KnowledgePointCache(path, 'http://localhost:5002', ttl=60)
+        assert '数学:三角函数' not in other
+
+        # 过期条目视为不存在
+        expired = KnowledgePointCache(path, 'http://localhost:5001', ttl=0)
+        assert expired.get('数学:数列') is None
+
+        warm.invalidate('数学:数列')
+        assert '数学:数列' not in KnowledgePointCache(path, 'http://localhost:5001', ttl=60)
+
+        warm.invalidate()
+        assert len(KnowledgePointCache(path, 'http://localhost:5001', ttl=60)) == 0
+        print("✅ 知识点缓存持久化正常")
+
+def test_kp_resolver_prefetch():
+    """测试解析器先预取列表，只并发获取缺失的知识点"""
+    session = FakeSession()
+    cache = KnowledgePointCache(None, 'http://localhost:5001', ttl=60)
+    resolver = KnowledgePointResolver(session, 'http://localhost:5001', 5, cache, max_workers=4)
+
+    resolved = resolver.resolve('数学', ['三角函数', '数列', '三角函数', '坏知识点'])
+    assert resolved == {'三角函数': '三角函数', '数列': '数列'}
+    assert session.paths[0] == 'list'
+    assert sorted(session.paths[1:]) == ['坏知识点', '数列']
+
+    # 再次解析时已知的知识点直接命中缓存，不再预取列表
+    session.paths.clear()
+    assert resolver.resolve('数学', ['数列', '三角函数']) == {'数列': '数列', '三角函数': '三角函数'}
+    assert session.paths == []
+    print("✅ 知识点预取和并发解析正常")
+
+def test_kp_resolver_against_server():
+    """测试解析器对本地服务器的请求：每个科目一次列表请求，只获取缺失的知识点，缓存命中后不再请求"""
+    existing = {'数学': ['三角函数', '数列'], '物理': ['牛顿第二定律']}
+    with FakeQuestionServer(knowledge_points=existing,
+                            kp_status=lambda name: 500 if name == '坏知识点' else 200) as server:
+        cache = KnowledgePointCache(None, server.url, ttl=60)
+        resolver = KnowledgePointResolver(requests.Session(), server.url, 5, cache, max_workers=4)
+
+        math = resolver.resolve('数学', ['三角函数', '导数', '数列', '导数', '坏知识点'])
+        physics = resolver.resolve('物理', ['牛顿第二定律', '动量守恒'])
+        # 同一科目再次出现缺失名称时不再预取列表
+        math.update(resolver.resolve('数学', ['概率']))
+
+        # 获取失败的知识点不在映射中
+        assert math == {'三角函数': '三角函数', '导数': '导数', '数列': '数列', '概率': '概率'}
+        assert physics == {'牛顿第二定律': '牛顿第二定律', '动量守恒': '动量守恒'}
+        assert server.fetched('/api/knowledge-points/list') == [
+            '/api/knowledge-points/list?subject=数学',
+            '/api/knowledge-points/list?subject=物理',
+        ]
+        # 只对预取后仍缺失的名称逐个请求，每个名称一次
+        fetched = [path for path in server.fetched('/api/knowledge-points/')
+                   if not path.startswith('/api/knowledge-points/list')]
+        assert sorted(fetched) == sorted([
+            '/api/knowledge-points/导数?subject=数学',
+            '/api/knowledge-points/坏知识点?subject=数学',
+            '/api/knowledge-points/动量守恒?subject=物理',
+            '/api/knowledge-points/概率?subject=数学',
+        ])
+
+        # 缓存已热时再次解析不发出任何请求
+        requests_before = len(server.requests)
+        assert resolver.resolve('数学', list(math)) == math
+        assert resolver.resolve('物理', list(physics)) == physics
+        assert len(server.requests) == requests_before
+    print("✅ 知识点解析对服务器的请求次数正常")
+
+if __name__ == "__main__":
+    test_kp_cache_persistence()
+    test_kp_resolver_prefetch()
+    test_kp_resolver_against_server()
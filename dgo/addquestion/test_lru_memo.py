@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试有界LRU记忆化和公式格式化缓存
+"""
+
+import threading
+
+from katex_formatter import clear_katex_cache, format_math_content, katex_cache_stats, validate_math_content
+from lru_memo import LRUMemo
+
+def test_lru_eviction_and_counters():
+    """测试超出上限时淘汰最久未使用的条目，命中和未命中分别计数，过长的参数不缓存"""
+    calls = []
+
+    def upper(text):
+        calls.append(text)
+        return text.upper()
+
+    memo = LRUMemo(upper, max_entries=2, max_key_length=5)
+    assert memo('a') == 'A' and memo('b') == 'B'
+    assert memo('a') == 'A'          # 命中，a 成为最近使用
+    memo('c')                        # 淘汰最久未使用的 b
+    memo('b')
+    assert calls == ['a', 'b', 'c', 'b']
+    memo('toolong')
+    memo('toolong')
+    stats = memo.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 6, 2)
+
+    memo.clear()
+    assert memo.stats()['hits'] == 0 and memo.stats()['size'] == 0
+
+def test_concurrent_calls():
+    """测试多个线程同时调用时结果正确、计数不丢失"""
+    memo = LRUMemo(lambda text: text * 2, max_entries=8)
+    keys = [str(i % 16) for i in range(400)]
+
+    def worker():
+        for key in keys:
+            assert memo(key) == key * 2
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = memo.stats()
+    assert stats['hits'] + stats['misses'] == 8 * len(keys)
+    assert stats['size'] <= 8
+
+def test_math_content_is_memoized():
+    """测试重复的内容只格式化和验证一次，返回的问题列表可以安全修改"""
+    clear_katex_cache()
+    for _ in range(3):
+        assert format_math_content('$\\dfrac12$') == '$\\frac{1}{2}$'
+        is_valid, issues = validate_math_content('$\\dfrac12$')
+        assert not is_valid
+        issues.clear()
+
+    stats = katex_cache_stats()
+    assert (stats['format']['hits'], stats['format']['misses']) == (2, 1)
+    assert (stats['validate']['hits'], stats['validate']['misses']) == (2, 1)
+    clear_katex_cache()
+
+if __name__ == "__main__":
+    test_lru_eviction_and_counters()
+    test_concurrent_calls()
+    test_math_content_is_memoized()
+    print("✅ LRU缓存测试通过")
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试上传演练的请求体统计
+"""
+
+from json_codec import get_codec
+from payload_profiler import PayloadProfiler
+
+def test_field_bytes_and_projection():
+    """测试按字段统计字节数并估算上传耗时"""
+    codec = get_codec('json')
+    profiler = PayloadProfiler(codec, top_n=1)
+    text = {"question": {"content": "题目", "options": ["A. 1", "B. 2"], "explanation": "略"}}
+    figure = {"question": {"content": "如图", "explanation": "略", "svgData": "<svg>" + "x" * 1000 + "</svg>"}}
+
+    body = profiler.measure(text)
+    assert body == codec.dumps(text)
+    profiler.measure(figure, codec.dumps(figure))
+
+    assert profiler.count == 2
+    assert profiler.total_bytes == len(body) + len(codec.dumps(figure))
+    assert profiler.field_bytes['svgData'] == 1013
+    assert profiler.field_bytes['options'] == len(codec.dumps(["A. 1", "B. 2"]))
+    assert profiler.largest[0][1] == "如图"
+
+    # 2道题目、往返100ms、并发2：延迟部分0.1秒；1Mbps带宽再加传输时间
+    assert abs(profiler.projected_upload_seconds(0.1, 2) - 0.1) < 1e-9
+    transfer = profiler.total_bytes * 8 / 1_000_000
+    assert abs(profiler.projected_upload_seconds(0.1, 2, 1) - (0.1 + transfer)) < 1e-9
+    assert "svgData" in profiler.report(0.1, 2)
+    print("✅ 请求体统计正常")
+
+if __name__ == "__main__":
+    test_field_bytes_and_projection()
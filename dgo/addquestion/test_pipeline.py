@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试分阶段流水线
+"""
+
+from pipeline import Pipeline, Stage
+
+def square(value: int) -> int:
+    """进程池阶段使用的模块级函数"""
+    return value * value
+
+def test_pipeline_runs_all_stages():
+    """测试所有条目依次经过各阶段，失败的条目被丢弃并计数"""
+    def check(value: int) -> int:
+        if value == 49:
+            raise ValueError("模拟失败")
+        return value + 1
+
+    pipeline = Pipeline([
+        Stage("平方", square, workers=2, use_process=True),
+        Stage("检查", check, workers=3),
+    ], queue_size=2)
+    results = pipeline.run(iter(range(10)))
+
+    assert sorted(results) == [value * value + 1 for value in range(10) if value != 7]
+    assert pipeline.stats["平方"].processed == 10
+    assert pipeline.stats["检查"].failed == 1
+    assert pipeline.stats["检查"].max_queue_depth <= 2
+    print(pipeline.report())
+    print("✅ 流水线处理完成")
+
+if __name__ == "__main__":
+    test_pipeline_runs_all_stages()
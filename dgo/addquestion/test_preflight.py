@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试启动预检的并发执行和结果缓存
+"""
+
+import os
+import tempfile
+import time
+
+from preflight import Preflight, PreflightCache
+
+def test_checks_run_concurrently_and_only_successes_are_cached():
+    """测试各检查同时执行，成功结果跨运行缓存，失败和不可缓存的检查每次重新执行"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'preflight.json')
+        calls = []
+
+        def check(name, result):
+            def run():
+                calls.append(name)
+                time.sleep(0.2)
+                return result
+            return run
+
+        def build():
+            preflight = Preflight(PreflightCache(path, "http://localhost:5001/", 60))
+            preflight.add('server', check('server', True))
+            preflight.add('token', check('token', True), cacheable=False)
+            preflight.add('kp:数学', check('kp:数学', False))
+            return preflight
+
+        started = time.perf_counter()
+        results, cached = build().run()
+        assert time.perf_counter() - started < 0.5
+        assert results == {'server': True, 'token': True, 'kp:数学': False}
+        assert cached == []
+
+        calls.clear()
+        results, cached = build().run()
+        assert cached == ['server']
+        assert sorted(calls) == ['kp:数学', 'token']
+        assert results['server'] and not results['kp:数学']
+
+        # 其他服务器地址不共用缓存，过期后重新检查
+        assert PreflightCache(path, "http://other:5001", 60).fresh() == {}
+        assert PreflightCache(path, "http://localhost:5001", 0).fresh() == {}
+
+if __name__ == "__main__":
+    test_checks_run_concurrently_and_only_successes_are_cached()
+    print("✅ 预检测试通过")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试按内容哈希去重
+"""
+
+import os
+import tempfile
+
+from question_dedup import QuestionDeduplicator, normalize_content, question_hash
+
+class FakeResponse:
+    def __init__(self, data):
+        self.status_code = 200
+        self._data = data
+
+    def json(self):
+        return self._data
+
+class FakeSession:
+    """按创建时间从新到旧、以游标分页返回题库中的题目（游标为上一页最后一道题的创建时间）"""
+
+    def __init__(self, questions):
+        self.questions = questions
+        self.pages = []
+
+    def get(self, url, params=None, timeout=None):
+        self.pages.append(params['cursor'])
+        assert 'createdAt' in params['fields'].split(',')
+        ordered = sorted(self.questions, key=lambda q: q['createdAt'], reverse=True)
+        if params['cursor']:
+            ordered = [q for q in ordered if q['createdAt'] < params['cursor']]
+        page = ordered[:params['limit']]
+        has_next = len(ordered) > params['limit']
+        return FakeResponse({'data': {'questions': page,
+                                      'pagination': {'hasNext': has_next,
+                                                     'nextCursor': page[-1]['createdAt'] if has_next else None}}})
+
+def bank_question(i):
+    return {'subject': '数学', 'content': f'题目{i}', 'createdAt': f'2025-01-01T00:00:{i:02d}.000Z'}
+
+def test_normalized_hash():
+    """测试空白和全角字符不影响哈希"""
+    assert normalize_content(" 已知 $x＋1$\n") == "已知$x+1$"
+    assert question_hash({'subject': '数学', 'content': '已知 x＋1'}) == question_hash({'subject': '数学', 'content': '已知x+1'})
+    assert question_hash({'subject': '数学', 'content': '已知x+1'}) != question_hash({'subject': '物理', 'content': '已知x+1'})
+
+    # 题干相同、选项/答案/图片不同的题目不是重复题目
+    base = {'subject': '数学', 'content': '如图，求x', 'options': ['A. 1', 'B. 2'], 'correctAnswer': 'A'}
+    assert question_hash(base) == question_hash(dict(base, options=[{'label': 'A', 'content': '1'},
+                                                                   {'label': 'B', 'content': '2'}]))
+    assert question_hash(base) != question_hash(dict(base, options=['A. 1', 'B. 3']))
+    assert question_hash(base) != question_hash(dict(base, correctAnswer='B'))
+    assert question_hash(dict(base, svgData='<svg>1</svg>')) != question_hash(dict(base, svgData='<svg>2</svg>'))
+    assert question_hash(dict(base, imageData='data:a')) != question_hash(base)
+    print("✅ 内容哈希规范化正常")
+
+def test_sync_and_reserve():
+    """测试从服务器增量同步哈希、跳过重复题目并持久化"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {'dir': tmp, 'page_size': 2, 'sync': True}
+        session = FakeSession([bank_question(i) for i in range(5)])
+        dedup = QuestionDeduplicator(session, 'http://localhost:5001', 5, config)
+
+        assert not dedup.reserve({'subject': '数学', 'content': '题目 3'})
+        assert session.pages == ['', bank_question(3)['createdAt'], bank_question(1)['createdAt']]
+        new_question = {'subject': '数学', 'content': '新题目'}
+        assert dedup.reserve(new_question)
+        assert not dedup.reserve(new_question)  # 正在上传的相同题目
+        dedup.commit(new_question)
+
+        # 重新运行：只读取上次同步之后新增的题目
+        session.questions.append(bank_question(9))
+        session.pages.clear()
+        dedup = QuestionDeduplicator(session, 'http://localhost:5001', 5, config)
+        assert not dedup.reserve(new_question)
+        assert not dedup.reserve({'subject': '数学', 'content': '题目9'})
+        assert session.pages == ['']
+        assert len(dedup.index('数学')) == 7
+
+        bin_file = [name for name in os.listdir(tmp) if name.endswith('.bin')][0]
+        assert os.path.getsize(os.path.join(tmp, bin_file)) == 7 * 8
+    print("✅ 题库哈希同步和去重正常")
+
+def test_shards_share_index_files():
+    """测试多个分片进程共用哈希文件：后同步的进程只读取增量，同步进度不会倒退"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {'dir': tmp, 'page_size': 2, 'sync': True}
+        session = FakeSession([bank_question(i) for i in range(5)])
+        first = QuestionDeduplicator(session, 'http://localhost:5001', 5, config)
+        second = QuestionDeduplicator(session, 'http://localhost:5001', 5, config)
+
+        first.index('数学')
+        session.pages.clear()
+        index = second.index('数学')
+        assert session.pages == [''] and len(index) == 5
+
+        first.commit({'subject': '数学', 'content': '分片1的新题目'})
+        index.reload()
+        assert len(index) == 6
+
+        newest = index.synced_until
+        index.set_synced_until(bank_question(0)['createdAt'])
+        assert index.synced_until == newest
+    print("✅ 分片进程共用哈希文件")
+
+if __name__ == "__main__":
+    test_normalized_hash()
+    test_sync_and_reserve()
+    test_shards_share_index_files()
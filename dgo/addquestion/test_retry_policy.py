@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试上传重试策略和熔断器
+"""
+
+import random
+import threading
+import time
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from retry_policy import RetryPolicy, CircuitBreaker, request_not_sent
+from generate_advanced_geometry import CATEGORY_GENERATORS, generate_question_task
+
+class FakeResponse:
+    """只包含状态码和响应头的模拟响应"""
+
+    def __init__(self, status_code: int, headers: dict = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+def test_retry_on_transient_status():
+    """测试临时性失败会重试，4xx直接返回"""
+    policy = RetryPolicy({"max_retries": 3, "base_delay": 0.001})
+
+    statuses = iter([503, 429, 200])
+    assert policy.execute(lambda: FakeResponse(next(statuses))).status_code == 200
+    assert policy.retries == 2
+
+    statuses = iter([400, 200])
+    assert policy.execute(lambda: FakeResponse(next(statuses))).status_code == 400
+    assert policy.retries == 2
+
+    # 重试次数耗尽后返回最后一次响应
+    assert policy.execute(lambda: FakeResponse(502)).status_code == 502
+    assert policy.retries == 5
+    print("✅ 重试策略区分临时性和永久性失败")
+
+def test_non_idempotent_retries_only_unprocessed():
+    """测试非幂等请求只在服务器确定没有处理时重试"""
+    policy = RetryPolicy({"max_retries": 3, "base_delay": 0.001})
+
+    # 500、不带 Retry-After 的503：服务器可能已写入，不重试
+    for status in (500, 503):
+        calls = []
+        response = policy.execute(lambda: calls.append(1) or FakeResponse(status), idempotent=False)
+        assert response.status_code == status and len(calls) == 1
+
+    # 429、带 Retry-After 的503：服务器没有处理，重试
+    responses = iter([FakeResponse(429), FakeResponse(503, {"Retry-After": "0"}), FakeResponse(200)])
+    assert policy.execute(lambda: next(responses), idempotent=False).status_code == 200
+
+    # 读取超时：请求可能已经被处理，不重试
+    calls = []
+    def read_timeout():
+        calls.append(1)
+        raise requests.ReadTimeout("read timed out")
+    try:
+        policy.execute(read_timeout, idempotent=False)
+        assert False, "应抛出 ReadTimeout"
+    except requests.ReadTimeout:
+        assert len(calls) == 1
+
+    # 连接被拒绝、连接超时：请求没有发出，重试
+    refused = requests.ConnectionError(MaxRetryError(None, "/", NewConnectionError(None, "refused")))
+    assert request_not_sent(refused)
+    assert request_not_sent(requests.ConnectTimeout("connect timed out"))
+    assert not request_not_sent(requests.ConnectionError("connection reset"))
+    errors = [refused, requests.ConnectTimeout("connect timed out")]
+    def flaky():
+        if errors:
+            raise errors.pop(0)
+        return FakeResponse(200)
+    assert policy.execute(flaky, idempotent=False).status_code == 200
+    print("✅ 非幂等请求只重发服务器没有处理的请求")
+
+def test_circuit_breaker_pauses():
+    """测试错误率过高时熔断器暂停请求"""
+    breaker = CircuitBreaker({
+        "breaker_window": 4,
+        "breaker_error_rate": 0.5,
+        "breaker_min_requests": 4,
+        "breaker_cooldown": 0.05,
+    })
+    for success in (True, False, True, False):
+        breaker.record(success)
+    assert breaker.is_open and breaker.trips == 1
+
+    started = time.monotonic()
+    breaker.wait_until_closed()
+    assert time.monotonic() - started >= 0.04
+    assert not breaker.is_open
+    print("✅ 熔断器在错误率过高时暂停")
+
+def test_backoff_does_not_change_generated_questions():
+    """测试上传重试的退避抖动不影响全局随机状态和按种子生成的题目"""
+    policy = RetryPolicy({"max_retries": 3, "base_delay": 0.001})
+    state = random.getstate()
+    for attempt in range(5):
+        policy.backoff(attempt)
+    assert random.getstate() == state
+
+    tasks = [(category, seed) for category in CATEGORY_GENERATORS for seed in (1, 2)]
+    expected = [generate_question_task(task) for task in tasks]
+
+    # 生成的同时在其他线程中重试并修改全局随机状态，结果应保持不变
+    stop = threading.Event()
+
+    def jitter():
+        while not stop.is_set():
+            policy.backoff(2)
+            random.random()
+
+    threads = [threading.Thread(target=jitter) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(3):
+            assert [generate_question_task(task) for task in tasks] == expected
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    print("✅ 退避抖动不影响按种子生成的题目")
+
+if __name__ == "__main__":
+    test_retry_on_transient_status()
+    test_non_idempotent_retries_only_unprocessed()
+    test_circuit_breaker_pauses()
+    test_backoff_does_not_change_generated_questions()
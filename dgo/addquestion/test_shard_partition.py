@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试按内容哈希划分题目分片
+"""
+
+from shard_partition import in_shard, parse_shard
+
+def test_parse_shard():
+    """测试分片参数解析（序号从1开始）"""
+    assert parse_shard("1/4") == (0, 4)
+    assert parse_shard("4/4") == (3, 4)
+    for spec in ("0/4", "5/4", "1/0", "abc", "1/2/3"):
+        try:
+            parse_shard(spec)
+        except ValueError:
+            continue
+        raise AssertionError(f"应拒绝分片参数: {spec}")
+
+def test_shards_cover_input_without_overlap():
+    """测试各分片互不重叠、合起来覆盖全部题目，且同一题目的空白差异不影响分片"""
+    questions = [{"content": f"求方程 x^2 - {i}x = 0 的解"} for i in range(200)]
+    shards = [(index, 4) for index in range(4)]
+    owners = [[shard for shard in shards if in_shard(q, shard, "数学")] for q in questions]
+    assert all(len(owner) == 1 for owner in owners)
+    assert all(sum(1 for owner in owners if owner[0] == shard) > 20 for shard in shards)
+
+    # 与去重相同的规范化：全角、空白不同的同一道题目落在同一分片
+    variant = {"content": "求方程　x^2-3x=0 的解"}
+    assert in_shard(variant, owners[3][0], "数学")
+    assert in_shard(questions[0], None)
+
+if __name__ == "__main__":
+    test_parse_shard()
+    test_shards_cover_input_without_overlap()
+    print("✅ 分片测试通过")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试多服务器分片路由与故障转移
+"""
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from retry_policy import RetryPolicy
+from sharding import ShardRouter
+from upload_transport import UploadTransport
+
+CONFIG = {"route_by": "content", "failure_threshold": 2, "cooldown": 60, "failover_status": [503]}
+ENDPOINTS = ["http://api-1:5001", "http://api-2:5001", "http://api-3:5001"]
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+def send_with_failover(router, policy, key, request):
+    """与 UploadTransport.post 相同：每次重试发给下一个副本"""
+    replicas = router.attempts(key)
+    return policy.execute(lambda: router.send(next(replicas), "/api/ai/save-question", request),
+                          idempotent=False, resend_status=router.failover_status)
+
+def test_routing_is_stable_and_spread():
+    """测试同一题目总是路由到同一副本，不同题目分散到各副本"""
+    router = ShardRouter(ENDPOINTS, {}, CONFIG)
+    first = {f"题目{i}": router.candidates(f"题目{i}")[0].base_url for i in range(60)}
+    assert first == {f"题目{i}": router.candidates(f"题目{i}")[0].base_url for i in range(60)}
+    assert set(first.values()) == set(ENDPOINTS)
+    router.close()
+    print("✅ 路由稳定且分散")
+
+def test_failover_to_next_replica():
+    """测试副本连接失败或返回503时转移到下一个副本，连续失败后进入冷却期"""
+    router = ShardRouter(ENDPOINTS, {}, CONFIG)
+    policy = RetryPolicy({"max_retries": 3, "base_delay": 0.001})
+    down = router.candidates("题目")[0].base_url
+    overloaded = router.candidates("题目")[1].base_url
+
+    def request(session, url):
+        if url.startswith(down):
+            raise requests.ConnectionError(MaxRetryError(None, url, NewConnectionError(None, "连接被拒绝")))
+        return FakeResponse(503 if url.startswith(overloaded) else 200)
+
+    for _ in range(2):
+        assert send_with_failover(router, policy, "题目", request).status_code == 200
+    assert [r.base_url for r in router.candidates("题目")][-2:] == [down, overloaded]
+    assert all(r.requests == 2 for r in router.replicas)
+    router.close()
+    print("✅ 故障转移正常")
+
+def test_no_failover_after_request_reached_replica():
+    """测试读取超时和504不转移（副本可能已写入），且转移次数受重试次数限制"""
+    router = ShardRouter(ENDPOINTS, {}, CONFIG)
+    policy = RetryPolicy({"max_retries": 1, "base_delay": 0.001})
+    sent = []
+
+    def read_timeout(session, url):
+        sent.append(url)
+        raise requests.ReadTimeout("读取超时")
+    try:
+        send_with_failover(router, policy, "题目", read_timeout)
+        assert False, "应抛出 ReadTimeout"
+    except requests.ReadTimeout:
+        assert len(sent) == 1
+
+    sent.clear()
+    def gateway_timeout(session, url):
+        sent.append(url)
+        return FakeResponse(504)
+    assert send_with_failover(router, policy, "题目", gateway_timeout).status_code == 504
+    assert len(sent) == 1
+
+    # 三个副本都不可用时，一次重试只转移一次，共发送两次
+    sent.clear()
+    def overloaded(session, url):
+        sent.append(url)
+        return FakeResponse(503)
+    assert send_with_failover(router, policy, "题目", overloaded).status_code == 503
+    assert len(sent) == 2 and sent[0] != sent[1]
+    router.close()
+    print("✅ 请求到达副本后不转移，转移次数受重试次数限制")
+
+def test_transport_routes_only_for_cluster_base_url():
+    """测试只有 base_url 属于配置的集群时才按副本路由"""
+    sharding = dict(CONFIG, endpoints=ENDPOINTS)
+    for base_url, routed in (("http://api-2:5001/", True), ("http://other-host:3000", False)):
+        transport = UploadTransport(base_url, sharding=sharding)
+        assert (transport.router is not None) == routed
+        transport.close()
+    transport = UploadTransport("http://api-2:5001", sharding={"endpoints": []})
+    assert transport.router is None
+    transport.close()
+    print("✅ 只对配置的集群按副本路由")
+
+if __name__ == "__main__":
+    test_routing_is_stable_and_spread()
+    test_failover_to_next_replica()
+    test_no_failover_after_request_reached_replica()
+    test_transport_routes_only_for_cluster_base_url()
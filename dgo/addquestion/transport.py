@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP传输层
+
+为题目管理工具提供带连接池、长连接复用的 requests.Session，
+避免每道题目都重新建立TCP连接；较大的请求体（SVG、base64图片）可选gzip压缩。
+"""
+
+import gzip
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import COMPRESSION_CONFIG
+from json_codec import JSONCodec, get_codec
+
+
+def _counting_pool_class(base_class, on_new_connection):
+    """
+    生成在新建连接时回调计数的连接池类
+    """
+    class CountingConnectionPool(base_class):
+        def _new_conn(self):
+            on_new_connection()
+            return super()._new_conn()
+
+    return CountingConnectionPool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    带统计功能的连接池适配器
+
+    记录发送的请求数和新建的连接数，二者之差即为复用的连接次数
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._stats_lock = threading.Lock()
+        self.requests_sent = 0
+        self.connections_opened = 0
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _counting_pool_class(HTTPConnectionPool, self._record_new_connection),
+            'https': _counting_pool_class(HTTPSConnectionPool, self._record_new_connection),
+        }
+
+    def _record_new_connection(self):
+        with self._stats_lock:
+            self.connections_opened += 1
+
+    def send(self, request, **kwargs):
+        with self._stats_lock:
+            self.requests_sent += 1
+        return super().send(request, **kwargs)
+
+    @property
+    def connections_reused(self) -> int:
+        """复用已有连接的请求次数"""
+        with self._stats_lock:
+            return max(0, self.requests_sent - self.connections_opened)
+
+
+def create_session(server_config: Dict, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    根据服务器配置创建带连接池的会话
+
+    Args:
+        server_config: SERVER_CONFIG 配置字典
+        headers: 会话默认请求头，值为None的项会被忽略
+
+    Returns:
+        配置好的 requests.Session
+    """
+    session = requests.Session()
+    # 禁用代理以避免503错误
+    session.trust_env = False
+
+    adapter = PooledHTTPAdapter(
+        pool_connections=server_config.get('pool_connections', 4),
+        pool_maxsize=server_config.get('pool_maxsize', 16),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    if headers:
+        session.headers.update({k: v for k, v in headers.items() if v is not None})
+    session.headers['Connection'] = 'keep-alive' if server_config.get('keep_alive', True) else 'close'
+
+    return session
+
+
+def get_timeout(server_config: Dict):
+    """
+    获取 (连接超时, 读取超时) 元组
+    """
+    read_timeout = server_config.get('read_timeout', server_config.get('timeout', 30))
+    return (server_config.get('connect_timeout', read_timeout), read_timeout)
+
+
+def connections_reused(session: requests.Session) -> int:
+    """
+    统计会话中复用连接的请求次数
+    """
+    adapters = {id(a): a for a in session.adapters.values() if isinstance(a, PooledHTTPAdapter)}
+    return sum(adapter.connections_reused for adapter in adapters.values())
+
+
+def encode_json_body(payload: Any, codec: Optional[JSONCodec] = None) -> bytes:
+    """
+    把请求体编码为紧凑的UTF-8 JSON（中文不转义，比 requests 默认的 \\uXXXX 短一半）
+    """
+    return (codec or get_codec()).dumps(payload)
+
+
+def compress_body(body: bytes, config: Dict) -> Tuple[bytes, Dict[str, str]]:
+    """
+    按配置gzip压缩请求体
+
+    Args:
+        body: 原始请求体
+        config: COMPRESSION_CONFIG 配置字典
+
+    Returns:
+        (请求体, 需要附加的请求头)；未启用、小于阈值或压缩后没有变小时原样返回
+    """
+    if not config.get('enabled') or len(body) < config.get('min_size', COMPRESSION_CONFIG['min_size']):
+        return body, {}
+    compressed = gzip.compress(body, compresslevel=config.get('level', 6))
+    if len(compressed) >= len(body):
+        return body, {}
+    return compressed, {'Content-Encoding': 'gzip'}
+
+
+def prepare_request_body(kwargs: Dict, config: Dict, codec: Optional[JSONCodec] = None) -> Dict:
+    """
+    改写 requests 的请求参数：json= 预先编码为紧凑的UTF-8字节，并按压缩配置压缩
+
+    已压缩时在 headers 中加上 Content-Encoding
+    """
+    kwargs = dict(kwargs)
+    if 'json' in kwargs:
+        kwargs['data'] = encode_json_body(kwargs.pop('json'), codec)
+        kwargs['headers'] = {**(kwargs.get('headers') or {}), 'Content-Type': 'application/json'}
+    if config.get('enabled') and isinstance(kwargs.get('data'), bytes):
+        kwargs['data'], extra_headers = compress_body(kwargs['data'], config)
+        if extra_headers:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **extra_headers}
+    return kwargs
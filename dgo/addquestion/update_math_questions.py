@@ -9,15 +9,20 @@
 
 import json
 import os
-from katex_formatter import format_math_content, validate_math_content
+from typing import Optional
+from katex_formatter import format_math_content, katex_cache_report, validate_math_content
 
-def update_math_questions():
+def update_math_questions(input_file: str = 'math_test_questions.json', replace: Optional[bool] = None) -> bool:
     """
     更新数学题目文件中的公式格式
+    
+    Args:
+        input_file: 题目文件路径，格式化结果写入 <文件名>_katex.json，备份写入 <文件名>_backup.json
+        replace: 是否用格式化后的文件替换原文件，None表示询问用户
     """
-    input_file = 'math_test_questions.json'
-    output_file = 'math_test_questions_katex.json'
-    backup_file = 'math_test_questions_backup.json'
+    stem = os.path.splitext(input_file)[0]
+    output_file = f"{stem}_katex.json"
+    backup_file = f"{stem}_backup.json"
     
     print("=== 数学题目KaTeX格式化工具 ===")
     
@@ -106,6 +111,7 @@ def update_math_questions():
         print(f"\n✅ 格式化完成！")
         print(f"   📊 总共更新了 {updated_count} 个字段")
         print(f"   💾 输出文件: {output_file}")
+        print(f"   🧮 {katex_cache_report()}")
         
         # 显示验证结果
         if validation_issues:
@@ -116,9 +122,10 @@ def update_math_questions():
             print("\n✅ 所有公式都符合KaTeX标准！")
         
         # 询问是否替换原文件
-        replace_original = input("\n是否用格式化后的文件替换原文件？(y/N): ").lower().strip()
-        if replace_original == 'y':
-            os.rename(output_file, input_file)
+        if replace is None:
+            replace = input("\n是否用格式化后的文件替换原文件？(y/N): ").lower().strip() == 'y'
+        if replace:
+            os.replace(output_file, input_file)
             print(f"✅ 已替换原文件: {input_file}")
             print(f"   备份文件保存为: {backup_file}")
         else:
@@ -134,11 +141,10 @@ def update_math_questions():
         print(f"❌ 处理过程中发生错误: {e}")
         return False
 
-def preview_changes():
+def preview_changes(input_file: str = 'math_test_questions.json'):
     """
     预览格式化变更，不实际修改文件
     """
-    input_file = 'math_test_questions.json'
     
     print("=== 预览KaTeX格式化变更 ===")
     
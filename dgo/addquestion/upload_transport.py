@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+上传传输核心
+
+所有导入入口（EnhancedQuestionManager、StudyQuestionManager、add_math_test_questions.py、
+几何题生成脚本）都通过同一个 UploadTransport 发送请求，统一获得：
+带连接池的长连接会话和认证请求头、紧凑UTF-8 JSON编码、可选gzip压缩、
+重试与熔断、自适应并发、多副本路由，以及请求体大小和连接复用统计。
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from config import (
+    SERVER_CONFIG, UPLOAD_CONFIG, RETRY_CONFIG, ADAPTIVE_CONCURRENCY_CONFIG,
+    COMPRESSION_CONFIG, SHARDING_CONFIG
+)
+from concurrency import AIMDLimiter
+from json_codec import get_codec
+from retry_policy import create_retry_policy
+from sharding import ShardRouter
+from transport import create_session, get_timeout, connections_reused, prepare_request_body
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTransport:
+    """
+    共用的上传传输层
+    """
+
+    def __init__(self, base_url: str, headers: Optional[Dict[str, Optional[str]]] = None,
+                 compression: Optional[Dict] = None, sharding: Optional[Dict] = None,
+                 retry: Optional[Dict] = None):
+        """
+        Args:
+            base_url: API服务器地址
+            headers: 会话默认请求头（含认证信息），值为None的项会被忽略
+            compression: 压缩配置，默认使用 COMPRESSION_CONFIG
+            sharding: 多副本配置，默认使用 SHARDING_CONFIG；
+                      只有 base_url 属于配置的集群（SERVER_CONFIG 的地址或某个副本）时才按副本路由
+            retry: 重试配置，默认使用 RETRY_CONFIG
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = get_timeout(SERVER_CONFIG)
+        self.compression = COMPRESSION_CONFIG if compression is None else compression
+        sharding = SHARDING_CONFIG if sharding is None else sharding
+
+        # 所有请求共用一个带连接池的会话，复用TCP连接
+        self.session = create_session(SERVER_CONFIG, headers)
+
+        # 配置了多个API副本且 base_url 指向该集群时，上传请求按题目路由到各副本（各自独立的连接池）；
+        # 调用方指定了其他服务器时只发往该服务器
+        self.router = None
+        endpoints = sharding.get('endpoints') or []
+        cluster = {url.rstrip('/') for url in [SERVER_CONFIG['base_url'], *endpoints]}
+        if endpoints and self.base_url in cluster:
+            self.router = ShardRouter(endpoints, SERVER_CONFIG, sharding, headers)
+
+        # 请求体预先编码为紧凑的UTF-8 JSON，并统计每道题目的请求体大小
+        self.codec = get_codec(UPLOAD_CONFIG['json_backend'])
+        self._serialized_lock = threading.Lock()
+        self.serialized_bytes = 0
+        self.serialized_questions = 0
+
+        # 上传请求的重试策略（指数退避 + 熔断）
+        self.retry_policy = create_retry_policy(RETRY_CONFIG if retry is None else retry)
+
+        # 自适应并发控制，未启用时并发数由调用方的线程数决定
+        self.concurrency = AIMDLimiter(ADAPTIVE_CONCURRENCY_CONFIG) if ADAPTIVE_CONCURRENCY_CONFIG['enabled'] else None
+
+    def post(self, path: str, item_count: int = 1, shard_key: str = '', **kwargs) -> requests.Response:
+        """
+        发送上传请求：经过自适应并发限制，并按重试策略重试
+
+        上传请求会创建题目，不是幂等的：只在服务器确定没有处理时重发（见 retry_policy）
+
+        json= 请求体由 self.codec 编码为紧凑的UTF-8字节；
+        启用压缩时较大的请求体会被gzip压缩；
+        配置了多个副本时按 shard_key 路由，连接失败或副本返回502/503时，
+        下一次重试发给下一个副本（转移次数计入重试次数）
+
+        Args:
+            path: 接口路径
+            item_count: 请求体中的题目数量，用于统计每道题目的请求体大小
+            shard_key: 路由键（见 ShardRouter.shard_key）
+        """
+        if 'json' in kwargs:
+            kwargs['data'] = self.codec.dumps(kwargs.pop('json'))
+        if isinstance(kwargs.get('data'), bytes):
+            with self._serialized_lock:
+                self.serialized_bytes += len(kwargs['data'])
+                self.serialized_questions += item_count
+        kwargs = prepare_request_body(kwargs, self.compression)
+
+        def post(session, url):
+            if self.concurrency is None:
+                return session.post(url, timeout=self.timeout, **kwargs)
+            return self.concurrency.call(lambda: session.post(url, timeout=self.timeout, **kwargs))
+
+        if self.router is None:
+            return self.retry_policy.execute(lambda: post(self.session, f"{self.base_url}{path}"),
+                                             idempotent=False)
+
+        replicas = self.router.attempts(shard_key)
+        return self.retry_policy.execute(lambda: self.router.send(next(replicas), path, post),
+                                         idempotent=False, resend_status=self.router.failover_status)
+
+    def shard_key(self, question: Dict) -> str:
+        """
+        题目的路由键，未配置多个副本时为空
+        """
+        return self.router.shard_key(question) if self.router is not None else ''
+
+    @property
+    def last_attempts(self) -> int:
+        """
+        当前线程上一次请求的尝试次数
+        """
+        return self.retry_policy.last_attempts
+
+    @property
+    def connections_reused(self) -> int:
+        """
+        复用已有连接的请求次数
+        """
+        reused = connections_reused(self.session)
+        if self.router is not None:
+            reused += sum(connections_reused(replica.session) for replica in self.router.replicas)
+        return reused
+
+    def snapshot(self) -> Tuple[int, int]:
+        """
+        当前的 (请求体字节数, 题目数)，配合 report() 统计一段时间内的上传
+        """
+        with self._serialized_lock:
+            return self.serialized_bytes, self.serialized_questions
+
+    def report(self, snapshot: Tuple[int, int]) -> None:
+        """
+        输出自 snapshot 以来平均每道题目的请求体大小（压缩前）和各副本的请求统计
+        """
+        sent_bytes, sent_questions = self.snapshot()
+        sent_bytes -= snapshot[0]
+        sent_questions -= snapshot[1]
+        if sent_questions:
+            print(f"📦 请求体平均 {sent_bytes / sent_questions:.0f} 字节/道（JSON后端：{self.codec.name}）")
+            logger.info(f"请求体共 {sent_bytes} 字节，{sent_questions} 道题目，JSON后端：{self.codec.name}，"
+                        f"复用连接 {self.connections_reused} 次")
+        if self.router is not None:
+            print(f"🔀 副本请求统计：\n{self.router.report()}")
+
+    def close(self) -> None:
+        """
+        关闭会话，释放连接池
+        """
+        self.session.close()
+        if self.router is not None:
+            self.router.close()
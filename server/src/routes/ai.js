@@ -919,6 +919,8 @@ router.post('/save-question', optionalAuthMiddleware, [
       correctAnswer: question.correctAnswer,
       explanation: question.explanation,
       knowledgePoints: question.knowledgePoints || [],
+      imageData: question.imageData,
+      mimeType: question.mimeType,
       svgData: question.svgData,
       figureProperties: question.figureProperties,
       hasGeometryFigure: question.hasGeometryFigure || false,
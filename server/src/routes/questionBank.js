@@ -33,7 +33,9 @@ router.get('/:subject', validateSubject, async (req, res) => {
       keyword,
       knowledgePoint,
       sortBy = 'createdAt',
-      sortOrder = 'desc'
+      sortOrder = 'desc',
+      fields,
+      cursor
     } = req.query;
 
     // 构建查询条件
@@ -49,6 +51,57 @@ router.get('/:subject', validateSubject, async (req, res) => {
       ];
     }
 
+    // 只返回指定字段（逗号分隔），如 fields=content,options,createdAt
+    const projection = fields
+      ? fields.split(',').filter(field => /^[A-Za-z]+$/.test(field)).join(' ')
+      : '-__v';
+
+    // 游标分页：按 createdAt、_id 从新到旧读取，cursor 为上一页返回的 nextCursor（首页传空字符串）
+    // 不使用 skip，也不统计总数，适合遍历整个题库
+    if (cursor !== undefined) {
+      const limitNum = Math.min(Math.max(parseInt(limit) || 20, 1), 1000);
+      const conditions = [query];
+      if (cursor) {
+        const [createdAt, id] = cursor.split('_');
+        const createdAtDate = new Date(createdAt);
+        if (isNaN(createdAtDate) || !mongoose.Types.ObjectId.isValid(id)) {
+          return res.status(400).json({
+            success: false,
+            message: '无效的游标'
+          });
+        }
+        conditions.push({
+          $or: [
+            { createdAt: { $lt: createdAtDate } },
+            { createdAt: createdAtDate, _id: { $lt: new mongoose.Types.ObjectId(id) } }
+          ]
+        });
+      }
+
+      const questions = await Question.find({ $and: conditions })
+        .sort({ createdAt: -1, _id: -1 })
+        .limit(limitNum + 1)
+        .select(fields ? `${projection} createdAt` : projection)  // 游标需要 createdAt
+        .lean();
+
+      const hasNext = questions.length > limitNum;
+      const pageQuestions = questions.slice(0, limitNum);
+      const last = pageQuestions[pageQuestions.length - 1];
+      return res.json({
+        success: true,
+        data: {
+          questions: pageQuestions,
+          pagination: {
+            limit: limitNum,
+            hasNext,
+            nextCursor: hasNext && last.createdAt
+              ? `${new Date(last.createdAt).toISOString()}_${last._id}`
+              : null
+          }
+        }
+      });
+    }
+
     // 分页参数
     const skip = (parseInt(page) - 1) * parseInt(limit);
     const limitNum = parseInt(limit);
@@ -63,7 +116,7 @@ router.get('/:subject', validateSubject, async (req, res) => {
         .sort(sort)
         .skip(skip)
         .limit(limitNum)
-        .select('-__v')
+        .select(projection)
         .lean(),
       Question.countDocuments(query)
     ]);
@@ -328,7 +381,60 @@ router.delete('/:subject/:id', validateSubject, async (req, res) => {
 router.post('/:subject/batch', validateSubject, async (req, res) => {
   try {
     const { subject } = req.params;
-    const { action, questionIds, data } = req.body;
+    const { action, questionIds, data, questions } = req.body;
+
+    // 批量创建：逐条校验后一次写入，返回每道题目的结果
+    if (action === 'create') {
+      if (!Array.isArray(questions) || questions.length === 0) {
+        return res.status(400).json({
+          success: false,
+          message: '批量创建需要提供题目列表'
+        });
+      }
+
+      const results = [];
+      const validDocs = [];
+      questions.forEach((item, index) => {
+        const question = new Question({
+          ...item,
+          subject,
+          source: item.source || 'import',
+          createdBy: req.user?.id || null,
+          isActive: true
+        });
+        const validationError = question.validateSync();
+        if (validationError) {
+          results[index] = { index, success: false, message: validationError.message };
+        } else {
+          validDocs.push({ index, question });
+        }
+      });
+
+      if (validDocs.length > 0) {
+        let writeErrors = new Map();
+        try {
+          await Question.insertMany(validDocs.map(doc => doc.question), { ordered: false });
+        } catch (error) {
+          if (!Array.isArray(error.writeErrors)) {
+            throw error;
+          }
+          writeErrors = new Map(error.writeErrors.map(e => [e.index, e.errmsg || e.message]));
+        }
+
+        validDocs.forEach(({ index, question }, position) => {
+          results[index] = writeErrors.has(position)
+            ? { index, success: false, message: writeErrors.get(position) }
+            : { index, success: true, questionId: question._id };
+        });
+      }
+
+      const createdCount = results.filter(result => result.success).length;
+      return res.json({
+        success: true,
+        message: `成功创建 ${createdCount} 道题目`,
+        data: { createdCount, results }
+      });
+    }
 
     if (!action || !Array.isArray(questionIds) || questionIds.length === 0) {
       return res.status(400).json({